@@ -0,0 +1,115 @@
+"""Async X API client layer for fanning out read-only search calls."""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import Config
+from tweet_handler import tweet_handler, search_budget, normalize_search_response, SEARCH_FIELDS
+from utils.logger import logger
+from utils.quota import SEARCH_RECENT, quota
+from utils.resilience import resilience
+from utils.search_cache import search_cache
+
+try:
+    from tweepy.asynchronous import AsyncClient
+except Exception:
+    AsyncClient = None
+    logger.warning("tweepy async extras (aiohttp, async_lru) are not installed; searches will run sequentially")
+
+
+SearchRequest = Tuple[str, int]
+
+
+class AsyncTweetHandler:
+    """
+    Concurrent search client with the same result shape as TweetHandler.search_tweets.
+
+    Every call draws from the shared per-run search budget, and at most
+    MAX_CONCURRENT_SEARCHES requests are in flight at once.
+    """
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None and AsyncClient is not None:
+            self._client = AsyncClient(
+                bearer_token=Config.X_BEARER_TOKEN if Config.X_BEARER_TOKEN else None,
+                consumer_key=Config.X_CONSUMER_KEY,
+                consumer_secret=Config.X_CONSUMER_SECRET,
+                access_token=Config.X_ACCESS_TOKEN,
+                access_token_secret=Config.X_ACCESS_TOKEN_SECRET,
+                wait_on_rate_limit=False
+            )
+        return self._client
+
+    async def search_tweets(self, query: str, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Search for tweets by query (budget must already be reserved)."""
+        try:
+            bounded_results = min(100, max(10, int(max_results)))
+            if not quota.allow(SEARCH_RECENT):
+                return None
+            response = await resilience.call_async(
+                SEARCH_RECENT, self.client.search_recent_tweets,
+                query=query,
+                max_results=bounded_results,
+                **SEARCH_FIELDS
+            )
+            tweets = normalize_search_response(response)
+            search_cache.put(query, bounded_results, tweets,
+                             next_token=(getattr(response, "meta", None) or {}).get("next_token"))
+            if tweets:
+                logger.info(f"✓ Found {len(tweets)} tweets for: {query}")
+                return tweets
+            return None
+        except Exception as e:
+            # The aiohttp session has no response hook; resilience records 429s in the quota table.
+            logger.error(f"Failed to search tweets: {e}")
+            return None
+
+    async def _gather(self, requests: Sequence[SearchRequest]) -> List[Optional[List[Dict[str, Any]]]]:
+        semaphore = asyncio.Semaphore(max(1, Config.MAX_CONCURRENT_SEARCHES))
+
+        async def bounded(query: str, max_results: int):
+            async with semaphore:
+                return await self.search_tweets(query, max_results)
+
+        return await asyncio.gather(*[bounded(query, max_results) for query, max_results in requests])
+
+    def search_many(self, requests: Sequence[SearchRequest]) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Run several searches concurrently.
+
+        Args:
+            requests: (query, max_results) pairs
+
+        Returns:
+            One result per request, in order (None where the search failed,
+            found nothing, or the run budget was spent)
+        """
+        if not requests:
+            return []
+        if self.client is None:
+            return [tweet_handler.search_tweets(q, max_results=n) for q, n in requests]
+
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(requests)
+        pending = []
+        for i, (query, max_results) in enumerate(requests):
+            bounded_results = min(100, max(10, int(max_results)))
+            cached = search_cache.get(query, bounded_results)
+            if cached is not None:
+                results[i] = cached or None
+            # Reserve budget up front, in request order, so accounting matches the sequential path.
+            elif (quota.allow(SEARCH_RECENT) and resilience.allows(SEARCH_RECENT)
+                  and search_budget.try_acquire(query)):
+                pending.append(i)
+
+        if pending:
+            fetched = asyncio.run(self._gather([requests[i] for i in pending]))
+            for i, tweets in zip(pending, fetched):
+                results[i] = tweets
+        return results
+
+
+# Global instance
+async_tweet_handler = AsyncTweetHandler()
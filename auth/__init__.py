@@ -1,6 +1,78 @@
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
 import tweepy
 from config import config
 from utils.logger import logger
+from utils.quota import quota
+
+
+class AccountSnapshot(NamedTuple):
+    """The authenticated account as of the last verify_credentials call."""
+    id: int
+    id_str: str
+    screen_name: str
+    followers_count: int
+    friends_count: int
+    statuses_count: int
+    verified: bool
+
+    @classmethod
+    def from_user(cls, user: Any) -> "AccountSnapshot":
+        return cls(
+            id=user.id,
+            id_str=str(getattr(user, "id_str", None) or user.id),
+            screen_name=user.screen_name,
+            followers_count=getattr(user, "followers_count", 0),
+            friends_count=getattr(user, "friends_count", 0),
+            statuses_count=getattr(user, "statuses_count", 0),
+            verified=bool(getattr(user, "verified", False)),
+        )
+
+
+class AccountIdentity:
+    """
+    Caches who we are authenticated as, so handler methods do not each spend a
+    v1.1 verify_credentials round-trip. Seeded by authenticate(); refreshed when
+    older than IDENTITY_TTL_SECONDS or when a caller asks for fresher data.
+    """
+
+    def __init__(self, authenticator: "XAuthenticator"):
+        self._authenticator = authenticator
+        self._snapshot: Optional[AccountSnapshot] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.saved = 0
+
+    def seed(self, user: Any) -> AccountSnapshot:
+        with self._lock:
+            self._snapshot = AccountSnapshot.from_user(user)
+            self._fetched_at = time.monotonic()
+            return self._snapshot
+
+    def get(self, max_age: Optional[float] = None) -> AccountSnapshot:
+        """
+        The cached snapshot, refreshed first if older than max_age seconds
+        (default IDENTITY_TTL_SECONDS).
+        """
+        max_age = config.IDENTITY_TTL_SECONDS if max_age is None else max_age
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._fetched_at < max_age:
+                self.saved += 1
+                return self._snapshot
+        user = self._authenticator.api.verify_credentials()
+        self.calls += 1
+        return self.seed(user)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, int]:
+        """verify_credentials calls made vs. answered from the cache (since process start)."""
+        return {"calls": self.calls, "saved": self.saved}
 
 
 class XAuthenticator:
@@ -9,6 +81,7 @@ class XAuthenticator:
     def __init__(self):
         self.api: tweepy.API = None
         self.client: tweepy.Client = None
+        self.identity = AccountIdentity(self)
         
     def authenticate(self) -> tuple[tweepy.API, tweepy.Client]:
         """
@@ -25,7 +98,8 @@ class XAuthenticator:
             )
             
             # API v1.1 (for some operations not yet in v2)
-            self.api = tweepy.API(auth, wait_on_rate_limit=True)
+            # Rate limits are scheduled around via utils.quota instead of sleeping in-request
+            self.api = tweepy.API(auth, wait_on_rate_limit=False)
             
             # API v2 (modern API)
             self.client = tweepy.Client(
@@ -34,11 +108,15 @@ class XAuthenticator:
                 consumer_secret=config.X_CONSUMER_SECRET,
                 access_token=config.X_ACCESS_TOKEN,
                 access_token_secret=config.X_ACCESS_TOKEN_SECRET,
-                wait_on_rate_limit=True
+                wait_on_rate_limit=False
             )
+            for session in (self.api.session, self.client.session):
+                session.hooks["response"].append(quota.observe)
             
             # Verify credentials
             user = self.api.verify_credentials()
+            self.identity.calls += 1
+            self.identity.seed(user)
             logger.info(f"✓ Authenticated as @{user.screen_name}")
             logger.info(f"  Followers: {user.followers_count} | Following: {user.friends_count}")
             
@@ -18,6 +18,16 @@ class Config:
     
     # MongoDB
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/x-growth')
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongo')  # mongo | memory (in-process, not persisted)
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '20'))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '2'))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000'))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '30000'))
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', 'zstd,snappy,zlib')  # unavailable ones are skipped
+    DB_QUERY_PLAN_CHECK = os.getenv('DB_QUERY_PLAN_CHECK', 'true').lower() == 'true'
     
     # OpenAI (gpt-4o - proven to work reliably)
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -25,6 +35,7 @@ class Config:
     
     # Account Settings
     ACCOUNT_USERNAME = os.getenv('ACCOUNT_USERNAME', '')
+    IDENTITY_TTL_SECONDS = int(os.getenv('IDENTITY_TTL_SECONDS', '900'))  # cached verify_credentials result
     NICHE: List[str] = os.getenv('NICHE', 'technology').split(',')
     TARGET_AUDIENCE: List[str] = os.getenv('TARGET_AUDIENCE', 'developers').split(',')
     
@@ -36,13 +47,28 @@ class Config:
     MAX_POSTS_PER_DAY = int(os.getenv('MAX_POSTS_PER_DAY', '5'))
     MAX_REPLIES_PER_DAY = int(os.getenv('MAX_REPLIES_PER_DAY', '50'))
     MAX_DM_RESPONSES_PER_DAY = int(os.getenv('MAX_DM_RESPONSES_PER_DAY', '20'))
+    RATE_LIMIT_RECONCILE_SECONDS = int(os.getenv('RATE_LIMIT_RECONCILE_SECONDS', '60'))
+    QUOTA_DEFAULT_COOLDOWN_SECONDS = int(os.getenv('QUOTA_DEFAULT_COOLDOWN_SECONDS', '900'))  # 429 without reset header
+    QUOTA_MAX_WAIT_SECONDS = int(os.getenv('QUOTA_MAX_WAIT_SECONDS', '120'))  # longest idle wait for an API window
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '3'))  # per call, for 5xx/timeouts only
+    RETRY_BUDGET_PER_RUN = int(os.getenv('RETRY_BUDGET_PER_RUN', '20'))
+    RETRY_BASE_WAIT_SECONDS = float(os.getenv('RETRY_BASE_WAIT_SECONDS', '1'))
+    RETRY_MAX_WAIT_SECONDS = float(os.getenv('RETRY_MAX_WAIT_SECONDS', '8'))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+    CIRCUIT_RESET_SECONDS = int(os.getenv('CIRCUIT_RESET_SECONDS', '300'))
     
     # Behavior Settings (Optimized for speed - X has no strict action limits)
     MIN_DELAY_SECONDS = int(os.getenv('MIN_DELAY_SECONDS', '2'))  # Fast: 2-5 sec instead of 30-180
     MAX_DELAY_SECONDS = int(os.getenv('MAX_DELAY_SECONDS', '5'))
+    PACING_BURST_FRACTION = float(os.getenv('PACING_BURST_FRACTION', '0.25'))
+    PACING_ACTIVE_HOURS = int(os.getenv('PACING_ACTIVE_HOURS', '16'))
+    PACING_MAX_WAIT_SECONDS = int(os.getenv('PACING_MAX_WAIT_SECONDS', '60'))
     ENGAGEMENT_SCORE_THRESHOLD = int(os.getenv('ENGAGEMENT_SCORE_THRESHOLD', '5'))
     MAX_REPLY_DRAFTS = int(os.getenv('MAX_REPLY_DRAFTS', '2'))
     MAX_POST_DRAFTS = int(os.getenv('MAX_POST_DRAFTS', '2'))
+    AI_DRAFT_TIMEOUT_SECONDS = int(os.getenv('AI_DRAFT_TIMEOUT_SECONDS', '20'))
+    AI_DRAFT_EARLY_EXIT = os.getenv('AI_DRAFT_EARLY_EXIT', 'true').lower() == 'true'
+    AI_BATCH_DRAFTS = os.getenv('AI_BATCH_DRAFTS', 'true').lower() == 'true'
     REPLY_LANGUAGE = os.getenv('REPLY_LANGUAGE', 'en')
     MAX_RESEARCH_QUERIES = int(os.getenv('MAX_RESEARCH_QUERIES', '2'))
     MAX_RESULTS_PER_RESEARCH_QUERY = int(os.getenv('MAX_RESULTS_PER_RESEARCH_QUERY', '10'))
@@ -55,6 +81,36 @@ class Config:
     INFLUENCER_ENGAGEMENT_TARGET = int(os.getenv('INFLUENCER_ENGAGEMENT_TARGET', '4'))
     MAX_RETWEET_QUERIES_PER_RUN = int(os.getenv('MAX_RETWEET_QUERIES_PER_RUN', '1'))
     MAX_SEARCH_CALLS_PER_RUN = int(os.getenv('MAX_SEARCH_CALLS_PER_RUN', '20'))
+    MAX_CONCURRENT_SEARCHES = int(os.getenv('MAX_CONCURRENT_SEARCHES', '5'))
+    SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', '20'))  # results per paginated search call (10-100)
+    SEARCH_MAX_PAGES = int(os.getenv('SEARCH_MAX_PAGES', '3'))  # pages one paginated search may pull
+    SEARCH_CANDIDATE_POOL_FACTOR = int(os.getenv('SEARCH_CANDIDATE_POOL_FACTOR', '4'))  # scored candidates per reply target
+    SEARCH_CACHE_ENABLED = os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() == 'true'
+    SEARCH_CACHE_MONGO = os.getenv('SEARCH_CACHE_MONGO', 'false').lower() == 'true'
+    SEARCH_CACHE_TTL_SECONDS = int(os.getenv('SEARCH_CACHE_TTL_SECONDS', '900'))
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '256'))
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_BYPASS = os.getenv('LLM_CACHE_BYPASS', 'false').lower() == 'true'
+    LLM_CACHE_BACKEND = os.getenv('LLM_CACHE_BACKEND', 'disk')  # disk | mongo
+    LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', 'data/llm_cache')
+    LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', '21600'))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '2000'))
+    INTERACTION_HISTORY_DAYS = int(os.getenv('INTERACTION_HISTORY_DAYS', '14'))
+    BULK_WRITES_ENABLED = os.getenv('BULK_WRITES_ENABLED', 'true').lower() == 'true'
+    BULK_WRITE_BATCH_SIZE = int(os.getenv('BULK_WRITE_BATCH_SIZE', '50'))
+    BULK_WRITE_MAX_AGE_SECONDS = int(os.getenv('BULK_WRITE_MAX_AGE_SECONDS', '30'))
+    ROLLUPS_ENABLED = os.getenv('ROLLUPS_ENABLED', 'true').lower() == 'true'
+    TIMESERIES_ENABLED = os.getenv('TIMESERIES_ENABLED', 'true').lower() == 'true'
+    TIMESERIES_MODE = os.getenv('TIMESERIES_MODE', 'auto')  # auto | native | buckets
+    RETENTION_ENABLED = os.getenv('RETENTION_ENABLED', 'true').lower() == 'true'
+    RETENTION_ARCHIVE_DIR = os.getenv('RETENTION_ARCHIVE_DIR', 'data/archive')
+    RETENTION_ACTIVITY_DAYS = int(os.getenv('RETENTION_ACTIVITY_DAYS', '90'))
+    RETENTION_METRICS_DAYS = int(os.getenv('RETENTION_METRICS_DAYS', '365'))
+    RETENTION_TRENDS_DAYS = int(os.getenv('RETENTION_TRENDS_DAYS', '30'))
+    # TTL indexes expire documents RETENTION_TTL_GRACE_DAYS after their horizon,
+    # as a backstop for when the archive pass does not run.
+    RETENTION_TTL_ENABLED = os.getenv('RETENTION_TTL_ENABLED', 'false').lower() == 'true'
+    RETENTION_TTL_GRACE_DAYS = int(os.getenv('RETENTION_TTL_GRACE_DAYS', '7'))
     DRY_RUN_MODE = os.getenv('DRY_RUN_MODE', 'false').lower() == 'true'
     DAILY_ORIGINAL_POST_ENABLED = os.getenv('DAILY_ORIGINAL_POST_ENABLED', 'true').lower() == 'true'
     FOLLOWUP_POST_ENABLED = os.getenv('FOLLOWUP_POST_ENABLED', 'true').lower() == 'true'
@@ -73,8 +129,9 @@ class Config:
             'X_CONSUMER_SECRET': cls.X_CONSUMER_SECRET,
             'X_ACCESS_TOKEN': cls.X_ACCESS_TOKEN,
             'X_ACCESS_TOKEN_SECRET': cls.X_ACCESS_TOKEN_SECRET,
-            'MONGODB_URI': cls.MONGODB_URI,
         }
+        if cls.STORAGE_BACKEND == 'mongo':
+            required_fields['MONGODB_URI'] = cls.MONGODB_URI
         
         missing = [k for k, v in required_fields.items() if not v]
         
@@ -0,0 +1,18 @@
+"""Shared pytest fixtures."""
+import pytest
+
+from database import db
+from database.memory import MemoryClient
+
+
+@pytest.fixture()
+def memory_db():
+    """Point the global `db` at a fresh in-memory database with every index created."""
+    saved = db.client, db.db
+    db.client = MemoryClient()
+    db.db = db.client["x-growth-test"]
+    db._create_indexes()
+    try:
+        yield db.db
+    finally:
+        db.client, db.db = saved
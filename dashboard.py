@@ -2,6 +2,9 @@
 from flask import Flask, render_template, jsonify
 from flask_httpauth import HTTPBasicAuth
 from database import db
+from database.connection import connection_manager
+from database.rollups import daily_rollups
+from database.timeseries import timeseries
 from datetime import datetime, timedelta
 from config import Config
 import os
@@ -14,6 +17,24 @@ auth = HTTPBasicAuth()
 DASHBOARD_USERNAME = os.getenv('DASHBOARD_USERNAME', 'admin')
 DASHBOARD_PASSWORD = os.getenv('DASHBOARD_PASSWORD', 'changeme123')
 
+# Fields each page renders (list views never ship raw API payloads or metadata)
+TWEET_FIELDS = {'_id': 0, 'text': 1, 'likes': 1, 'retweets': 1, 'replies': 1,
+                'engagement_score': 1, 'created_at': 1, 'liked_at': 1, 'retweeted_at': 1}
+USER_FIELDS = {'_id': 0, 'username': 1, 'followed_at': 1, 'source_query': 1}
+ACTIVITY_FIELDS = {'_id': 0, 'action': 1, 'target_type': 1, 'target_id': 1, 'timestamp': 1}
+METRIC_FIELDS = {'_id': 0, 'timestamp': 1, 'followers': 1, 'following': 1, 'tweets': 1}
+LIST_BATCH_SIZE = 100
+
+
+@app.before_request
+def ensure_db_connection():
+    """Attach to the shared client once per process (no per-request ping or index setup)."""
+    if db.client is None:
+        try:
+            db.connect()
+        except Exception:
+            pass  # routes and /api/health report the failure
+
 
 @auth.verify_password
 def verify_password(username, password):
@@ -27,10 +48,6 @@ def verify_password(username, password):
 @auth.login_required
 def index():
     """Dashboard home page."""
-    # Connect to DB if not connected
-    if not db.client:
-        db.connect()
-    
     # Get summary stats
     stats = get_summary_stats()
     recent_activity = get_recent_activity(limit=20)
@@ -46,11 +63,20 @@ def index():
 @auth.login_required
 def api_stats():
     """API endpoint for stats."""
-    if not db.client:
-        db.connect()
     return jsonify(get_summary_stats())
 
 
+@app.route('/api/db')
+@auth.login_required
+def api_db():
+    """Connection pool metrics for this dashboard process."""
+    return jsonify({
+        "backend": Config.STORAGE_BACKEND,
+        "client_options": connection_manager.describe(),
+        "pool": connection_manager.metrics.stats(),
+    })
+
+
 @app.route('/api/health')
 def api_health():
     """Health check endpoint (no auth required)."""
@@ -62,9 +88,7 @@ def api_health():
     
     # Check database connection
     try:
-        if not db.client:
-            db.connect()
-        db.client.server_info()
+        db.client.admin.command('ping')
         health_status["checks"]["database"] = "connected"
     except Exception as e:
         health_status["status"] = "unhealthy"
@@ -80,7 +104,7 @@ def api_health():
     
     # Check last operation
     try:
-        last_activity = db.activity_logs.find_one(sort=[("timestamp", -1)])
+        last_activity = db.activity_logs.find_one({}, {'_id': 0, 'timestamp': 1}, sort=[("timestamp", -1)])
         if last_activity:
             health_status["checks"]["last_operation"] = last_activity["timestamp"].isoformat()
         else:
@@ -95,15 +119,12 @@ def api_health():
 @auth.login_required
 def tweets():
     """View all tweets."""
-    if not db.client:
-        db.connect()
-    
     # Get liked and retweeted tweets
-    tweets_list = list(db.tweets.find().sort("liked_at", -1).limit(100))
+    tweets_list = list(
+        db.tweets.find({}, TWEET_FIELDS).sort("liked_at", -1).limit(100).batch_size(LIST_BATCH_SIZE)
+    )
     
-    # Convert ObjectId to string for JSON serialization
     for tweet in tweets_list:
-        tweet['_id'] = str(tweet['_id'])
         if 'created_at' in tweet:
             tweet['created_at'] = str(tweet['created_at'])
         if 'liked_at' in tweet:
@@ -118,13 +139,11 @@ def tweets():
 @auth.login_required
 def users():
     """View all followed users."""
-    if not db.client:
-        db.connect()
-    
-    users_list = list(db.users.find().sort("followed_at", -1).limit(100))
+    users_list = list(
+        db.users.find({}, USER_FIELDS).sort("followed_at", -1).limit(100).batch_size(LIST_BATCH_SIZE)
+    )
     
     for user in users_list:
-        user['_id'] = str(user['_id'])
         if 'followed_at' in user:
             user['followed_at'] = str(user['followed_at'])
     
@@ -135,25 +154,31 @@ def users():
 @auth.login_required
 def activity():
     """View activity logs."""
-    if not db.client:
-        db.connect()
-    
     logs = get_recent_activity(limit=200)
     return render_template('activity.html', logs=logs)
 
 
 def get_summary_stats():
-    """Get summary statistics."""
-    stats = {
-        'total_tweets_liked': db.tweets.count_documents({"liked_at": {"$ne": None}}),
-        'total_tweets_retweeted': db.tweets.count_documents({"retweeted_at": {"$ne": None}}),
-        'total_users_followed': db.users.count_documents({"unfollowed_at": None}),
-        'total_mentions': db.mentions.count_documents({}),
-        'total_actions': db.activity_logs.count_documents({}),
-    }
+    """Get summary statistics (from daily rollups when they have been built)."""
+    rollups = daily_rollups.days()
+    if rollups is None:
+        stats = _summary_counts_from_collections()
+    else:
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        stats = {
+            'total_tweets_liked': daily_rollups.success_count(rollups, 'like'),
+            'total_tweets_retweeted': daily_rollups.success_count(rollups, 'retweet'),
+            # Currently followed accounts, not a follow/unfollow balance
+            'total_users_followed': db.users.count_documents({"unfollowed_at": None}),
+            'total_mentions': db.mentions.estimated_document_count(),
+            'total_actions': sum(sum((r.get('totals') or {}).values()) for r in rollups),
+            'today_actions': sum(
+                sum((r.get('totals') or {}).values()) for r in rollups if r['day'] == today
+            ),
+        }
     
     # Get latest metrics
-    latest_metrics = db.metrics_history.find_one(sort=[("timestamp", -1)])
+    latest_metrics = db.metrics_history.find_one({}, METRIC_FIELDS, sort=[("timestamp", -1)])
     if latest_metrics:
         stats['current_followers'] = latest_metrics.get('followers', 0)
         stats['current_following'] = latest_metrics.get('following', 0)
@@ -163,6 +188,19 @@ def get_summary_stats():
         stats['current_following'] = 0
         stats['current_tweets'] = 0
     
+    return stats
+
+
+def _summary_counts_from_collections():
+    """Summary counts straight from the raw collections (used before rollups exist)."""
+    stats = {
+        'total_tweets_liked': db.tweets.count_documents({"liked_at": {"$ne": None}}),
+        'total_tweets_retweeted': db.tweets.count_documents({"retweeted_at": {"$ne": None}}),
+        'total_users_followed': db.users.count_documents({"unfollowed_at": None}),
+        'total_mentions': db.mentions.count_documents({}),
+        'total_actions': db.activity_logs.count_documents({}),
+    }
+    
     # Calculate today's activity
     today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     stats['today_actions'] = db.activity_logs.count_documents({
@@ -174,10 +212,11 @@ def get_summary_stats():
 
 def get_recent_activity(limit=50):
     """Get recent activity logs."""
-    logs = list(db.activity_logs.find().sort("timestamp", -1).limit(limit))
+    logs = list(
+        db.activity_logs.find({}, ACTIVITY_FIELDS).sort("timestamp", -1).limit(limit).batch_size(LIST_BATCH_SIZE)
+    )
     
     for log in logs:
-        log['_id'] = str(log['_id'])
         if 'timestamp' in log:
             log['timestamp'] = log['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
     
@@ -188,16 +227,36 @@ def get_growth_data():
     """Get growth data for charts."""
     # Get metrics from last 30 days
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    metrics = list(db.metrics_history.find({
-        "timestamp": {"$gte": thirty_days_ago}
-    }).sort("timestamp", 1))
-    
     growth_data = {
         'dates': [],
         'followers': [],
         'following': []
     }
     
+    # One point per day from the follower series, then rollup snapshots, then raw history
+    followers = timeseries.window('followers', thirty_days_ago, resolution='daily')
+    if followers:
+        following = {p['ts']: p['last'] for p in timeseries.window('following', thirty_days_ago, resolution='daily')}
+        for point in followers:
+            growth_data['dates'].append(point['ts'].strftime('%Y-%m-%d'))
+            growth_data['followers'].append(point['last'])
+            growth_data['following'].append(following.get(point['ts'], 0))
+        return growth_data
+    
+    rollups = daily_rollups.days(since=thirty_days_ago, fields=("snapshot",))
+    if rollups is not None:
+        for rollup in rollups:
+            snapshot = rollup.get('snapshot')
+            if snapshot:
+                growth_data['dates'].append(rollup['day'])
+                growth_data['followers'].append(snapshot.get('followers', 0))
+                growth_data['following'].append(snapshot.get('following', 0))
+        return growth_data
+    
+    metrics = list(db.metrics_history.find({
+        "timestamp": {"$gte": thirty_days_ago}
+    }, METRIC_FIELDS).sort("timestamp", 1))
+    
     for metric in metrics:
         growth_data['dates'].append(metric['timestamp'].strftime('%Y-%m-%d'))
         growth_data['followers'].append(metric.get('followers', 0))
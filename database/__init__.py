@@ -1,13 +1,179 @@
 """MongoDB connection and operations."""
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
 from pymongo.database import Database
 from pymongo.collection import Collection
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Set
 
 from config import config
 from utils.logger import logger
 
 
+# Index registry: every hot query in operations/ should be served by one of these.
+# Compound keys follow equality -> sort -> range ordering.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "tweets": [
+        IndexModel([("tweet_id", ASCENDING)], unique=True),
+        IndexModel([("engagement_score", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("liked_at", DESCENDING)]),
+        IndexModel([("author_id", ASCENDING), ("liked_at", DESCENDING)]),
+    ],
+    "users": [
+        IndexModel([("user_id", ASCENDING)], unique=True),
+        IndexModel([("followed_at", DESCENDING)]),
+        IndexModel([("followed_back", ASCENDING), ("unfollowed_at", ASCENDING), ("followed_at", DESCENDING)]),
+    ],
+    "trends": [
+        IndexModel([("fetched_at", DESCENDING)]),
+        IndexModel([("name", ASCENDING)]),
+        IndexModel([("source", ASCENDING), ("fetched_at", DESCENDING)]),
+    ],
+    "activity_logs": [
+        IndexModel([("timestamp", DESCENDING)]),
+        IndexModel([("action", ASCENDING), ("success", ASCENDING), ("timestamp", DESCENDING)]),
+        IndexModel([
+            ("target_user_id", ASCENDING), ("action", ASCENDING),
+            ("success", ASCENDING), ("timestamp", DESCENDING),
+        ]),
+        IndexModel([
+            ("target_user", ASCENDING), ("action", ASCENDING),
+            ("success", ASCENDING), ("timestamp", DESCENDING),
+        ]),
+    ],
+    "mentions": [
+        IndexModel([("mention_id", ASCENDING)]),
+        IndexModel([("author_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("author_id", ASCENDING), ("received_at", DESCENDING)]),
+        IndexModel([("author_username", ASCENDING), ("received_at", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("received_at", DESCENDING)]),
+        IndexModel([("responded", ASCENDING)]),
+    ],
+    "direct_messages": [
+        IndexModel([("message_id", ASCENDING)], unique=True),
+        IndexModel([("received_at", DESCENDING)]),
+    ],
+    "posts": [
+        IndexModel([("post_id", ASCENDING)]),
+        IndexModel([("posted_at", DESCENDING)]),
+        IndexModel([("post_type", ASCENDING), ("posted_at", DESCENDING)]),
+    ],
+    "metrics_history": [
+        IndexModel([("timestamp", DESCENDING)]),
+    ],
+    "search_cache": [
+        IndexModel([("key", ASCENDING)], unique=True),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "rollup_state": [
+        IndexModel([("account", ASCENDING)], unique=True),
+    ],
+    "reply_history": [
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("username", ASCENDING)]),
+    ],
+    "daily_rollups": [
+        IndexModel([("day", ASCENDING), ("account", ASCENDING)], unique=True),
+        IndexModel([("account", ASCENDING), ("day", ASCENDING)]),
+    ],
+    # metric_series (native time-series) is created by database/timeseries.py
+    "metric_buckets": [
+        IndexModel([("meta.account", ASCENDING), ("meta.metric", ASCENDING), ("day", ASCENDING)], unique=True),
+    ],
+    "llm_cache": [
+        IndexModel([("key", ASCENDING)], unique=True),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        IndexModel([("last_used_at", ASCENDING)]),
+    ],
+    "rate_limits": [
+        IndexModel([("action", ASCENDING), ("date", ASCENDING)], unique=True),
+        IndexModel([("date", ASCENDING)]),
+    ],
+}
+
+
+def _retention_ttl_indexes() -> Dict[str, List[IndexModel]]:
+    """TTL backstops for the retention horizons (see database/retention.py)."""
+    horizons = {
+        "activity_logs": ("timestamp", config.RETENTION_ACTIVITY_DAYS),
+        "metrics_history": ("timestamp", config.RETENTION_METRICS_DAYS),
+        "trends": ("fetched_at", config.RETENTION_TRENDS_DAYS),
+    }
+    return {
+        collection: [IndexModel(
+            [(field, ASCENDING)],
+            name=f"{field}_ttl",
+            expireAfterSeconds=(days + config.RETENTION_TTL_GRACE_DAYS) * 86400,
+        )]
+        for collection, (field, days) in horizons.items()
+        if days > 0
+    }
+
+
+if config.RETENTION_TTL_ENABLED:
+    for _collection, _models in _retention_ttl_indexes().items():
+        INDEXES[_collection].extend(_models)
+
+
+class QueryShape(NamedTuple):
+    """A representative hot query used by the startup explain() check."""
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[tuple]] = None
+
+
+_SAMPLE_TS = datetime(2000, 1, 1)
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("latest_action_by_user_id", "activity_logs",
+               {"action": "like", "success": True, "target_user_id": "0"}, [("timestamp", DESCENDING)]),
+    QueryShape("latest_action_by_username", "activity_logs",
+               {"action": "like", "success": True, "target_user": "_"}, [("timestamp", DESCENDING)]),
+    QueryShape("recent_any_engagement", "activity_logs",
+               {"action": {"$in": ["reply", "like", "retweet", "follow"]}, "success": True, "target_user_id": "0"},
+               [("timestamp", DESCENDING)]),
+    QueryShape("recent_replies", "activity_logs",
+               {"action": "reply", "success": True, "timestamp": {"$gte": _SAMPLE_TS}}, [("timestamp", DESCENDING)]),
+    QueryShape("actions_since", "activity_logs", {"timestamp": {"$gte": _SAMPLE_TS}}),
+    QueryShape("talk_back", "mentions",
+               {"author_id": {"$in": ["0", 0]},
+                "$or": [{"created_at": {"$gt": _SAMPLE_TS}}, {"received_at": {"$gt": _SAMPLE_TS}}]}),
+    QueryShape("mention_by_id", "mentions", {"mention_id": "0"}),
+    QueryShape("unresponded_mentions", "mentions", {"responded": False}),
+    QueryShape("tweet_already_liked", "tweets", {"tweet_id": "0", "liked_at": {"$ne": None}}),
+    QueryShape("author_recently_liked", "tweets",
+               {"author_id": "0", "liked_at": {"$ne": None, "$gte": _SAMPLE_TS}}),
+    QueryShape("already_following", "users", {"user_id": "0", "unfollowed_at": None}),
+    QueryShape("inactive_follows", "users",
+               {"followed_at": {"$lt": _SAMPLE_TS}, "followed_back": False, "unfollowed_at": None}),
+    QueryShape("recent_topics_by_source", "trends",
+               {"fetched_at": {"$gte": _SAMPLE_TS}, "source": "curated_queries"}),
+    QueryShape("posted_today", "posts", {"post_type": "daily_lane", "posted_at": {"$gte": _SAMPLE_TS}}),
+    QueryShape("daily_rate_count", "rate_limits", {"action": "likes", "date": "2000-01-01"}),
+    QueryShape("metrics_since", "metrics_history", {"timestamp": {"$gte": _SAMPLE_TS}}, [("timestamp", 1)]),
+]
+
+
+def _plan_stages(plan: Any) -> Set[str]:
+    """Collect every stage name in an explain() plan tree."""
+    stages = set()
+    if isinstance(plan, dict):
+        if isinstance(plan.get("stage"), str):
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages |= _plan_stages(item)
+    return stages
+
+
+# Projection for reads that only need to know a document is there
+ID_ONLY = {"_id": 1}
+
+
 class MongoDB:
     """MongoDB database manager."""
     
@@ -16,61 +182,100 @@ class MongoDB:
         self.db: Optional[Database] = None
         
     def connect(self) -> None:
-        """Connect to MongoDB."""
+        """Attach to the shared process-wide client (created and pinged on first use)."""
+        if self.client is not None:
+            return
+        from database.connection import connection_manager
         try:
-            self.client = MongoClient(config.MONGODB_URI)
-            # Get database name from URI or use default
-            db_name = config.MONGODB_URI.split('/')[-1].split('?')[0] or 'x-growth'
+            self.client, db_name = connection_manager.get()
             self.db = self.client[db_name]
-            
-            # Test connection
-            self.client.admin.command('ping')
-            logger.info(f"✓ Connected to MongoDB successfully (database: {db_name})")
-            
-            # Create indexes
-            self._create_indexes()
+            if config.STORAGE_BACKEND == "memory":
+                logger.info(f"✓ Using in-memory storage (database: {db_name})")
+            else:
+                logger.info(f"✓ Connected to MongoDB successfully (database: {db_name})")
             
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
     
+    def migrate(self) -> None:
+        """Apply schema: create every index in INDEXES, build missing rollups and reply history, check hot query plans."""
+        self._create_indexes()
+        from database.rollups import daily_rollups
+        from database.reply_history import reply_history
+        try:
+            daily_rollups.ensure_built()
+        except Exception as e:
+            logger.warning(f"Daily rollup backfill skipped: {e}")
+        try:
+            reply_history.ensure_built()
+        except Exception as e:
+            logger.warning(f"Reply history backfill skipped: {e}")
+        if config.DB_QUERY_PLAN_CHECK:
+            self.check_query_plans()
+    
     def disconnect(self) -> None:
         """Disconnect from MongoDB."""
         if self.client:
-            self.client.close()
+            from database.connection import connection_manager
+            connection_manager.close()
+            self.client = None
+            self.db = None
             logger.info("Disconnected from MongoDB")
     
     def _create_indexes(self) -> None:
-        """Create database indexes for better performance."""
-        try:
-            # Tweets collection
-            self.tweets.create_index([("tweet_id", ASCENDING)], unique=True)
-            self.tweets.create_index([("engagement_score", DESCENDING)])
-            self.tweets.create_index([("created_at", DESCENDING)])
-            
-            # Users collection
-            self.users.create_index([("user_id", ASCENDING)], unique=True)
-            self.users.create_index([("followed_at", DESCENDING)])
-            
-            # Trends collection
-            self.trends.create_index([("fetched_at", DESCENDING)])
-            self.trends.create_index([("name", ASCENDING)])
-            
-            # Activity log collection
-            self.activity_logs.create_index([("timestamp", DESCENDING)])
-            self.activity_logs.create_index([("action", ASCENDING)])
-            
-            # Direct messages collection
-            self.direct_messages.create_index([("message_id", ASCENDING)], unique=True)
-            self.direct_messages.create_index([("received_at", DESCENDING)])
-            
-            # Posts collection
-            self.posts.create_index([("posted_at", DESCENDING)])
-            
-            logger.info("✓ Database indexes created successfully")
-            
-        except Exception as e:
-            logger.warning(f"Some indexes may already exist: {e}")
+        """Create every index declared in INDEXES (one failure does not block the rest)."""
+        created, failed = 0, 0
+        for collection_name, models in INDEXES.items():
+            for model in models:
+                try:
+                    self.db[collection_name].create_indexes([model])
+                    created += 1
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Index {model.document.get('name')} on {collection_name} not created: {e}")
+
+        if failed:
+            logger.warning(f"Database indexes: {created} ok, {failed} failed")
+        else:
+            logger.info(f"✓ Database indexes created successfully ({created})")
+
+    def check_query_plans(self) -> List[str]:
+        """
+        Run explain() for every registered hot query shape and warn on COLLSCAN.
+        
+        Returns:
+            Names of query shapes that fell back to a collection scan
+        """
+        collscans = []
+        checked = 0
+        for shape in QUERY_SHAPES:
+            try:
+                cursor = self.db[shape.collection].find(shape.filter)
+                if shape.sort:
+                    cursor = cursor.sort(shape.sort)
+                plan = cursor.limit(1).explain().get("queryPlanner", {}).get("winningPlan", {})
+            except Exception as e:
+                logger.debug(f"Query plan check skipped for {shape.name}: {e}")
+                continue
+
+            checked += 1
+            if "COLLSCAN" in _plan_stages(plan):
+                collscans.append(shape.name)
+                logger.warning(f"⚠️ Query shape '{shape.name}' on {shape.collection} uses COLLSCAN")
+
+        if checked and not collscans:
+            logger.info(f"✓ Query plan check passed ({checked}/{len(QUERY_SHAPES)} shapes indexed)")
+        return collscans
+
+    def exists(self, collection: str, query: Dict[str, Any]) -> bool:
+        """
+        Whether any document in `collection` matches `query`.
+
+        Only the _id comes back over the wire, so the check is served from the
+        index when `query` is covered by one.
+        """
+        return self.db[collection].find_one(query, ID_ONLY) is not None
     
     @property
     def tweets(self) -> Collection:
@@ -134,6 +339,41 @@ class MongoDB:
         if self.db is None:
             raise RuntimeError("Database not connected")
         return self.db['rate_limits']
+    
+    @property
+    def search_cache(self) -> Collection:
+        """Get search cache collection (TTL-expired search result pages)."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        return self.db['search_cache']
+
+    @property
+    def daily_rollups(self) -> Collection:
+        """Get daily rollups collection (per-day action counts and snapshots)."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        return self.db['daily_rollups']
+
+    @property
+    def rollup_state(self) -> Collection:
+        """Get rollup state collection (how far back daily rollups are complete)."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        return self.db['rollup_state']
+
+    @property
+    def reply_history(self) -> Collection:
+        """Get reply history collection (last reply per user, kept past archiving)."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        return self.db['reply_history']
+
+    @property
+    def llm_cache(self) -> Collection:
+        """Get LLM completion cache collection."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        return self.db['llm_cache']
 
 
 # Global database instance
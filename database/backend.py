@@ -0,0 +1,62 @@
+"""Storage backend selection.
+
+Operations talk to collections through `db.<collection>` and use only the
+calls listed in StorageCollection. Two backends provide them:
+
+    mongo   pymongo.MongoClient (default)
+    memory  database.memory.MemoryClient, an in-process engine for offline
+            runs, dry runs and tests (STORAGE_BACKEND=memory)
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from pymongo import MongoClient
+
+from config import config
+
+
+class StorageCursor(Protocol):
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> "StorageCursor": ...
+    def limit(self, count: int) -> "StorageCursor": ...
+    def batch_size(self, size: int) -> "StorageCursor": ...
+    def explain(self) -> Dict[str, Any]: ...
+    def __iter__(self) -> Iterator[Dict[str, Any]]: ...
+
+
+class StorageCollection(Protocol):
+    """The collection operations the bot relies on."""
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Any] = None,
+             **kwargs: Any) -> StorageCursor: ...
+    def find_one(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Any] = None,
+                 sort: Optional[Any] = None) -> Optional[Dict[str, Any]]: ...
+    def insert_one(self, document: Dict[str, Any]) -> Any: ...
+    def insert_many(self, documents: Iterable[Dict[str, Any]], ordered: bool = True) -> Any: ...
+    def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> Any: ...
+    def find_one_and_update(self, filter: Dict[str, Any], update: Dict[str, Any], **kwargs: Any) -> Optional[Dict[str, Any]]: ...
+    def delete_many(self, filter: Dict[str, Any]) -> Any: ...
+    def count_documents(self, filter: Dict[str, Any]) -> int: ...
+    def estimated_document_count(self) -> int: ...
+    def aggregate(self, pipeline: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]: ...
+    def bulk_write(self, requests: List[Any], ordered: bool = True) -> Any: ...
+    def create_indexes(self, models: List[Any]) -> List[str]: ...
+
+
+def open_client(options: Optional[Dict[str, Any]] = None) -> Tuple[Any, str]:
+    """
+    Create the client for config.STORAGE_BACKEND.
+
+    Args:
+        options: MongoClient keyword options (ignored by the memory backend)
+
+    Returns:
+        (client, database name)
+    """
+    if config.STORAGE_BACKEND == "memory":
+        from database.memory import memory_client
+        return memory_client, "x-growth"
+    if config.STORAGE_BACKEND != "mongo":
+        raise ValueError(f"Unknown STORAGE_BACKEND: {config.STORAGE_BACKEND}")
+
+    # Get database name from URI or use default
+    db_name = config.MONGODB_URI.split('/')[-1].split('?')[0] or 'x-growth'
+    return MongoClient(config.MONGODB_URI, **(options or {})), db_name
@@ -0,0 +1,132 @@
+"""Buffered per-collection writes flushed with unordered bulk_write."""
+import atexit
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import Config
+from database import db
+from utils.logger import logger
+
+
+Listener = Callable[[Dict[str, Any]], None]
+
+
+class BulkWriter:
+    """
+    Queues inserts and upserts per collection and writes them in batches.
+
+    A collection's queue is flushed when it reaches BULK_WRITE_BATCH_SIZE or
+    its oldest op is older than BULK_WRITE_MAX_AGE_SECONDS (checked on
+    enqueue), at phase boundaries (flush()), and at interpreter exit.
+
+    In-process caches that must see a write before it reaches MongoDB
+    register a listener; listeners receive each inserted document at
+    enqueue time. Code that reads the collection back from MongoDB should
+    call flush(<collection>) first.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, List[Any]] = defaultdict(list)
+        self._oldest: Dict[str, float] = {}
+        self._listeners: Dict[str, List[Listener]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.flushed_ops = 0
+        self.flush_calls = 0
+
+    def add_listener(self, collection: str, listener: Listener) -> None:
+        """Call `listener(document)` for every document inserted into `collection`."""
+        self._listeners[collection].append(listener)
+
+    def _notify(self, collection: str, document: Dict[str, Any]) -> None:
+        for listener in self._listeners.get(collection, []):
+            try:
+                listener(document)
+            except Exception as e:
+                logger.warning(f"Bulk writer listener on {collection} failed: {e}")
+
+    def _enqueue(self, collection: str, op: Any) -> None:
+        if not Config.BULK_WRITES_ENABLED:
+            self._execute(collection, [op])
+            return
+
+        with self._lock:
+            queue = self._queues[collection]
+            if not queue:
+                self._oldest[collection] = time.monotonic()
+            queue.append(op)
+            due = (
+                len(queue) >= max(1, Config.BULK_WRITE_BATCH_SIZE)
+                or time.monotonic() - self._oldest[collection] >= Config.BULK_WRITE_MAX_AGE_SECONDS
+            )
+        if due:
+            self.flush(collection)
+
+    def insert(self, collection: str, document: Dict[str, Any]) -> None:
+        """Queue an insert_one."""
+        self._notify(collection, document)
+        self._enqueue(collection, InsertOne(document))
+
+    def upsert(self, collection: str, filter: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """Queue an update_one(..., upsert=True)."""
+        self._enqueue(collection, UpdateOne(filter, update, upsert=True))
+
+    def update(self, collection: str, filter: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """Queue an update_one without upsert."""
+        self._enqueue(collection, UpdateOne(filter, update))
+
+    def pending(self, collection: Optional[str] = None) -> int:
+        with self._lock:
+            if collection:
+                return len(self._queues.get(collection, []))
+            return sum(len(q) for q in self._queues.values())
+
+    def flush(self, collection: Optional[str] = None) -> int:
+        """
+        Write queued ops for one collection (or all).
+
+        Returns:
+            Number of ops sent to MongoDB
+        """
+        with self._lock:
+            names = [collection] if collection else list(self._queues.keys())
+            batches = {}
+            for name in names:
+                ops = self._queues.pop(name, [])
+                self._oldest.pop(name, None)
+                if ops:
+                    batches[name] = ops
+
+        sent = 0
+        for name, ops in batches.items():
+            sent += self._execute(name, ops)
+        return sent
+
+    def _execute(self, collection: str, ops: List[Any]) -> int:
+        try:
+            db.db[collection].bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            logger.error(f"Bulk write to {collection}: {len(errors)}/{len(ops)} ops failed: {errors[:1]}")
+        except Exception as e:
+            logger.error(f"Bulk write to {collection} failed ({len(ops)} ops dropped): {e}")
+            return 0
+        self.flushed_ops += len(ops)
+        self.flush_calls += 1
+        return len(ops)
+
+
+# Global writer instance
+bulk_writer = BulkWriter()
+
+
+def _flush_on_exit() -> None:
+    if bulk_writer.pending() and db.db is not None:
+        bulk_writer.flush()
+
+
+atexit.register(_flush_on_exit)
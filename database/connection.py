@@ -0,0 +1,198 @@
+"""Process-wide MongoDB client with pool tuning, wire compression and pool metrics.
+
+Every `db.connect()` in a process shares one client (and its warm
+connection pool). Indexes are not touched on connect; apply them with
+`db.migrate()` or:
+
+    python -m database.connection --migrate [--stats]
+"""
+import argparse
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from config import config
+from database.backend import open_client
+from utils.logger import logger
+
+
+def _available_compressors() -> List[str]:
+    """Configured compressors whose Python support libraries are installed."""
+    available = []
+    for name in [c.strip() for c in config.MONGO_COMPRESSORS.split(",") if c.strip()]:
+        try:
+            if name == "zstd":
+                import zstandard  # noqa: F401
+            elif name == "snappy":
+                import snappy  # noqa: F401
+        except ImportError:
+            logger.debug(f"{name} compression unavailable (library not installed)")
+            continue
+        available.append(name)
+    return available
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Counts pool checkouts and how long callers waited for a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = threading.local()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.pool_clears = 0
+
+    def _waited(self) -> float:
+        started = getattr(self._started, "at", None)
+        self._started.at = None
+        return (time.monotonic() - started) * 1000 if started else 0.0
+
+    def connection_check_out_started(self, event: Any) -> None:
+        self._started.at = time.monotonic()
+
+    def connection_checked_out(self, event: Any) -> None:
+        waited = self._waited()
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += waited
+            self.wait_ms_max = max(self.wait_ms_max, waited)
+
+    def connection_check_out_failed(self, event: Any) -> None:
+        waited = self._waited()
+        with self._lock:
+            self.checkout_failures += 1
+            self.wait_ms_total += waited
+            self.wait_ms_max = max(self.wait_ms_max, waited)
+
+    def connection_created(self, event: Any) -> None:
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event: Any) -> None:
+        with self._lock:
+            self.connections_closed += 1
+
+    def pool_cleared(self, event: Any) -> None:
+        with self._lock:
+            self.pool_clears += 1
+
+    # Events the metrics do not use
+    def pool_created(self, event: Any) -> None:
+        pass
+
+    def pool_ready(self, event: Any) -> None:
+        pass
+
+    def pool_closed(self, event: Any) -> None:
+        pass
+
+    def connection_ready(self, event: Any) -> None:
+        pass
+
+    def connection_checked_in(self, event: Any) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": round(self.wait_ms_total / attempts, 2) if attempts else 0.0,
+                "max_wait_ms": round(self.wait_ms_max, 2),
+                "open_connections": self.connections_created - self.connections_closed,
+                "connections_created": self.connections_created,
+                "pool_clears": self.pool_clears,
+            }
+
+
+class ConnectionManager:
+    """Creates the storage client once per process and hands out the shared instance."""
+
+    def __init__(self):
+        self._client: Optional[Any] = None
+        self._db_name: Optional[str] = None
+        self._lock = threading.Lock()
+        self.metrics = PoolMetrics()
+
+    def client_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": config.MONGO_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS,
+            "socketTimeoutMS": config.MONGO_SOCKET_TIMEOUT_MS,
+            "retryWrites": True,
+            "appname": "x-growth",
+            "event_listeners": [self.metrics],
+        }
+        compressors = _available_compressors()
+        if compressors:
+            options["compressors"] = ",".join(compressors)
+        return options
+
+    def get(self) -> Tuple[Any, str]:
+        """
+        Return (client, database name), creating and pinging the client on first use.
+        """
+        with self._lock:
+            if self._client is None:
+                client, db_name = open_client(self.client_options())
+                try:
+                    client.admin.command("ping")
+                except Exception:
+                    client.close()
+                    raise
+                self._client, self._db_name = client, db_name
+                logger.debug(f"Storage client options: {self.describe()}")
+            return self._client, self._db_name
+
+    def describe(self) -> Dict[str, Any]:
+        options = self.client_options()
+        options.pop("event_listeners")
+        return options
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._db_name = None
+
+
+# Global connection manager instance
+connection_manager = ConnectionManager()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Database connection utilities")
+    parser.add_argument("--migrate", action="store_true", help="Create indexes and check query plans.")
+    parser.add_argument("--stats", action="store_true", help="Print connection pool metrics.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    from database import db
+
+    args = _parse_args()
+    try:
+        db.connect()
+        if args.migrate:
+            db.migrate()
+        if args.stats:
+            logger.info(f"Pool metrics: {connection_manager.metrics.stats()}")
+    finally:
+        if db.client:
+            db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
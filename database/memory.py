@@ -0,0 +1,947 @@
+"""In-process storage engine implementing the pymongo subset the bot uses.
+
+Selected with STORAGE_BACKEND=memory. Documents live in per-collection dicts
+keyed by _id; every index declared in INDEXES keeps an ordered map on its leading
+field, used for equality, $in and range lookups, and unique indexes are
+enforced. Datetimes are stored at millisecond precision, as in BSON. Data lasts for the life of the process.
+
+Supported:
+    find / find_one (filter, projection, sort, limit, skip), count_documents,
+    estimated_document_count, insert_one / insert_many, update_one /
+    update_many / find_one_and_update (upsert; $set $unset $inc $setOnInsert
+    $push $addToSet $min $max), delete_one / delete_many, bulk_write
+    (InsertOne, UpdateOne, UpdateMany, DeleteOne, DeleteMany), create_index(es),
+    explain, and aggregate with $match $group $sort $limit $skip $project
+    $facet $count $unwind ($sum $avg $min $max $first $last $push $addToSet;
+    $ifNull expressions).
+
+Query operators: equality (dotted paths, array membership), $eq $ne $gt $gte
+$lt $lte $in $nin $exists $regex, $and $or $nor.
+
+Not supported: TTL expiry, transactions, $dateTrunc and other operators not
+listed above (they raise NotImplementedError).
+"""
+import bisect
+import re
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------------------------
+# Values, paths and ordering
+# ---------------------------------------------------------------------------
+
+def _copy(value: Any) -> Any:
+    """Copy nested dicts/lists; leaf values (str, datetime, ObjectId...) are immutable."""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _to_bson(value: Any) -> Any:
+    """Copy a value as MongoDB would store it (tuples become lists, datetimes lose microseconds)."""
+    if isinstance(value, dict):
+        return {k: _to_bson(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_bson(v) for v in value]
+    if isinstance(value, datetime):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def _type_rank(value: Any) -> int:
+    """BSON comparison order for the types the bot stores."""
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    rank = _type_rank(value)
+    if rank == 1:
+        return (1, 0)
+    if rank in (4, 5, 10):
+        return (rank, str(value))
+    return (rank, value)
+
+
+def _compare(a: Any, b: Any) -> Optional[int]:
+    """-1/0/1, or None when the values are in different type brackets."""
+    if _type_rank(a) != _type_rank(b) or a is _MISSING:
+        return None
+    ka, kb = _sort_key(a), _sort_key(b)
+    return (ka > kb) - (ka < kb)
+
+
+def _get_path(doc: Any, path: str) -> Any:
+    """Value at a dotted path; traversing a list collects values from its elements."""
+    current = doc
+    for part in path.split("."):
+        if isinstance(current, dict):
+            current = current.get(part, _MISSING)
+        elif isinstance(current, list):
+            if part.isdigit():
+                index = int(part)
+                current = current[index] if index < len(current) else _MISSING
+            else:
+                values = [_get_path(item, part) for item in current if isinstance(item, dict)]
+                values = [v for v in values if v is not _MISSING]
+                current = values if values else _MISSING
+        else:
+            return _MISSING
+        if current is _MISSING:
+            return _MISSING
+    return current
+
+
+def _candidates(value: Any) -> List[Any]:
+    """A field value plus, for arrays, each element (Mongo's implicit array matching)."""
+    if isinstance(value, list):
+        return [value] + value
+    return [value]
+
+
+def _equals(a: Any, b: Any) -> bool:
+    if a is _MISSING:
+        a = None
+    if _type_rank(a) != _type_rank(b):
+        return False
+    return a == b
+
+
+# ---------------------------------------------------------------------------
+# Query matching
+# ---------------------------------------------------------------------------
+
+def _match_operator(op: str, value: Any, arg: Any) -> bool:
+    if op == "$eq":
+        return any(_equals(v, arg) for v in _candidates(value))
+    if op == "$ne":
+        return not any(_equals(v, arg) for v in _candidates(value))
+    if op in ("$gt", "$gte", "$lt", "$lte"):
+        for v in _candidates(value):
+            result = _compare(v, arg)
+            if result is None:
+                continue
+            if (op == "$gt" and result > 0) or (op == "$gte" and result >= 0) \
+                    or (op == "$lt" and result < 0) or (op == "$lte" and result <= 0):
+                return True
+        return False
+    if op == "$in":
+        return any(_equals(v, a) for v in _candidates(value) for a in arg)
+    if op == "$nin":
+        return not any(_equals(v, a) for v in _candidates(value) for a in arg)
+    if op == "$exists":
+        return (value is not _MISSING) == bool(arg)
+    if op == "$regex":
+        pattern = arg if hasattr(arg, "search") else re.compile(arg)
+        return any(isinstance(v, str) and pattern.search(v) for v in _candidates(value))
+    if op == "$options":
+        return True
+    raise NotImplementedError(f"Query operator {op} is not supported by the memory backend")
+
+
+def _match_field(doc: Dict[str, Any], path: str, condition: Any) -> bool:
+    value = _get_path(doc, path)
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        if "$regex" in condition and "$options" in condition:
+            condition = dict(condition, **{"$regex": re.compile(condition["$regex"], _re_flags(condition["$options"]))})
+        return all(_match_operator(op, value, arg) for op, arg in condition.items())
+    if hasattr(condition, "search"):  # compiled regex
+        return _match_operator("$regex", value, condition)
+    return any(_equals(v, condition) for v in _candidates(value))
+
+
+def _re_flags(options: str) -> int:
+    flags = 0
+    for char, flag in (("i", re.IGNORECASE), ("m", re.MULTILINE), ("s", re.DOTALL), ("x", re.VERBOSE)):
+        if char in options:
+            flags |= flag
+    return flags
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """True if `doc` satisfies the MongoDB query document `query`."""
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, sub) for sub in condition):
+                return False
+        elif key.startswith("$"):
+            raise NotImplementedError(f"Query operator {key} is not supported by the memory backend")
+        elif not _match_field(doc, key, condition):
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Updates and projections
+# ---------------------------------------------------------------------------
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    node = doc
+    for part in parents:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = {}
+            node[part] = child
+        node = child
+    node[leaf] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str) -> None:
+    *parents, leaf = path.split(".")
+    node = doc
+    for part in parents:
+        node = node.get(part)
+        if not isinstance(node, dict):
+            return
+    node.pop(leaf, None)
+
+
+def apply_update(doc: Dict[str, Any], update: Dict[str, Any], inserting: bool = False) -> None:
+    """Apply an update-operator document to `doc` in place."""
+    for op, fields in update.items():
+        if not op.startswith("$"):
+            raise NotImplementedError("Replacement-style updates are not supported by the memory backend")
+        for path, arg in fields.items():
+            current = _get_path(doc, path)
+            if op == "$set":
+                _set_path(doc, path, _to_bson(arg))
+            elif op == "$setOnInsert":
+                if inserting:
+                    _set_path(doc, path, _to_bson(arg))
+            elif op == "$unset":
+                _unset_path(doc, path)
+            elif op == "$inc":
+                _set_path(doc, path, (0 if current in (_MISSING, None) else current) + arg)
+            elif op in ("$min", "$max"):
+                if current is _MISSING or current is None:
+                    _set_path(doc, path, _to_bson(arg))
+                else:
+                    result = _compare(arg, current)
+                    if result is not None and ((op == "$min" and result < 0) or (op == "$max" and result > 0)):
+                        _set_path(doc, path, _to_bson(arg))
+            elif op in ("$push", "$addToSet"):
+                items = arg["$each"] if isinstance(arg, dict) and "$each" in arg else [arg]
+                target = [] if current is _MISSING else current
+                if not isinstance(target, list):
+                    raise ValueError(f"{op} on non-array field {path}")
+                for item in items:
+                    if op == "$push" or not any(_equals(existing, item) for existing in target):
+                        target.append(_to_bson(item))
+                _set_path(doc, path, target)
+            else:
+                raise NotImplementedError(f"Update operator {op} is not supported by the memory backend")
+
+
+def _upsert_seed(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Document created by an upsert: the query's plain equality fields."""
+    seed: Dict[str, Any] = {}
+    for key, condition in query.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(condition, dict) and any(k.startswith("$") for k in condition):
+            if "$eq" in condition:
+                _set_path(seed, key, _to_bson(condition["$eq"]))
+            continue
+        _set_path(seed, key, _to_bson(condition))
+    return seed
+
+
+def project(doc: Dict[str, Any], projection: Optional[Any]) -> Dict[str, Any]:
+    """Apply a find() projection (inclusion or exclusion) and return a copy."""
+    if not projection:
+        return _copy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include_id = bool(projection.get("_id", 1))
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if fields and all(fields.values()):
+        result: Dict[str, Any] = {}
+        for path in fields:
+            value = _get_path(doc, path)
+            if value is not _MISSING:
+                _set_path(result, path, _copy(value))
+    else:
+        result = _copy(doc)
+        for path in fields:
+            _unset_path(result, path)
+    if include_id and "_id" in doc:
+        result["_id"] = doc["_id"]
+    elif not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _normalize_sort(key_or_list: Any, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [(k, d) for k, d in key_or_list]
+
+
+def sort_documents(docs: List[Dict[str, Any]], spec: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for field, direction in reversed(spec):
+        docs.sort(key=lambda d, f=field: _sort_key(_get_path(d, f)), reverse=direction < 0)
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def evaluate(expr: Any, doc: Dict[str, Any]) -> Any:
+    """Evaluate an aggregation expression against a document."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = _get_path(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, dict):
+        if len(expr) == 1:
+            op, arg = next(iter(expr.items()))
+            if op == "$ifNull":
+                for candidate in arg[:-1]:
+                    value = evaluate(candidate, doc)
+                    if value is not None:
+                        return value
+                return evaluate(arg[-1], doc)
+            if op == "$literal":
+                return arg
+            if op.startswith("$"):
+                raise NotImplementedError(f"Expression {op} is not supported by the memory backend")
+        return {k: evaluate(v, doc) for k, v in expr.items()}
+    if isinstance(expr, list):
+        return [evaluate(v, doc) for v in expr]
+    return expr
+
+
+def _group_key(expr: Any, doc: Dict[str, Any]) -> Any:
+    if isinstance(expr, dict) and not any(k.startswith("$") for k in expr):
+        # Missing fields are left out of compound group keys.
+        key = {}
+        for name, sub in expr.items():
+            value = _get_path(doc, sub[1:]) if isinstance(sub, str) and sub.startswith("$") else evaluate(sub, doc)
+            if value is not _MISSING:
+                key[name] = value
+        return key
+    return evaluate(expr, doc)
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ("d", tuple((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("l", tuple(_hashable(v) for v in value))
+    return (_type_rank(value), value)
+
+
+def _accumulate(op: str, values: List[Any]) -> Any:
+    if op == "$sum":
+        return sum(v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool))
+    if op == "$avg":
+        numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        return sum(numbers) / len(numbers) if numbers else None
+    if op in ("$min", "$max"):
+        present = [v for v in values if v is not None]
+        if not present:
+            return None
+        pick = min if op == "$min" else max
+        return pick(present, key=_sort_key)
+    if op == "$first":
+        return values[0] if values else None
+    if op == "$last":
+        return values[-1] if values else None
+    if op == "$push":
+        return list(values)
+    if op == "$addToSet":
+        unique: Dict[Any, Any] = {}
+        for v in values:
+            unique.setdefault(_hashable(v), v)
+        return list(unique.values())
+    raise NotImplementedError(f"Accumulator {op} is not supported by the memory backend")
+
+
+def _stage_group(docs: List[Dict[str, Any]], spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    groups: Dict[Any, Tuple[Any, List[Dict[str, Any]]]] = {}
+    for doc in docs:
+        key = _group_key(spec["_id"], doc)
+        groups.setdefault(_hashable(key), (key, []))[1].append(doc)
+
+    results = []
+    for key, members in groups.values():
+        row = {"_id": key}
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            op, expr = next(iter(accumulator.items()))
+            row[name] = _accumulate(op, [evaluate(expr, m) for m in members])
+        results.append(row)
+    return results
+
+
+def _stage_project(docs: List[Dict[str, Any]], spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    plain = all(v in (0, 1, True, False) for v in spec.values())
+    if plain:
+        return [project(doc, spec) for doc in docs]
+    results = []
+    for doc in docs:
+        row: Dict[str, Any] = {}
+        if spec.get("_id", 1) and "_id" in doc:
+            row["_id"] = doc["_id"]
+        for name, expr in spec.items():
+            if name == "_id":
+                continue
+            if expr in (1, True):
+                value = _get_path(doc, name)
+                if value is not _MISSING:
+                    _set_path(row, name, _copy(value))
+            elif expr not in (0, False):
+                _set_path(row, name, evaluate(expr, doc))
+        results.append(row)
+    return results
+
+
+def _stage_unwind(docs: List[Dict[str, Any]], spec: Any) -> List[Dict[str, Any]]:
+    path = (spec["path"] if isinstance(spec, dict) else spec)[1:]
+    results = []
+    for doc in docs:
+        values = _get_path(doc, path)
+        if not isinstance(values, list):
+            if values is not _MISSING and values is not None:
+                results.append(doc)
+            continue
+        for value in values:
+            row = _copy(doc)
+            _set_path(row, path, value)
+            results.append(row)
+    return results
+
+
+def run_pipeline(docs: List[Dict[str, Any]], pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run an aggregation pipeline over already-copied documents."""
+    for stage in pipeline:
+        name, spec = next(iter(stage.items()))
+        if name == "$match":
+            docs = [d for d in docs if matches(d, spec)]
+        elif name == "$group":
+            docs = _stage_group(docs, spec)
+        elif name == "$sort":
+            docs = sort_documents(list(docs), _normalize_sort(spec))
+        elif name == "$limit":
+            docs = docs[:spec]
+        elif name == "$skip":
+            docs = docs[spec:]
+        elif name == "$project":
+            docs = _stage_project(docs, spec)
+        elif name == "$unwind":
+            docs = _stage_unwind(docs, spec)
+        elif name == "$count":
+            docs = [{spec: len(docs)}] if docs else []
+        elif name == "$facet":
+            docs = [{field: run_pipeline([_copy(d) for d in docs], sub) for field, sub in spec.items()}]
+        else:
+            raise NotImplementedError(f"Aggregation stage {name} is not supported by the memory backend")
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Collections, cursors, databases
+# ---------------------------------------------------------------------------
+
+_RANGE_OPS = ("$gt", "$gte", "$lt", "$lte")
+
+
+def _index_key(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return ("doc", _hashable(value))
+    return _sort_key(None if value is _MISSING else value)
+
+
+class _Index:
+    """
+    Ordered map from the leading field's value to _ids (equality, $in and
+    range lookups), plus the unique constraint over all of the index's fields.
+    """
+
+    def __init__(self, name: str, keys: List[Tuple[str, Any]], unique: bool):
+        self.name = name
+        self.fields = [field for field, _ in keys]
+        self.leading = self.fields[0]
+        self.unique = unique
+        self.entries: Dict[Any, set] = {}
+        self.ordered: List[Any] = []  # sorted scalar keys of `entries`
+        self.unique_keys: Dict[Any, Any] = {}
+
+    def _leading_keys(self, doc: Dict[str, Any]) -> List[Any]:
+        return [_index_key(v) for v in _candidates(_get_path(doc, self.leading))]
+
+    def _unique_key(self, doc: Dict[str, Any]) -> Any:
+        return tuple(_hashable(None if (v := _get_path(doc, f)) is _MISSING else v) for f in self.fields)
+
+    def check(self, doc: Dict[str, Any], collection: str) -> None:
+        if not self.unique:
+            return
+        owner = self.unique_keys.get(self._unique_key(doc))
+        if owner is not None and owner != doc.get("_id"):
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {collection} index: {self.name}", 11000
+            )
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        for key in self._leading_keys(doc):
+            ids = self.entries.get(key)
+            if ids is None:
+                ids = self.entries[key] = set()
+                if key[0] != "doc":
+                    bisect.insort(self.ordered, key)
+            ids.add(doc["_id"])
+        if self.unique:
+            self.unique_keys[self._unique_key(doc)] = doc["_id"]
+
+    def remove(self, doc: Dict[str, Any]) -> None:
+        for key in self._leading_keys(doc):
+            ids = self.entries.get(key)
+            if ids:
+                ids.discard(doc["_id"])
+                if not ids:
+                    del self.entries[key]
+                    if key[0] != "doc":
+                        self.ordered.pop(bisect.bisect_left(self.ordered, key))
+        if self.unique:
+            self.unique_keys.pop(self._unique_key(doc), None)
+
+    def _range(self, condition: Dict[str, Any]) -> Optional[List[Any]]:
+        bounds = {op: condition[op] for op in _RANGE_OPS if op in condition}
+        ranks = {_type_rank(v) for v in bounds.values()}
+        if len(ranks) != 1:
+            return None
+        rank = ranks.pop()
+        lo = bisect.bisect_left(self.ordered, (rank,))
+        hi = bisect.bisect_left(self.ordered, (rank + 1,))
+        if "$gte" in bounds:
+            lo = max(lo, bisect.bisect_left(self.ordered, _sort_key(bounds["$gte"])))
+        if "$gt" in bounds:
+            lo = max(lo, bisect.bisect_right(self.ordered, _sort_key(bounds["$gt"])))
+        if "$lte" in bounds:
+            hi = min(hi, bisect.bisect_right(self.ordered, _sort_key(bounds["$lte"])))
+        if "$lt" in bounds:
+            hi = min(hi, bisect.bisect_left(self.ordered, _sort_key(bounds["$lt"])))
+        return self.ordered[lo:hi]
+
+    def lookup(self, condition: Any) -> Optional[set]:
+        """_ids that may match `condition` on the leading field, or None if unusable."""
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if "$eq" in condition:
+                keys = [_index_key(condition["$eq"])]
+            elif "$in" in condition:
+                keys = [_index_key(v) for v in condition["$in"]]
+            elif any(op in condition for op in _RANGE_OPS):
+                keys = self._range(condition)
+                if keys is None:
+                    return None
+            else:
+                return None
+        elif hasattr(condition, "search"):
+            return None
+        else:
+            keys = [_index_key(condition)]
+        ids: set = set()
+        for key in keys:
+            ids |= self.entries.get(key, set())
+        return ids
+
+
+class MemoryCursor:
+    """Lazy find() result supporting sort / skip / limit / batch_size / explain."""
+
+    def __init__(self, collection: "MemoryCollection", query: Optional[Dict[str, Any]],
+                 projection: Optional[Any] = None):
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> "MemoryCursor":
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int) -> "MemoryCursor":
+        return self
+
+    def explain(self) -> Dict[str, Any]:
+        index = self._collection._plan(self._query)[0]
+        if index is None:
+            stage = {"stage": "COLLSCAN"}
+        else:
+            stage = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": index.name}}
+        return {"queryPlanner": {"winningPlan": stage}}
+
+    def _documents(self) -> List[Dict[str, Any]]:
+        docs = self._collection._select(self._query)
+        if self._sort:
+            docs = sort_documents(docs, self._sort)
+        if self._skip:
+            docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:abs(self._limit)]
+        return [project(doc, self._projection) for doc in docs]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._documents())
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCollection:
+    """A collection held in a dict keyed by _id."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: Dict[Any, Dict[str, Any]] = {}
+        self._order: Dict[Any, int] = {}
+        self._next_position = 0
+        self._indexes: Dict[str, _Index] = {}
+        self._lock = threading.RLock()
+        self.options: Dict[str, Any] = {}
+
+    # --- planning / selection ---
+
+    def _plan(self, query: Dict[str, Any]) -> Tuple[Optional[_Index], Optional[set]]:
+        best: Tuple[Optional[_Index], Optional[set]] = (None, None)
+        for index in self._indexes.values():
+            if index.leading not in query:
+                continue
+            ids = index.lookup(query[index.leading])
+            if ids is not None and (best[1] is None or len(ids) < len(best[1])):
+                best = (index, ids)
+        return best
+
+    def _select(self, query: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Matching stored documents (not copies), in insertion order."""
+        query = _to_bson(query or {})
+        with self._lock:
+            _, ids = self._plan(query)
+            if ids is None:
+                pool: Iterable[Dict[str, Any]] = self._docs.values()
+            else:
+                # Index hits are returned in insertion order, like a collection scan.
+                pool = [self._docs[i] for i in sorted(ids, key=self._order.__getitem__)]
+            return [doc for doc in pool if matches(doc, query)]
+
+    # --- writes ---
+
+    def _store(self, doc: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.check(doc, self.name)
+        self._docs[doc["_id"]] = doc
+        self._order[doc["_id"]] = self._next_position
+        self._next_position += 1
+        for index in self._indexes.values():
+            index.add(doc)
+
+    def _replace(self, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.check(new, self.name)
+        for index in self._indexes.values():
+            index.remove(old)
+        self._docs[new["_id"]] = new
+        for index in self._indexes.values():
+            index.add(new)
+
+    def _remove(self, doc: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.remove(doc)
+        del self._docs[doc["_id"]]
+        del self._order[doc["_id"]]
+
+    def insert_one(self, document: Dict[str, Any]) -> SimpleNamespace:
+        with self._lock:
+            document.setdefault("_id", ObjectId())
+            if document["_id"] in self._docs:
+                raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_", 11000)
+            self._store(_to_bson(document))
+        return SimpleNamespace(inserted_id=document["_id"], acknowledged=True)
+
+    def insert_many(self, documents: Iterable[Dict[str, Any]], ordered: bool = True) -> SimpleNamespace:
+        documents = list(documents)
+        errors = []
+        ids = []
+        for position, document in enumerate(documents):
+            try:
+                ids.append(self.insert_one(document).inserted_id)
+            except DuplicateKeyError as e:
+                errors.append({"index": position, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(ids)})
+        return SimpleNamespace(inserted_ids=ids, acknowledged=True)
+
+    def _update(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool,
+                many: bool) -> Tuple[SimpleNamespace, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Returns (result, document before, document after) for the first matched/upserted doc."""
+        with self._lock:
+            targets = self._select(filter)
+            if not many:
+                targets = targets[:1]
+            if not targets:
+                if not upsert:
+                    return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None), None, None
+                doc = _upsert_seed(filter)
+                apply_update(doc, update, inserting=True)
+                doc.setdefault("_id", ObjectId())
+                self._store(doc)
+                result = SimpleNamespace(matched_count=0, modified_count=0, upserted_id=doc["_id"])
+                return result, None, doc
+
+            modified = 0
+            first_before = first_after = None
+            for old in targets:
+                new = _copy(old)
+                apply_update(new, update)
+                if new != old:
+                    self._replace(old, new)
+                    modified += 1
+                if first_before is None:
+                    first_before, first_after = old, new
+            result = SimpleNamespace(matched_count=len(targets), modified_count=modified, upserted_id=None)
+            return result, first_before, first_after
+
+    def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> SimpleNamespace:
+        return self._update(filter, update, upsert, many=False)[0]
+
+    def update_many(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> SimpleNamespace:
+        return self._update(filter, update, upsert, many=True)[0]
+
+    def find_one_and_update(self, filter: Dict[str, Any], update: Dict[str, Any], projection: Optional[Any] = None,
+                            sort: Optional[Any] = None, upsert: bool = False,
+                            return_document: bool = ReturnDocument.BEFORE) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if sort:
+                target = self.find_one(filter, {"_id": 1}, sort=sort)
+                if target is not None:
+                    filter = {"_id": target["_id"]}
+            _, before, after = self._update(filter, update, upsert, many=False)
+            doc = after if return_document == ReturnDocument.AFTER else before
+            return project(doc, projection) if doc is not None else None
+
+    def delete_many(self, filter: Dict[str, Any]) -> SimpleNamespace:
+        with self._lock:
+            targets = self._select(filter)
+            for doc in targets:
+                self._remove(doc)
+        return SimpleNamespace(deleted_count=len(targets), acknowledged=True)
+
+    def delete_one(self, filter: Dict[str, Any]) -> SimpleNamespace:
+        with self._lock:
+            targets = self._select(filter)[:1]
+            for doc in targets:
+                self._remove(doc)
+        return SimpleNamespace(deleted_count=len(targets), acknowledged=True)
+
+    def bulk_write(self, requests: List[Any], ordered: bool = True) -> SimpleNamespace:
+        counts = {"inserted": 0, "matched": 0, "modified": 0, "upserted": 0, "deleted": 0}
+        errors = []
+        for position, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self.insert_one(request._doc)
+                    counts["inserted"] += 1
+                elif isinstance(request, (UpdateOne, UpdateMany)):
+                    result = self._update(request._filter, request._doc, bool(request._upsert),
+                                          many=isinstance(request, UpdateMany))[0]
+                    counts["matched"] += result.matched_count
+                    counts["modified"] += result.modified_count
+                    counts["upserted"] += 1 if result.upserted_id is not None else 0
+                elif isinstance(request, (DeleteOne, DeleteMany)):
+                    remove = self.delete_many if isinstance(request, DeleteMany) else self.delete_one
+                    counts["deleted"] += remove(request._filter).deleted_count
+                else:
+                    raise NotImplementedError(f"{type(request).__name__} is not supported by the memory backend")
+            except DuplicateKeyError as e:
+                errors.append({"index": position, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, **{f"n{k.title()}": v for k, v in counts.items()}})
+        return SimpleNamespace(
+            inserted_count=counts["inserted"], matched_count=counts["matched"],
+            modified_count=counts["modified"], upserted_count=counts["upserted"],
+            deleted_count=counts["deleted"], acknowledged=True,
+        )
+
+    # --- reads ---
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Any] = None,
+             sort: Optional[Any] = None, limit: int = 0, skip: int = 0) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    def find_one(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Any] = None,
+                 sort: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        if filter is not None and not isinstance(filter, dict):
+            filter = {"_id": filter}
+        for doc in self.find(filter, projection, sort=sort, limit=1):
+            return doc
+        return None
+
+    def count_documents(self, filter: Dict[str, Any], limit: int = 0) -> int:
+        count = len(self._select(filter))
+        return min(count, limit) if limit else count
+
+    def estimated_document_count(self) -> int:
+        return len(self._docs)
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        pipeline = _to_bson(list(pipeline))
+        if pipeline and "$match" in pipeline[0]:
+            docs = [_copy(d) for d in self._select(pipeline[0]["$match"])]
+            pipeline = pipeline[1:]
+        else:
+            with self._lock:
+                docs = [_copy(d) for d in self._docs.values()]
+        return iter(run_pipeline(docs, pipeline))
+
+    # --- indexes ---
+
+    def create_index(self, keys: Any, **kwargs: Any) -> str:
+        keys = _normalize_sort(keys)
+        name = kwargs.get("name") or "_".join(f"{field}_{direction}" for field, direction in keys)
+        with self._lock:
+            if name not in self._indexes:
+                index = _Index(name, keys, bool(kwargs.get("unique")))
+                for doc in self._docs.values():
+                    index.check(doc, self.name)
+                    index.add(doc)
+                self._indexes[name] = index
+        return name
+
+    def create_indexes(self, models: List[Any]) -> List[str]:
+        names = []
+        for model in models:
+            document = dict(model.document)
+            keys = list(document.pop("key").items())
+            names.append(self.create_index(keys, **document))
+        return names
+
+    def index_information(self) -> Dict[str, Any]:
+        return {name: {"key": [(f, 1) for f in index.fields], "unique": index.unique}
+                for name, index in self._indexes.items()}
+
+    def drop(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._order.clear()
+            self._indexes.clear()
+
+
+class MemoryDatabase:
+    """Mapping of collection name -> MemoryCollection (created on first use)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = MemoryCollection(name)
+            return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def list_collection_names(self, filter: Optional[Dict[str, Any]] = None) -> List[str]:
+        names = [n for n, c in self._collections.items() if c._docs or c._indexes or c.options]
+        if filter and "name" in filter:
+            names = [n for n in names if n == filter["name"]]
+        return names
+
+    def create_collection(self, name: str, **options: Any) -> MemoryCollection:
+        collection = self[name]
+        collection.options = options
+        return collection
+
+    def drop_collection(self, name: str) -> None:
+        with self._lock:
+            self._collections.pop(name, None)
+
+    def command(self, name: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        if name == "ping":
+            return {"ok": 1.0}
+        raise NotImplementedError(f"Command {name} is not supported by the memory backend")
+
+
+class MemoryClient:
+    """Stand-in for MongoClient; databases persist until the process exits."""
+
+    def __init__(self):
+        self._databases: Dict[str, MemoryDatabase] = {}
+        self.admin = MemoryDatabase("admin")
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    def server_info(self) -> Dict[str, Any]:
+        # Reported as a pre-5.0 server so time series use bucket documents.
+        return {"version": "0.0.0-memory", "versionArray": [0, 0, 0, 0]}
+
+    def drop_database(self, name: str) -> None:
+        self._databases.pop(name, None)
+
+    def close(self) -> None:
+        pass
+
+
+# Global in-process client, shared by reconnects within one process
+memory_client = MemoryClient()
@@ -1,6 +1,7 @@
 """Database models and schema definitions."""
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from dataclasses import dataclass, field
 
 
@@ -79,3 +80,137 @@ class Post:
     retweets: int = 0
     replies: int = 0
     impressions: Optional[int] = None
+
+
+class _SlotRecord(Mapping):
+    """
+    Read-only-mapping view over __slots__ so records drop into code written
+    for dicts (`rec.get(...)`, `rec["id"]`, `dict(rec)`). A slot holding None
+    reads as a missing key unless it is listed in _REQUIRED.
+    """
+    __slots__ = ()
+    _REQUIRED: frozenset = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key not in self._REQUIRED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.__slots__:
+            if key in self._REQUIRED or getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain (BSON-encodable) dict of the present fields."""
+        return {k: v.to_dict() if isinstance(v, _SlotRecord) else v for k, v in self.items()}
+
+
+class AuthorProfile(_SlotRecord):
+    """Author fields a search page carries for each tweet (`author_info`)."""
+    __slots__ = ("username", "followers_count", "following_count", "tweet_count",
+                 "verified", "description", "account_age_days")
+    _REQUIRED = frozenset(__slots__)
+
+    def __init__(self, username: str = "", followers_count: int = 0, following_count: int = 0,
+                 tweet_count: int = 0, verified: bool = False, description: str = "",
+                 account_age_days: int = 0):
+        self.username = username
+        self.followers_count = followers_count
+        self.following_count = following_count
+        self.tweet_count = tweet_count
+        self.verified = verified
+        self.description = description
+        self.account_age_days = account_age_days
+
+    @classmethod
+    def from_user(cls, user: Any, now: Optional[datetime] = None) -> "AuthorProfile":
+        """Build from a v2 `includes.users` entry."""
+        metrics = user.public_metrics or {}
+        created_at = getattr(user, "created_at", None)
+        age_days = ((now or datetime.utcnow()) - created_at.replace(tzinfo=None)).days if created_at else 0
+        return cls(
+            username=user.username,
+            followers_count=metrics.get("followers_count", 0),
+            following_count=metrics.get("following_count", 0),
+            tweet_count=metrics.get("tweet_count", 0),
+            verified=getattr(user, "verified", False) or False,
+            description=getattr(user, "description", "") or "",
+            account_age_days=age_days,
+        )
+
+
+class Candidate(_SlotRecord):
+    """
+    One search-result tweet, built once per API page and annotated in place as
+    it moves through research, filtering and reply selection.
+    """
+    __slots__ = ("id", "text", "created_at", "author_id", "public_metrics", "author_info",
+                 # Pipeline annotations
+                 "research_query", "research_source", "candidate_score", "manual_score",
+                 "authenticity_score", "quality_score", "engagement", "followers_bucket")
+    _REQUIRED = frozenset(("id", "text", "created_at", "author_id", "public_metrics"))
+
+    def __init__(self, id: Any, text: str = "", created_at: Optional[datetime] = None,
+                 author_id: Any = None, public_metrics: Optional[Dict[str, int]] = None,
+                 author_info: Optional[AuthorProfile] = None, research_query: Optional[str] = None,
+                 research_source: Optional[str] = None, candidate_score: Optional[float] = None,
+                 manual_score: Optional[float] = None, authenticity_score: Optional[float] = None,
+                 quality_score: Optional[float] = None, engagement: Optional[int] = None,
+                 followers_bucket: Optional[str] = None):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        self.author_id = author_id
+        self.public_metrics = public_metrics
+        self.author_info = author_info
+        self.research_query = research_query
+        self.research_source = research_source
+        self.candidate_score = candidate_score
+        self.manual_score = manual_score
+        self.authenticity_score = authenticity_score
+        self.quality_score = quality_score
+        self.engagement = engagement
+        self.followers_bucket = followers_bucket
+
+    @classmethod
+    def from_dict(cls, doc: Dict[str, Any]) -> "Candidate":
+        """Rebuild from `to_dict()` output (e.g. a search_cache document)."""
+        fields = {k: doc[k] for k in cls.__slots__ if k in doc}
+        author = fields.get("author_info")
+        if isinstance(author, dict):
+            fields["author_info"] = AuthorProfile(**{k: author[k] for k in AuthorProfile.__slots__ if k in author})
+        return cls(**fields)
+
+    def copy(self) -> "Candidate":
+        """Shallow copy (author_info and public_metrics are shared, never mutated)."""
+        clone = Candidate.__new__(Candidate)
+        for key in self.__slots__:
+            setattr(clone, key, getattr(self, key))
+        return clone
+
+    # Cheap views for filters
+    @property
+    def username(self) -> str:
+        return (self.author_info.username or "").strip() if self.author_info else ""
+
+    @property
+    def followers(self) -> int:
+        return self.author_info.followers_count if self.author_info else 0
+
+    def metric(self, name: str) -> int:
+        return (self.public_metrics or {}).get(name, 0)
@@ -0,0 +1,131 @@
+"""Durable last-reply time per user, kept outside activity_logs.
+
+The reply rule (no second reply until the user talks back) has no time
+limit, so it cannot rest on activity_logs alone: retention archives those
+after RETENTION_ACTIVITY_DAYS. One reply_history document per reply target:
+
+    {"user_id": "123", "username": "jane", "last_reply_at": <datetime>}
+
+Kept current incrementally (activity_logs inserts through the bulk writer),
+filled from raw logs before they are archived, and rebuilt with:
+
+    python -m database.reply_history --backfill
+"""
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from database import db
+from database.bulk_writer import bulk_writer
+from utils.logger import logger
+
+
+class ReplyHistory:
+    """Maintains and reads the reply_history collection."""
+
+    @staticmethod
+    def _record(user_id: Any, username: str, timestamp: datetime) -> None:
+        if user_id:
+            update: Dict[str, Any] = {"$max": {"last_reply_at": timestamp}}
+            if username:
+                update["$set"] = {"username": username}
+            bulk_writer.upsert("reply_history", {"user_id": str(user_id)}, update)
+        elif username:
+            bulk_writer.upsert("reply_history", {"username": username}, {"$max": {"last_reply_at": timestamp}})
+
+    def record_activity(self, activity: Dict[str, Any]) -> None:
+        """bulk_writer listener: remember a successful reply."""
+        ts = activity.get("timestamp")
+        if activity.get("action") != "reply" or not activity.get("success") or not isinstance(ts, datetime):
+            return
+        self._record(activity.get("target_user_id"), activity.get("target_user") or "", ts)
+
+    def last_reply(self, user_id: str = "", username: str = "") -> Optional[datetime]:
+        """Last reply to a user, matched like the activity_logs lookup (id first, else username)."""
+        if user_id:
+            query = {"user_id": str(user_id)}
+        elif username:
+            query = {"username": username}
+        else:
+            return None
+        doc = db.reply_history.find_one(query, {"_id": 0, "last_reply_at": 1}, sort=[("last_reply_at", -1)])
+        return doc.get("last_reply_at") if doc else None
+
+    def all(self) -> Iterator[Dict[str, Any]]:
+        return db.reply_history.find({}, {"_id": 0, "user_id": 1, "username": 1, "last_reply_at": 1})
+
+    def ensure_built(self) -> int:
+        """Backfill from activity_logs if reply_history has never been filled."""
+        if db.reply_history.find_one({}, {"_id": 1}) is not None:
+            return 0
+        return self.backfill()
+
+    def backfill(self, until: Optional[datetime] = None, include_archive: bool = False) -> int:
+        """
+        Fold successful replies from activity_logs (before `until`) into reply_history.
+        Idempotent; include_archive also reads the retention archive.
+
+        Returns:
+            Number of reply targets written
+        """
+        match: Dict[str, Any] = {"action": "reply", "success": True}
+        if until:
+            match["timestamp"] = {"$lt": until}
+
+        if include_archive:
+            from database.retention import find_range
+            latest: Dict[tuple, datetime] = {}
+            for doc in find_range("activity_logs", end=until, filter={"action": "reply", "success": True}):
+                key = (doc.get("target_user_id") or "", doc.get("target_user") or "")
+                ts = doc.get("timestamp")
+                if isinstance(ts, datetime) and ts > latest.get(key, datetime.min):
+                    latest[key] = ts
+            rows = [{"_id": {"user_id": k[0], "username": k[1]}, "last": ts} for k, ts in latest.items()]
+        else:
+            rows = db.activity_logs.aggregate([
+                {"$match": match},
+                {"$group": {
+                    "_id": {"user_id": "$target_user_id", "username": "$target_user"},
+                    "last": {"$max": "$timestamp"},
+                }},
+            ])
+
+        written = 0
+        for row in rows:
+            key = row.get("_id", {}) or {}
+            if isinstance(row.get("last"), datetime) and (key.get("user_id") or key.get("username")):
+                self._record(key.get("user_id"), key.get("username") or "", row["last"])
+                written += 1
+        bulk_writer.flush("reply_history")
+        if written:
+            logger.info(f"✓ Recorded last reply for {written} user(s) in reply_history")
+        return written
+
+
+# Global instance; registered so buffered reply activities reach reply_history.
+reply_history = ReplyHistory()
+bulk_writer.add_listener("activity_logs", reply_history.record_activity)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain the reply_history collection")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Rebuild from activity_logs, including archived partitions.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        db.connect()
+        if args.backfill:
+            reply_history.backfill(include_archive=True)
+        else:
+            logger.info("Nothing to do (use --backfill)")
+    finally:
+        if db.client:
+            db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Retention tiering for append-only collections.
+
+Documents older than a per-collection horizon are folded into daily_rollups
+(when the collection feeds them) and, for replies, reply_history, appended to gzip JSONL partitions on local
+disk and then deleted from MongoDB:
+
+    <RETENTION_ARCHIVE_DIR>/<collection>/<YYYY-MM-DD>.jsonl.gz
+
+Documents are serialized with bson.json_util, so ObjectIds and datetimes
+round-trip. find_range() reads archived partitions and the live collection
+as one ascending stream for long-window analytics.
+
+Run manually with:
+
+    python -m database.retention [--dry-run]
+"""
+import argparse
+import gzip
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from bson import json_util
+
+from config import Config
+from database import db
+from database.bulk_writer import bulk_writer
+from database.reply_history import reply_history
+from database.rollups import daily_rollups
+from utils.logger import logger
+
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+class RetentionPolicy(NamedTuple):
+    """How long a collection keeps documents in MongoDB."""
+    collection: str
+    field: str
+    days: int
+    rollup: bool  # fold into daily_rollups before archiving
+
+
+def retention_policies() -> List[RetentionPolicy]:
+    return [
+        RetentionPolicy("activity_logs", "timestamp", Config.RETENTION_ACTIVITY_DAYS, True),
+        RetentionPolicy("metrics_history", "timestamp", Config.RETENTION_METRICS_DAYS, True),
+        RetentionPolicy("trends", "fetched_at", Config.RETENTION_TRENDS_DAYS, False),
+    ]
+
+
+def _policy_for(collection: str) -> Optional[RetentionPolicy]:
+    return next((p for p in retention_policies() if p.collection == collection), None)
+
+
+def _matches(doc: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """Top-level equality and {"$in": [...]} matching for archived documents."""
+    for key, expected in filter.items():
+        value = doc.get(key)
+        if isinstance(expected, dict) and "$in" in expected:
+            if value not in expected["$in"]:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class ArchiveStore:
+    """Date-partitioned gzip JSONL files, one directory per collection."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def partition_path(self, collection: str, day: str) -> Path:
+        return self.root / collection / f"{day}.jsonl.gz"
+
+    def append(self, collection: str, day: str, docs: List[Dict[str, Any]]) -> None:
+        """Append documents to a day partition (each call adds one gzip member)."""
+        path = self.partition_path(collection, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n" for doc in docs
+        )
+        with gzip.open(path, "at", encoding="utf-8") as fh:
+            fh.write(lines)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def days(self, collection: str) -> List[str]:
+        folder = self.root / collection
+        if not folder.is_dir():
+            return []
+        return sorted(p.name[:-len(".jsonl.gz")] for p in folder.glob("*.jsonl.gz"))
+
+    def read(self, collection: str, field: str, start: Optional[datetime] = None,
+             end: Optional[datetime] = None, filter: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield archived documents with start <= doc[field] < end, oldest partition first."""
+        first = start.strftime("%Y-%m-%d") if start else None
+        last = end.strftime("%Y-%m-%d") if end else None
+        for day in self.days(collection):
+            if (first and day < first) or (last and day > last):
+                continue
+            seen = set()
+            with gzip.open(self.partition_path(collection, day), "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    if not line.strip():
+                        continue
+                    doc = json_util.loads(line)
+                    # A retried archive pass can append a document twice.
+                    if doc.get("_id") in seen:
+                        continue
+                    seen.add(doc.get("_id"))
+                    ts = doc.get(field)
+                    if start and (not isinstance(ts, datetime) or ts < start):
+                        continue
+                    if end and (not isinstance(ts, datetime) or ts >= end):
+                        continue
+                    if filter and not _matches(doc, filter):
+                        continue
+                    yield doc
+
+
+class RetentionManager:
+    """Moves documents past their horizon from MongoDB into the archive store."""
+
+    def __init__(self, store: ArchiveStore):
+        self.store = store
+
+    def archive_collection(self, policy: RetentionPolicy, now: Optional[datetime] = None,
+                           dry_run: bool = False) -> int:
+        """
+        Archive and delete one collection's documents older than its horizon.
+
+        The cutoff is rounded down to midnight so partitions and rollups
+        always cover whole days.
+
+        Returns:
+            Number of documents archived (or that would be, with dry_run)
+        """
+        if policy.days <= 0:
+            return 0
+        now = now or datetime.utcnow()
+        cutoff = (now - timedelta(days=policy.days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        collection = db.db[policy.collection]
+        query = {policy.field: {"$lt": cutoff}}
+
+        if dry_run:
+            return collection.count_documents(query)
+
+        oldest = collection.find_one(query, {policy.field: 1}, sort=[(policy.field, 1)])
+        if not oldest:
+            return 0
+        if policy.rollup:
+            daily_rollups.ensure_days(oldest[policy.field], cutoff)
+        if policy.collection == "activity_logs":
+            # The reply rule has no time limit; keep last-reply times past the archive horizon
+            reply_history.backfill(until=cutoff)
+
+        archived = 0
+        batch: List[Dict[str, Any]] = []
+        batch_day = None
+
+        def _move(day: str, docs: List[Dict[str, Any]]) -> int:
+            self.store.append(policy.collection, day, docs)
+            collection.delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+            return len(docs)
+
+        cursor = collection.find(query).sort(policy.field, 1).batch_size(ARCHIVE_BATCH_SIZE)
+        for doc in cursor:
+            day = doc[policy.field].strftime("%Y-%m-%d")
+            if batch and (day != batch_day or len(batch) >= ARCHIVE_BATCH_SIZE):
+                archived += _move(batch_day, batch)
+                batch = []
+            batch_day = day
+            batch.append(doc)
+        if batch:
+            archived += _move(batch_day, batch)
+
+        if archived:
+            logger.info(f"✓ Archived {archived} {policy.collection} document(s) older than {cutoff:%Y-%m-%d}")
+        return archived
+
+    def run(self, now: Optional[datetime] = None, dry_run: bool = False) -> Dict[str, int]:
+        """Apply every retention policy; one failing collection does not block the rest."""
+        if not Config.RETENTION_ENABLED:
+            return {}
+        bulk_writer.flush()
+        results = {}
+        for policy in retention_policies():
+            try:
+                results[policy.collection] = self.archive_collection(policy, now=now, dry_run=dry_run)
+            except Exception as e:
+                logger.warning(f"Retention for {policy.collection} failed: {e}")
+                results[policy.collection] = 0
+        return results
+
+
+def find_range(collection: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               filter: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Documents with start <= time < end from the archive and the live collection,
+    oldest first.
+
+    Archived documents support top-level equality and $in filters only.
+    """
+    policy = _policy_for(collection)
+    if policy is None:
+        raise ValueError(f"No retention policy for {collection}")
+
+    archived_ids = set()
+    for doc in archive_store.read(collection, policy.field, start, end, filter):
+        archived_ids.add(doc.get("_id"))
+        yield doc
+
+    query: Dict[str, Any] = dict(filter or {})
+    if start or end:
+        query[policy.field] = {}
+        if start:
+            query[policy.field]["$gte"] = start
+        if end:
+            query[policy.field]["$lt"] = end
+    for doc in db.db[collection].find(query).sort(policy.field, 1):
+        if doc.get("_id") not in archived_ids:
+            yield doc
+
+
+# Global instances
+archive_store = ArchiveStore(Config.RETENTION_ARCHIVE_DIR)
+retention = RetentionManager(archive_store)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Archive documents past their retention horizon")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        db.connect()
+        for collection, count in retention.run(dry_run=args.dry_run).items():
+            logger.info(f"{collection}: {count} document(s) {'to archive' if args.dry_run else 'archived'}")
+    finally:
+        if db.client:
+            db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Materialized per-day rollups of activity_logs and account metrics.
+
+One daily_rollups document per (day, account):
+
+    {
+        "day": "2024-05-01", "date": <midnight>, "account": "<ACCOUNT_USERNAME>",
+        "actions": {"like": {"success": 12, "failure": 1}, ...},
+        "totals": {"success": 40, "failure": 3},
+        "topics": {"<topic>": {"actions": 5, "engagement": 310}, ...},
+        "snapshot": {"followers": 1200, "following": 300, "tweets": 800, "timestamp": ...},
+    }
+
+Kept current incrementally (activity_logs inserts through the bulk writer,
+metrics snapshots via record_metrics) and rebuilt with:
+
+    python -m database.rollups --backfill [--days N]
+
+rollup_state records, per account, the earliest day from which the rollups
+are complete (covered_from, "" for the whole history). Reads outside that
+coverage return None so callers count activity_logs instead; db.migrate()
+builds the full history the first time.
+"""
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import Config
+from database import db
+from database.bulk_writer import bulk_writer
+from utils.logger import logger
+
+
+def sanitize_key(key: Any) -> Optional[str]:
+    """Make a value safe to use as a MongoDB field name ('.' and '$' are reserved)."""
+    text = str(key or "").strip().replace(".", "_").replace("$", "_")
+    return text[:100] or None
+
+
+def _account() -> str:
+    return Config.ACCOUNT_USERNAME or "default"
+
+
+def _day(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%d")
+
+
+def _midnight(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _topic_of(metadata: Dict[str, Any]) -> Optional[str]:
+    return sanitize_key(
+        metadata.get("trend")
+        or metadata.get("safe_query")
+        or metadata.get("trending_topic")
+        or metadata.get("topic")
+        or metadata.get("query")
+    )
+
+
+def activity_increments(activity: Dict[str, Any]) -> Dict[str, float]:
+    """$inc document describing one activity_logs entry."""
+    action = sanitize_key(activity.get("action")) or "unknown"
+    outcome = "success" if activity.get("success") else "failure"
+    inc: Dict[str, float] = {f"actions.{action}.{outcome}": 1, f"totals.{outcome}": 1}
+
+    metadata = activity.get("metadata") or {}
+    if isinstance(metadata, dict):
+        topic = _topic_of(metadata)
+        if topic:
+            engagement = metadata.get("engagement", 0)
+            inc[f"topics.{topic}.actions"] = 1
+            inc[f"topics.{topic}.engagement"] = engagement if isinstance(engagement, (int, float)) else 0
+    return inc
+
+
+class DailyRollups:
+    """Maintains and reads the daily_rollups collection."""
+
+    def record_activity(self, activity: Dict[str, Any]) -> None:
+        """bulk_writer listener: fold a new activity_logs document into its day."""
+        ts = activity.get("timestamp")
+        if not Config.ROLLUPS_ENABLED or not isinstance(ts, datetime):
+            return
+        bulk_writer.upsert(
+            "daily_rollups",
+            {"day": _day(ts), "account": _account()},
+            {
+                "$inc": activity_increments(activity),
+                "$setOnInsert": {"date": _midnight(ts)},
+                "$set": {"updated_at": datetime.utcnow()},
+            }
+        )
+
+    def record_metrics(self, snapshot: Dict[str, Any]) -> None:
+        """Store the latest follower snapshot for its day."""
+        ts = snapshot.get("timestamp")
+        if not Config.ROLLUPS_ENABLED or not isinstance(ts, datetime):
+            return
+        bulk_writer.upsert(
+            "daily_rollups",
+            {"day": _day(ts), "account": _account()},
+            {
+                "$set": {
+                    "snapshot": {
+                        "followers": snapshot.get("followers", 0),
+                        "following": snapshot.get("following", 0),
+                        "tweets": snapshot.get("tweets", 0),
+                        "timestamp": ts,
+                    },
+                    "updated_at": datetime.utcnow(),
+                },
+                "$setOnInsert": {"date": _midnight(ts)},
+            }
+        )
+
+    def days(self, since: Optional[datetime] = None, fields: Iterable[str] = ("actions", "totals")) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rollup documents for days on or after `since` (all days if None), oldest first.
+
+        Returns:
+            None when rollups are disabled or have never been built, so callers
+            can fall back to querying activity_logs directly
+        """
+        if not Config.ROLLUPS_ENABLED:
+            return None
+        covered_from = self.coverage()
+        if covered_from is None or (covered_from and (since is None or _day(since) < covered_from)):
+            return None
+        bulk_writer.flush("daily_rollups")
+
+        query: Dict[str, Any] = {"account": _account()}
+        if since is not None:
+            query["day"] = {"$gte": _day(since)}
+        projection = {"_id": 0, "day": 1, **{f: 1 for f in fields}}
+        return list(db.daily_rollups.find(query, projection).sort("day", 1))
+
+    def action_rows_since(self, since: datetime) -> Optional[List[Dict[str, Any]]]:
+        """
+        Per-action totals for activity at or after `since` (None outside coverage).
+
+        Whole days come from rollups; the part of the first day before the
+        next midnight is counted from activity_logs, so the window matches a
+        timestamp match exactly.
+        """
+        first_full_day = _midnight(since)
+        if first_full_day < since:
+            first_full_day += timedelta(days=1)
+        docs = self.days(since=first_full_day)
+        if docs is None:
+            return None
+        counts: Dict[str, int] = defaultdict(int)
+        for row in self.action_rows(docs):
+            counts[row["_id"]] += row["count"]
+        if first_full_day > since:
+            partial = db.activity_logs.aggregate([
+                {"$match": {"timestamp": {"$gte": since, "$lt": first_full_day}}},
+                {"$group": {"_id": {"$ifNull": ["$action", "unknown"]}, "count": {"$sum": 1}}},
+            ])
+            for row in partial:
+                counts[row["_id"]] += row["count"]
+        return [{"_id": action, "count": count} for action, count in counts.items()]
+
+    @staticmethod
+    def action_rows(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Per-action totals across days, shaped like a {$group: {_id: action, count}} result."""
+        counts: Dict[str, int] = defaultdict(int)
+        for doc in docs:
+            for action, outcomes in (doc.get("actions") or {}).items():
+                counts[action] += outcomes.get("success", 0) + outcomes.get("failure", 0)
+        return [{"_id": action, "count": count} for action, count in counts.items()]
+
+    @staticmethod
+    def success_count(docs: List[Dict[str, Any]], action: str) -> int:
+        return sum(((doc.get("actions") or {}).get(action) or {}).get("success", 0) for doc in docs)
+
+    def backfill(self, days: Optional[int] = None) -> int:
+        """
+        Rebuild rollups from activity_logs and metrics_history.
+
+        Args:
+            days: Only rebuild the last N days (default: full history)
+
+        Returns:
+            Number of day documents written
+        """
+        bulk_writer.flush()
+        since = _midnight(datetime.utcnow() - timedelta(days=days)) if days else None
+        written = self._rebuild(since, None)
+        self._mark_covered(_day(since) if since else "")
+        logger.info(f"✓ Rebuilt {written} daily rollup(s)")
+        return written
+
+    def coverage(self) -> Optional[str]:
+        """Earliest day the rollups are complete from ("" = all history), None if never built."""
+        doc = db.rollup_state.find_one({"account": _account()}, {"_id": 0, "covered_from": 1})
+        return doc.get("covered_from") if doc else None
+
+    def _mark_covered(self, day: str) -> None:
+        # A partial rebuild never shrinks coverage that already reaches further back
+        current = self.coverage()
+        if current is not None and current <= day:
+            day = current
+        db.rollup_state.update_one(
+            {"account": _account()},
+            {"$set": {"covered_from": day, "built_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    def ensure_built(self) -> int:
+        """Build the full history unless rollups already cover it. Returns day documents written."""
+        if not Config.ROLLUPS_ENABLED or self.coverage() == "":
+            return 0
+        return self.backfill()
+
+    def ensure_days(self, start: datetime, end: datetime) -> int:
+        """
+        Build rollups for whole days in [start, end) that have none yet, e.g.
+        before their raw documents are archived. Existing rollups are left
+        untouched; `end` is rounded down to midnight.
+
+        Returns:
+            Number of day documents written
+        """
+        if not Config.ROLLUPS_ENABLED:
+            return 0
+        bulk_writer.flush()
+        end = _midnight(end)
+        existing = {
+            doc["day"] for doc in db.daily_rollups.find(
+                {"account": _account(), "day": {"$gte": _day(start), "$lt": _day(end)}}, {"_id": 0, "day": 1}
+            )
+        }
+        written = 0
+        day = _midnight(start)
+        while day < end:
+            if _day(day) not in existing:
+                written += self._rebuild(day, day + timedelta(days=1))
+            day += timedelta(days=1)
+        if written:
+            logger.info(f"✓ Built {written} missing daily rollup(s) before {_day(end)}")
+        return written
+
+    def _rebuild(self, since: Optional[datetime], until: Optional[datetime]) -> int:
+        """Replace the rollups for [since, until) with ones recomputed from raw collections."""
+        match: Dict[str, Any] = {}
+        if since or until:
+            match["timestamp"] = {}
+            if since:
+                match["timestamp"]["$gte"] = since
+            if until:
+                match["timestamp"]["$lt"] = until
+        rebuilt: Dict[str, Dict[str, Any]] = {}
+
+        def _doc_for(ts: datetime) -> Dict[str, Any]:
+            day = _day(ts)
+            if day not in rebuilt:
+                rebuilt[day] = {"day": day, "date": _midnight(ts), "account": _account(),
+                                "actions": {}, "totals": {}, "topics": {}}
+            return rebuilt[day]
+
+        cursor = db.activity_logs.find(match, {"action": 1, "success": 1, "timestamp": 1, "metadata": 1})
+        for activity in cursor.batch_size(1000):
+            ts = activity.get("timestamp")
+            if not isinstance(ts, datetime):
+                continue
+            doc = _doc_for(ts)
+            for path, amount in activity_increments(activity).items():
+                node = doc
+                *parents, leaf = path.split(".")
+                for part in parents:
+                    node = node.setdefault(part, {})
+                node[leaf] = node.get(leaf, 0) + amount
+
+        for snapshot in db.metrics_history.find(match).sort("timestamp", 1):
+            ts = snapshot.get("timestamp")
+            if isinstance(ts, datetime):
+                _doc_for(ts)["snapshot"] = {
+                    "followers": snapshot.get("followers", 0),
+                    "following": snapshot.get("following", 0),
+                    "tweets": snapshot.get("tweets", 0),
+                    "timestamp": ts,
+                }
+
+        delete_query: Dict[str, Any] = {"account": _account()}
+        if since or until:
+            delete_query["day"] = {}
+            if since:
+                delete_query["day"]["$gte"] = _day(since)
+            if until:
+                delete_query["day"]["$lt"] = _day(until)
+        db.daily_rollups.delete_many(delete_query)
+        now = datetime.utcnow()
+        for doc in rebuilt.values():
+            doc["updated_at"] = now
+        if rebuilt:
+            db.daily_rollups.insert_many(list(rebuilt.values()), ordered=False)
+        return len(rebuilt)
+
+
+# Global instance; registered so buffered activity_logs inserts update today's rollup.
+daily_rollups = DailyRollups()
+bulk_writer.add_listener("activity_logs", daily_rollups.record_activity)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain the daily_rollups collection")
+    parser.add_argument("--backfill", action="store_true", help="Rebuild rollups from raw collections.")
+    parser.add_argument("--days", type=int, default=0, help="Only rebuild the last N days (default: all).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        db.connect()
+        if args.backfill:
+            daily_rollups.backfill(days=args.days or None)
+        else:
+            logger.info("Nothing to do (use --backfill)")
+    finally:
+        if db.client:
+            db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
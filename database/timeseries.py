@@ -0,0 +1,297 @@
+"""Account metric time series with windowed downsampling.
+
+Samples are (account, metric, ts, value). On MongoDB >= 5.0 they go into a
+native time-series collection (metric_series, metaField "meta", hourly
+granularity). Older servers get one bucket document per account, metric and
+day in metric_buckets:
+
+    {
+        "meta": {"account": "...", "metric": "followers"},
+        "day": "2024-05-01", "start": <midnight>,
+        "samples": [{"ts": ..., "value": 1200}, ...],
+        "count": 3, "sum": 3601, "min": 1199, "max": 1201,
+        "first": 1199, "last": 1201, "last_ts": ...,
+    }
+
+Readers ask for a window at hourly, daily or weekly resolution and get one
+point per period. Existing metrics_history and rate_limits data can be
+copied in once with:
+
+    python -m database.timeseries --backfill
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from database import db
+from database.bulk_writer import bulk_writer
+from utils.logger import logger
+
+
+SERIES_COLLECTION = "metric_series"
+BUCKET_COLLECTION = "metric_buckets"
+
+RESOLUTIONS = {"hourly": "hour", "daily": "day", "weekly": "week"}
+
+
+def _account() -> str:
+    return Config.ACCOUNT_USERNAME or "default"
+
+
+def _midnight(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _period_start(ts: datetime, unit: str) -> datetime:
+    if unit == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = _midnight(ts)
+    if unit == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def resolution_for(days: int) -> str:
+    """Coarsest resolution that still gives a readable chart for a window of `days`."""
+    if days <= 2:
+        return "hourly"
+    if days <= 120:
+        return "daily"
+    return "weekly"
+
+
+def _merge(points: List[Dict[str, Any]], unit: str) -> List[Dict[str, Any]]:
+    """Combine chronologically ordered partial summaries into one point per period."""
+    merged: Dict[datetime, Dict[str, Any]] = {}
+    for point in points:
+        key = _period_start(point["ts"], unit)
+        current = merged.get(key)
+        if current is None:
+            merged[key] = dict(point, ts=key)
+            continue
+        current["last"] = point["last"]
+        current["min"] = min(current["min"], point["min"])
+        current["max"] = max(current["max"], point["max"])
+        current["sum"] += point["sum"]
+        current["count"] += point["count"]
+
+    result = []
+    for point in merged.values():
+        point["avg"] = point.pop("sum") / point["count"] if point["count"] else 0
+        result.append(point)
+    return result
+
+
+class TimeSeriesStore:
+    """Writes metric samples and reads them back downsampled."""
+
+    def __init__(self):
+        self._mode: Optional[str] = None  # "native" | "buckets"
+
+    def mode(self) -> str:
+        """Detect (once per process) whether native time-series collections are available."""
+        if self._mode is None:
+            self._mode = self._ensure()
+        return self._mode
+
+    def _ensure(self) -> str:
+        wanted = Config.TIMESERIES_MODE
+        if wanted == "auto":
+            try:
+                version = db.client.server_info().get("versionArray", [0])
+                wanted = "native" if list(version[:2]) >= [5, 0] else "buckets"
+            except Exception as e:
+                logger.debug(f"Server version check failed, using bucketed series: {e}")
+                wanted = "buckets"
+        if wanted != "native":
+            return "buckets"
+
+        try:
+            if SERIES_COLLECTION not in db.db.list_collection_names(filter={"name": SERIES_COLLECTION}):
+                db.db.create_collection(
+                    SERIES_COLLECTION,
+                    timeseries={"timeField": "ts", "metaField": "meta", "granularity": "hours"},
+                )
+            # Created here rather than in INDEXES: indexing first would create a plain collection.
+            db.db[SERIES_COLLECTION].create_index([("meta.account", 1), ("meta.metric", 1), ("ts", 1)])
+            return "native"
+        except Exception as e:
+            logger.warning(f"Time-series collection unavailable, using bucketed series: {e}")
+            return "buckets"
+
+    def record(self, metric: str, value: float, ts: Optional[datetime] = None,
+               account: Optional[str] = None) -> None:
+        """Queue one sample through the bulk writer."""
+        if not Config.TIMESERIES_ENABLED:
+            return
+        ts = ts or datetime.utcnow()
+        meta = {"account": account or _account(), "metric": metric}
+        try:
+            if self.mode() == "native":
+                bulk_writer.insert(SERIES_COLLECTION, {"meta": meta, "ts": ts, "value": value})
+                return
+            bulk_writer.upsert(
+                BUCKET_COLLECTION,
+                {"meta.account": meta["account"], "meta.metric": metric, "day": ts.strftime("%Y-%m-%d")},
+                {
+                    "$push": {"samples": {"ts": ts, "value": value}},
+                    "$inc": {"count": 1, "sum": value},
+                    "$min": {"min": value},
+                    "$max": {"max": value},
+                    "$set": {"last": value, "last_ts": ts},
+                    # meta.account / meta.metric come from the filter on insert
+                    "$setOnInsert": {"start": _midnight(ts), "first": value},
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record {metric} sample: {e}")
+
+    def record_many(self, values: Dict[str, float], ts: Optional[datetime] = None) -> None:
+        for metric, value in values.items():
+            self.record(metric, value, ts=ts)
+
+    def window(self, metric: str, start: datetime, end: Optional[datetime] = None,
+               resolution: str = "daily", account: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Downsampled points for start <= ts < end, oldest first.
+
+        Args:
+            resolution: "hourly", "daily" or "weekly"
+
+        Returns:
+            [{"ts": period start, "first", "last", "min", "max", "avg", "count"}, ...];
+            empty if the store has no samples (callers fall back to raw history)
+        """
+        if not Config.TIMESERIES_ENABLED:
+            return []
+        unit = RESOLUTIONS[resolution]
+        end = end or datetime.utcnow()
+        account = account or _account()
+        try:
+            if self.mode() == "native":
+                bulk_writer.flush(SERIES_COLLECTION)
+                return self._window_native(metric, start, end, unit, account)
+            bulk_writer.flush(BUCKET_COLLECTION)
+            return self._window_buckets(metric, start, end, unit, account)
+        except Exception as e:
+            logger.warning(f"Failed to read {metric} series: {e}")
+            return []
+
+    def _window_native(self, metric: str, start: datetime, end: datetime, unit: str,
+                       account: str) -> List[Dict[str, Any]]:
+        trunc: Dict[str, Any] = {"date": "$ts", "unit": unit}
+        if unit == "week":
+            trunc["startOfWeek"] = "monday"
+        rows = db.db[SERIES_COLLECTION].aggregate([
+            {"$match": {"meta.account": account, "meta.metric": metric, "ts": {"$gte": start, "$lt": end}}},
+            {"$sort": {"ts": 1}},
+            {"$group": {
+                "_id": {"$dateTrunc": trunc},
+                "first": {"$first": "$value"},
+                "last": {"$last": "$value"},
+                "min": {"$min": "$value"},
+                "max": {"$max": "$value"},
+                "avg": {"$avg": "$value"},
+                "count": {"$sum": 1},
+            }},
+            {"$sort": {"_id": 1}},
+        ])
+        return [{"ts": row.pop("_id"), **row} for row in rows]
+
+    def _window_buckets(self, metric: str, start: datetime, end: datetime, unit: str,
+                        account: str) -> List[Dict[str, Any]]:
+        query = {
+            "meta.account": account,
+            "meta.metric": metric,
+            "day": {"$gte": start.strftime("%Y-%m-%d"), "$lte": end.strftime("%Y-%m-%d")},
+        }
+        if unit == "hour":
+            # Hourly points need the raw samples; daily and weekly use bucket summaries.
+            points = []
+            for bucket in db.db[BUCKET_COLLECTION].find(query, {"samples": 1}).sort("day", 1):
+                for sample in sorted(bucket.get("samples", []), key=lambda s: s["ts"]):
+                    if start <= sample["ts"] < end:
+                        value = sample["value"]
+                        points.append({"ts": sample["ts"], "first": value, "last": value,
+                                       "min": value, "max": value, "sum": value, "count": 1})
+            return _merge(points, unit)
+
+        projection = {"_id": 0, "start": 1, "first": 1, "last": 1, "min": 1, "max": 1, "sum": 1, "count": 1}
+        points = [
+            {"ts": b["start"], "first": b["first"], "last": b["last"], "min": b["min"],
+             "max": b["max"], "sum": b["sum"], "count": b["count"]}
+            for b in db.db[BUCKET_COLLECTION].find(query, projection).sort("day", 1)
+        ]
+        return _merge(points, unit)
+
+    def has_samples(self, metric: str, account: Optional[str] = None) -> bool:
+        collection = SERIES_COLLECTION if self.mode() == "native" else BUCKET_COLLECTION
+        bulk_writer.flush(collection)
+        return db.db[collection].find_one(
+            {"meta.account": account or _account(), "meta.metric": metric}, {"_id": 1}
+        ) is not None
+
+    def backfill(self) -> int:
+        """
+        Copy metrics_history snapshots and rate_limits counters into the store.
+        Skipped if follower samples already exist (the copy is not idempotent).
+
+        Returns:
+            Number of samples written
+        """
+        from database.retention import find_range
+
+        if self.has_samples("followers"):
+            logger.warning("Time series already has samples; backfill skipped")
+            return 0
+
+        written = 0
+        for snapshot in find_range("metrics_history"):
+            ts = snapshot.get("timestamp")
+            if not isinstance(ts, datetime):
+                continue
+            for metric in ("followers", "following", "tweets"):
+                self.record(metric, snapshot.get(metric, 0), ts=ts)
+                written += 1
+
+        now = datetime.utcnow()
+        for counter in db.rate_limits.find({}, {"action": 1, "date": 1, "count": 1}):
+            try:
+                day_end = datetime.strptime(counter["date"], "%Y-%m-%d") + timedelta(days=1, seconds=-1)
+            except (KeyError, ValueError):
+                continue
+            self.record(f"rate.{counter['action']}", counter.get("count", 0), ts=min(day_end, now))
+            written += 1
+
+        bulk_writer.flush()
+        logger.info(f"✓ Backfilled {written} time-series sample(s)")
+        return written
+
+
+# Global store instance
+timeseries = TimeSeriesStore()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain the metric time series")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Copy metrics_history and rate_limits into the series (run once).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        db.connect()
+        if args.backfill:
+            timeseries.backfill()
+        else:
+            logger.info(f"Time series mode: {timeseries.mode()} (use --backfill to import history)")
+    finally:
+        if db.client:
+            db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
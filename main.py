@@ -8,6 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from orchestrator import run_growth_strategy
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from config import Config
 
 
@@ -25,6 +26,7 @@ def main():
         # Connect to MongoDB
         logger.info("Connecting to MongoDB...")
         db.connect()
+        db.migrate()
         
         # Run optimized growth strategy
         logger.info("Starting optimized growth strategy...")
@@ -43,6 +45,7 @@ def main():
     finally:
         # Cleanup
         if db.client:
+            bulk_writer.flush()
             db.disconnect()
 
 
@@ -5,9 +5,11 @@ from typing import Dict, List, Tuple
 from config import Config
 from config_topics import SEARCH_QUERIES, INFLUENCERS
 from database import db
+from database.bulk_writer import bulk_writer
 from operations.engagement_filters import evaluate_account_authenticity
+from operations.scoring_engine import score_page
 from operations.trends_operation import get_trending_topics
-from tweet_handler import tweet_handler
+from async_tweet_handler import async_tweet_handler
 from utils.logger import logger
 from utils.sanitizer import sanitize_search_query
 
@@ -172,14 +174,13 @@ def run_manual_research() -> int:
     logger.info(f"Query plan: {len(queries)} queries (per_query={per_query})")
 
     raw: List[Dict] = []
-    for source, query in queries:
-        tweets = tweet_handler.search_tweets(query, max_results=per_query)
+    results = async_tweet_handler.search_many([(query, per_query) for _, query in queries])
+    for (source, query), tweets in zip(queries, results):
         if not tweets:
             continue
-        for t in tweets:
-            tweet = dict(t)
-            tweet["research_source"] = source
-            tweet["research_query"] = query
+        for tweet in tweets:
+            tweet.research_source = source
+            tweet.research_query = query
             raw.append(tweet)
 
     if not raw:
@@ -196,8 +197,7 @@ def run_manual_research() -> int:
         deduped.append(t)
 
     scored: List[Dict] = []
-    for t in deduped:
-        score = _candidate_score(t)
+    for t, score in zip(deduped, score_page(deduped)["research_score"]):
         if score <= 0:
             continue
         t["manual_score"] = score
@@ -255,7 +255,9 @@ def run_manual_research() -> int:
                 }
             )
         if docs:
-            db.activity_logs.insert_many(docs)
+            for doc in docs:
+                bulk_writer.insert("activity_logs", doc)
+            bulk_writer.flush("activity_logs")
             logger.info(f"Saved {len(docs)} research candidates into activity_logs")
 
     logger.info("=" * 60)
@@ -269,6 +271,7 @@ def main() -> None:
         run_manual_research()
     finally:
         if db.client:
+            bulk_writer.flush()
             db.disconnect()
 
 
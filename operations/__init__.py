@@ -1,41 +1,53 @@
-from operations.like_operation import like_relevant_tweets
-from operations.retweet_operation import retweet_high_engagement
-from operations.follow_operation import follow_relevant_users
-from operations.mention_operation import check_mentions
-from operations.metrics_operation import get_account_metrics
-from operations.trends_operation import get_trending_topics
-from operations.post_operation import post_tweet, reply_to_tweet
-from operations.reply_operation import reply_to_relevant_tweets
-from operations.unfollow_operation import unfollow_non_followers
-from operations.engagement_operation import engage_with_influencers, monitor_keywords
-from operations.ai_operation import (
-    generate_ai_reply,
-    generate_ai_tweet,
-    generate_ai_thread,
-    post_ai_generated_tweet,
-    post_ai_thread,
-    analyze_tweet_performance
-)
-from operations.dm_operation import respond_to_mentions_with_ai, get_unresponded_dms
-from operations.analytics_operation import (
-    get_engagement_metrics,
-    get_follower_growth,
-    get_most_engaged_topics,
-    get_cost_analysis,
-    generate_daily_report,
-    analyze_best_performing_content,
-    track_follower_growth,
-    get_weekly_theme_insights
-)
-from operations.content_operation import (
-    post_daily_content,
-    post_weekly_thread,
-    create_engagement_content,
-    post_daily_original_lane,
-    post_followup_from_replies
-)
-from operations.targeting_operation import follow_quality_accounts, engage_with_influencer_followers, unfollow_inactive_accounts
-from operations.community_operation import reply_to_engagers, join_trending_conversations, engage_with_followers
+"""
+Bot operations.
+
+Names are resolved on first access (PEP 562), so `import operations` does not
+pull in tweepy, openai or an authenticated X client until an operation is used.
+"""
+from importlib import import_module
+
+# Public name -> defining module
+_EXPORTS = {
+    'like_relevant_tweets': 'operations.like_operation',
+    'retweet_high_engagement': 'operations.retweet_operation',
+    'follow_relevant_users': 'operations.follow_operation',
+    'check_mentions': 'operations.mention_operation',
+    'get_account_metrics': 'operations.metrics_operation',
+    'get_trending_topics': 'operations.trends_operation',
+    'post_tweet': 'operations.post_operation',
+    'reply_to_tweet': 'operations.post_operation',
+    'reply_to_relevant_tweets': 'operations.reply_operation',
+    'unfollow_non_followers': 'operations.unfollow_operation',
+    'engage_with_influencers': 'operations.engagement_operation',
+    'monitor_keywords': 'operations.engagement_operation',
+    'generate_ai_reply': 'operations.ai_operation',
+    'generate_ai_tweet': 'operations.ai_operation',
+    'generate_ai_thread': 'operations.ai_operation',
+    'post_ai_generated_tweet': 'operations.ai_operation',
+    'post_ai_thread': 'operations.ai_operation',
+    'analyze_tweet_performance': 'operations.ai_operation',
+    'respond_to_mentions_with_ai': 'operations.dm_operation',
+    'get_unresponded_dms': 'operations.dm_operation',
+    'get_engagement_metrics': 'operations.analytics_operation',
+    'get_follower_growth': 'operations.analytics_operation',
+    'get_most_engaged_topics': 'operations.analytics_operation',
+    'get_cost_analysis': 'operations.analytics_operation',
+    'generate_daily_report': 'operations.analytics_operation',
+    'analyze_best_performing_content': 'operations.analytics_operation',
+    'track_follower_growth': 'operations.analytics_operation',
+    'get_weekly_theme_insights': 'operations.analytics_operation',
+    'post_daily_content': 'operations.content_operation',
+    'post_weekly_thread': 'operations.content_operation',
+    'create_engagement_content': 'operations.content_operation',
+    'post_daily_original_lane': 'operations.content_operation',
+    'post_followup_from_replies': 'operations.content_operation',
+    'follow_quality_accounts': 'operations.targeting_operation',
+    'engage_with_influencer_followers': 'operations.targeting_operation',
+    'unfollow_inactive_accounts': 'operations.targeting_operation',
+    'reply_to_engagers': 'operations.community_operation',
+    'join_trending_conversations': 'operations.community_operation',
+    'engage_with_followers': 'operations.community_operation',
+}
 
 __all__ = [
     # Basic operations
@@ -85,3 +97,16 @@ __all__ = [
     'join_trending_conversations',
     'engage_with_followers'
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'operations' has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,16 +1,44 @@
 """AI-powered operations using OpenAI."""
-from openai import OpenAI
+import json
+from typing import List, Optional, Tuple
+
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from utils.sanitizer import sanitize_for_ai_prompt, validate_tweet_text
 from utils.rate_limiter import RateLimiter
+from utils.llm_cache import cached_chat_completion
+from utils.openai_client import get_openai_client
 from datetime import datetime
 from config import Config
 
 MODEL = Config.OPENAI_MODEL  # Configurable via .env
-_client = None
-_client_init_failed = False
+
+REPLY_ANGLE_PROMPTS = {
+    "conversational": "Reply naturally, like a real person having a conversation. Be friendly and add your own perspective.",
+    "questioning": "Ask a thoughtful, specific question that deepens the conversation. Show genuine curiosity.",
+    "agreeing": "Agree with their point and add a fresh angle or example they haven't mentioned.",
+    "contrasting": "Respectfully present a different viewpoint or consideration. Be diplomatic and thoughtful.",
+    "curious": "Express genuine curiosity and ask for elaboration on a specific detail.",
+    "supportive": "Show support and offer a concrete insight or suggestion that adds value."
+}
+REPLY_MODE_PROMPTS = {
+    "statement": (
+        "Prefer a declarative statement with a concrete take. "
+        "Do not end with a question unless absolutely necessary."
+    ),
+    "question": "Ask one focused, high-signal question.",
+    "mixed": "Mix statement and question naturally; avoid forcing a question every time.",
+}
+TWEET_ANGLE_PROMPTS = {
+    "educational": "Explain clearly. Make it informative and eye-opening.",
+    "conversational": "Ask a question or share a personal take. Be casual.",
+    "critical": "Share a critical perspective. Challenge assumptions.",
+    "news": "Comment on recent developments or emerging trends.",
+    "practical": "Share actionable advice, tips, or best practices.",
+    "insights": "Share a surprising insight that makes people think."
+}
 
 
 def is_low_value_text(text: str) -> bool:
@@ -37,70 +65,9 @@ def is_low_value_text(text: str) -> bool:
     return not any(v in lowered for v in value_signals)
 
 
-def get_openai_client():
-    """Lazily initialize OpenAI client to avoid import-time crashes."""
-    global _client, _client_init_failed
-    if _client is not None:
-        return _client
-    if _client_init_failed:
-        return None
-
-    try:
-        _client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        return _client
-    except Exception as e:
-        _client_init_failed = True
-        logger.error(f"OpenAI client initialization failed: {e}")
-        logger.error("Check package compatibility (openai/httpx) and OPENAI_API_KEY")
-        return None
-
-
-def generate_ai_reply(
-    tweet_text: str,
-    tweet_author: str,
-    max_tokens: int = 100,
-    angle: str = "conversational",
-    response_mode: str = "mixed",
-) -> str:
-    """Generate an intelligent reply to a tweet using OpenAI with varied angles."""
-    try:
-        client = get_openai_client()
-        if client is None:
-            return None
-
-        tweet_text = sanitize_for_ai_prompt(tweet_text)
-        tweet_author = sanitize_for_ai_prompt(tweet_author)
-        
-        if not tweet_text or not tweet_author:
-            logger.warning("Empty or invalid input for AI reply generation")
-            return None
-        
-        angle_prompts = {
-            "conversational": "Reply naturally, like a real person having a conversation. Be friendly and add your own perspective.",
-            "questioning": "Ask a thoughtful, specific question that deepens the conversation. Show genuine curiosity.",
-            "agreeing": "Agree with their point and add a fresh angle or example they haven't mentioned.",
-            "contrasting": "Respectfully present a different viewpoint or consideration. Be diplomatic and thoughtful.",
-            "curious": "Express genuine curiosity and ask for elaboration on a specific detail.",
-            "supportive": "Show support and offer a concrete insight or suggestion that adds value."
-        }
-        mode_prompts = {
-            "statement": (
-                "Prefer a declarative statement with a concrete take. "
-                "Do not end with a question unless absolutely necessary."
-            ),
-            "question": "Ask one focused, high-signal question.",
-            "mixed": "Mix statement and question naturally; avoid forcing a question every time.",
-        }
-        
-        angle_instruction = angle_prompts.get(angle, angle_prompts["conversational"])
-        mode_instruction = mode_prompts.get(response_mode, mode_prompts["mixed"])
-        
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""You are @khanorX replying to tweets. Sound like a REAL human, not a bot.
+def _reply_system_prompt(angle_section: str) -> str:
+    """System prompt shared by single and batched reply generation."""
+    return f"""You are @khanorX replying to tweets. Sound like a REAL human, not a bot.
 
 CRITICAL - AVOID REPETITION:
 - NEVER start with "That's interesting/intriguing/fascinating"
@@ -125,8 +92,7 @@ STYLE GUIDELINES:
 - Be respectful but casual
 - Reply language must be: {Config.REPLY_LANGUAGE}. Never switch to other languages.
 
-CURRENT ANGLE: {angle_instruction}
-RESPONSE MODE: {mode_instruction}
+{angle_section}
 
 EXAMPLES OF VARIETY:
 - "Wait, how would that work with...?"
@@ -136,6 +102,140 @@ EXAMPLES OF VARIETY:
 - "Fair point, though I wonder..."
 
 NO generic templates. Make it fresh."""
+
+
+def _tweet_system_prompt(niche: str) -> str:
+    """System prompt shared by single and batched tweet generation."""
+    return f"""You are @khanorX, expert in {niche}. Write diverse, authentic tweets.
+
+CRITICAL - SOUND HUMAN, NOT BOT:
+- Vary angles, tones, perspectives  
+- Don't repeat similar points
+- Mix styles: questions, statements, insights, tips
+- Use complete hashtags only (no "#..")
+- MUST BE under 270 characters
+- Professional but conversational
+- Every tweet must include concrete value:
+  1) one specific insight, and
+  2) one practical action, example, or metric
+
+BOUNDARIES - NEVER:
+- Racist, sexist, homophobic content
+- Financial/medical/legal advice
+- Misinformation or conspiracy theories
+- Personal attacks or harassment
+- Adult content or violence
+
+CONTENT RULES:
+- Stay tightly on-topic for the niche: {niche}
+- Prioritize practical and educational value
+- Avoid hype/shilling and unverifiable claims"""
+
+
+def _finalize_reply(reply: str) -> Optional[str]:
+    """Validate a raw reply completion; None if it should be discarded."""
+    reply = (reply or "").strip()
+    is_valid, message = validate_tweet_text(reply)
+    if not is_valid:
+        logger.warning(f"Generated reply failed validation: {message}")
+        return None
+    if is_low_value_text(reply):
+        logger.warning("Generated reply rejected: low value/generic")
+        return None
+    return reply
+
+
+def _finalize_tweet(tweet: str) -> Optional[str]:
+    """Trim/validate a raw tweet completion; None if it should be discarded."""
+    tweet = (tweet or "").strip()
+    
+    if not tweet or len(tweet) == 0:
+        logger.warning("Generated tweet is empty")
+        return None
+    
+    is_valid, message = validate_tweet_text(tweet)
+    if not is_valid:
+        logger.debug(f"Validation warning: {message}, attempting to trim")
+        if len(tweet) > 280:
+            words = tweet.split()
+            trimmed = []
+            char_count = 0
+            for word in words:
+                if char_count + len(word) + 1 <= 270:
+                    trimmed.append(word)
+                    char_count += len(word) + 1
+                else:
+                    break
+            if trimmed:
+                tweet = " ".join(trimmed)
+    if is_low_value_text(tweet):
+        logger.warning("Generated tweet rejected: low value/generic")
+        return None
+    return tweet
+
+
+def _parse_drafts(content: str, angles: List[str]) -> List[Tuple[str, str]]:
+    """
+    Parse a {"drafts": [{"angle": ..., "text": ...}]} completion.
+
+    Drafts with an unknown angle are matched to the requested angles by position.
+    """
+    try:
+        payload = json.loads(content or "")
+    except (TypeError, ValueError):
+        logger.warning("Batched drafts response was not valid JSON")
+        return []
+
+    items = payload.get("drafts", []) if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return []
+
+    drafts = []
+    for i, item in enumerate(items):
+        if isinstance(item, dict):
+            text = str(item.get("text", "") or "")
+            angle = str(item.get("angle", "") or "")
+        else:
+            text, angle = str(item or ""), ""
+        if angle not in angles:
+            angle = angles[i] if i < len(angles) else ""
+        if text.strip():
+            drafts.append((angle, text))
+    return drafts
+
+
+def generate_ai_reply(
+    tweet_text: str,
+    tweet_author: str,
+    max_tokens: int = 100,
+    angle: str = "conversational",
+    response_mode: str = "mixed",
+) -> str:
+    """Generate an intelligent reply to a tweet using OpenAI with varied angles."""
+    try:
+        client = get_openai_client()
+        if client is None:
+            return None
+
+        tweet_text = sanitize_for_ai_prompt(tweet_text)
+        tweet_author = sanitize_for_ai_prompt(tweet_author)
+        
+        if not tweet_text or not tweet_author:
+            logger.warning("Empty or invalid input for AI reply generation")
+            return None
+        
+        angle_instruction = REPLY_ANGLE_PROMPTS.get(angle, REPLY_ANGLE_PROMPTS["conversational"])
+        mode_instruction = REPLY_MODE_PROMPTS.get(response_mode, REPLY_MODE_PROMPTS["mixed"])
+        
+        content = cached_chat_completion(
+            client,
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": _reply_system_prompt(
+                        f"CURRENT ANGLE: {angle_instruction}\nRESPONSE MODE: {mode_instruction}"
+                    )
                 },
                 {
                     "role": "user",
@@ -148,16 +248,12 @@ NO generic templates. Make it fresh."""
                 }
             ],
             max_tokens=max_tokens,
-            temperature=0.9  # Higher temperature for more variety
+            temperature=0.9,  # Higher temperature for more variety
+            angle=angle
         )
         
-        reply = response.choices[0].message.content.strip()
-        is_valid, message = validate_tweet_text(reply)
-        if not is_valid:
-            logger.warning(f"Generated reply failed validation: {message}")
-            return None
-        if is_low_value_text(reply):
-            logger.warning("Generated reply rejected: low value/generic")
+        reply = _finalize_reply(content)
+        if not reply:
             return None
         
         logger.info(f"✓ Generated AI reply: {reply[:50]}...")
@@ -184,46 +280,15 @@ def generate_ai_tweet(topic: str, niche: str = "", max_tokens: int = 100, angle:
             logger.warning("Empty or invalid input for AI tweet generation")
             return None
         
-        angle_prompts = {
-            "educational": "Explain clearly. Make it informative and eye-opening.",
-            "conversational": "Ask a question or share a personal take. Be casual.",
-            "critical": "Share a critical perspective. Challenge assumptions.",
-            "news": "Comment on recent developments or emerging trends.",
-            "practical": "Share actionable advice, tips, or best practices.",
-            "insights": "Share a surprising insight that makes people think."
-        }
+        angle_instruction = TWEET_ANGLE_PROMPTS.get(angle, TWEET_ANGLE_PROMPTS["educational"])
         
-        angle_instruction = angle_prompts.get(angle, angle_prompts["educational"])
-        
-        response = client.chat.completions.create(
+        content = cached_chat_completion(
+            client,
             model=MODEL,
             messages=[
                 {
                     "role": "system",
-                    "content": f"""You are @khanorX, expert in {niche}. Write diverse, authentic tweets.
-
-CRITICAL - SOUND HUMAN, NOT BOT:
-- Vary angles, tones, perspectives  
-- Don't repeat similar points
-- Mix styles: questions, statements, insights, tips
-- Use complete hashtags only (no "#..")
-- MUST BE under 270 characters
-- Professional but conversational
-- Every tweet must include concrete value:
-  1) one specific insight, and
-  2) one practical action, example, or metric
-
-BOUNDARIES - NEVER:
-- Racist, sexist, homophobic content
-- Financial/medical/legal advice
-- Misinformation or conspiracy theories
-- Personal attacks or harassment
-- Adult content or violence
-
-CONTENT RULES:
-- Stay tightly on-topic for the niche: {niche}
-- Prioritize practical and educational value
-- Avoid hype/shilling and unverifiable claims"""
+                    "content": _tweet_system_prompt(niche)
                 },
                 {
                     "role": "user",
@@ -231,32 +296,12 @@ CONTENT RULES:
                 }
             ],
             max_tokens=max_tokens,
-            temperature=0.8
+            temperature=0.8,
+            angle=angle
         )
         
-        tweet = response.choices[0].message.content.strip()
-        
-        if not tweet or len(tweet) == 0:
-            logger.warning("Generated tweet is empty")
-            return None
-        
-        is_valid, message = validate_tweet_text(tweet)
-        if not is_valid:
-            logger.debug(f"Validation warning: {message}, attempting to trim")
-            if len(tweet) > 280:
-                words = tweet.split()
-                trimmed = []
-                char_count = 0
-                for word in words:
-                    if char_count + len(word) + 1 <= 270:
-                        trimmed.append(word)
-                        char_count += len(word) + 1
-                    else:
-                        break
-                if trimmed:
-                    tweet = " ".join(trimmed)
-        if is_low_value_text(tweet):
-            logger.warning("Generated tweet rejected: low value/generic")
+        tweet = _finalize_tweet(content)
+        if not tweet:
             return None
         
         logger.info(f"✓ Generated AI tweet: {tweet[:80]}...")
@@ -267,6 +312,150 @@ CONTENT RULES:
         return None
 
 
+def generate_ai_reply_drafts(
+    tweet_text: str,
+    tweet_author: str,
+    variants: List[Tuple[str, str]],
+    max_tokens_per_draft: int = 80,
+) -> List[Tuple[str, str]]:
+    """
+    Generate one reply per (angle, response_mode) variant in a single request.
+
+    The shared system prompt is sent once and the model returns a JSON list
+    of angle-tagged drafts, instead of one completion per angle.
+
+    Returns:
+        (angle, reply) pairs that passed validation; empty on failure
+    """
+    try:
+        client = get_openai_client()
+        if client is None or not variants:
+            return []
+
+        tweet_text = sanitize_for_ai_prompt(tweet_text)
+        tweet_author = sanitize_for_ai_prompt(tweet_author)
+        
+        if not tweet_text or not tweet_author:
+            logger.warning("Empty or invalid input for AI reply generation")
+            return []
+
+        angles = [angle for angle, _ in variants]
+        variant_lines = "\n".join(
+            f"{i}. angle={angle}: "
+            f"{REPLY_ANGLE_PROMPTS.get(angle, REPLY_ANGLE_PROMPTS['conversational'])} "
+            f"Mode: {REPLY_MODE_PROMPTS.get(mode, REPLY_MODE_PROMPTS['mixed'])}"
+            for i, (angle, mode) in enumerate(variants, start=1)
+        )
+
+        content = cached_chat_completion(
+            client,
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": _reply_system_prompt(
+                        "ANGLES: write one reply per requested angle; each must differ in wording and structure."
+                    )
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Reply to @{tweet_author}'s tweet:\n{tweet_text}\n\n"
+                        f"Write {len(variants)} alternative replies:\n{variant_lines}\n\n"
+                        f"Each must be unique, under 200 chars, authentic, concretely useful, and strictly in {Config.REPLY_LANGUAGE}.\n"
+                        'Return JSON only: {"drafts": [{"angle": "<angle>", "text": "<reply>"}]}'
+                    )
+                }
+            ],
+            max_tokens=max_tokens_per_draft * len(variants) + 40,
+            temperature=0.9,
+            angle=",".join(angles),
+            response_format={"type": "json_object"}
+        )
+
+        drafts = []
+        for angle, text in _parse_drafts(content, angles):
+            reply = _finalize_reply(text)
+            if reply:
+                drafts.append((angle, reply))
+
+        logger.info(f"✓ Generated {len(drafts)}/{len(variants)} AI reply drafts in one request")
+        return drafts
+
+    except Exception as e:
+        logger.error(f"Failed to generate AI reply drafts: {e}")
+        return []
+
+
+def generate_ai_tweet_drafts(
+    topic: str,
+    niche: str = "",
+    angles: Optional[List[str]] = None,
+    max_tokens_per_draft: int = 100,
+) -> List[Tuple[str, str]]:
+    """
+    Generate one tweet per angle in a single request.
+
+    Returns:
+        (angle, tweet) pairs that passed validation; empty on failure
+    """
+    try:
+        client = get_openai_client()
+        angles = list(angles or [])
+        if client is None or not angles:
+            return []
+
+        topic = sanitize_for_ai_prompt(topic)
+        if not niche:
+            niche = (Config.NICHE[0].strip() if Config.NICHE else "technology") or "technology"
+        niche = sanitize_for_ai_prompt(niche)
+        
+        if not topic or not niche:
+            logger.warning("Empty or invalid input for AI tweet generation")
+            return []
+
+        angle_lines = "\n".join(
+            f"{i}. angle={angle}: {TWEET_ANGLE_PROMPTS.get(angle, TWEET_ANGLE_PROMPTS['educational'])}"
+            for i, angle in enumerate(angles, start=1)
+        )
+
+        content = cached_chat_completion(
+            client,
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": _tweet_system_prompt(niche)
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Write {len(angles)} alternative tweets about: {topic}\n{angle_lines}\n"
+                        "Each must be under 270 chars, unique, human-sounding, and practically useful.\n"
+                        'Return JSON only: {"drafts": [{"angle": "<angle>", "text": "<tweet>"}]}'
+                    )
+                }
+            ],
+            max_tokens=max_tokens_per_draft * len(angles) + 40,
+            temperature=0.8,
+            angle=",".join(angles),
+            response_format={"type": "json_object"}
+        )
+
+        drafts = []
+        for angle, text in _parse_drafts(content, angles):
+            tweet = _finalize_tweet(text)
+            if tweet:
+                drafts.append((angle, tweet))
+
+        logger.info(f"✓ Generated {len(drafts)}/{len(angles)} AI tweet drafts in one request")
+        return drafts
+
+    except Exception as e:
+        logger.error(f"Failed to generate AI tweet drafts: {e}")
+        return []
+
+
 def generate_ai_thread(topic: str, num_tweets: int = 5) -> list:
     """Generate a multi-tweet thread using OpenAI."""
     try:
@@ -366,7 +555,8 @@ def generate_ai_structured_post(topic: str, niche: str = "", max_tokens: int = 2
         if not topic or not niche:
             return None
 
-        response = client.chat.completions.create(
+        text = cached_chat_completion(
+            client,
             model=MODEL,
             messages=[
                 {
@@ -394,7 +584,6 @@ Rules:
             temperature=0.7,
         )
 
-        text = response.choices[0].message.content.strip()
         if not text or is_low_value_text(text):
             return None
         return text
@@ -452,7 +641,7 @@ def post_text_with_continuation(text: str, topic: str, niche: str = "", post_typ
             "niche": niche,
             "post_type": post_type,
         })
-        db.activity_logs.insert_one({
+        bulk_writer.insert("activity_logs", {
             "action": "post",
             "target_id": root_id,
             "target_type": "tweet",
@@ -494,7 +683,7 @@ def post_ai_generated_tweet(topic: str, niche: str = "") -> bool:
                 "ai_generated": True,
                 "topic": topic
             })
-            db.activity_logs.insert_one({
+            bulk_writer.insert("activity_logs", {
                 "action": "post",
                 "target_id": tweet_id,
                 "target_type": "tweet",
@@ -561,7 +750,10 @@ def post_ai_thread(topic: str) -> int:
 def analyze_tweet_performance() -> dict:
     """Analyze recent tweet performance and get insights."""
     try:
-        recent_tweets = list(db.posts.find().sort("posted_at", -1).limit(10))
+        recent_tweets = list(
+            db.posts.find({}, {"_id": 0, "text": 1, "likes": 1, "retweets": 1, "posted_at": 1})
+            .sort("posted_at", -1).limit(10)
+        )
         
         if not recent_tweets:
             return {"tweets_analyzed": 0}
@@ -1,9 +1,69 @@
 """Analytics and performance tracking operations."""
 from database import db
+from database.bulk_writer import bulk_writer
+from database.retention import find_range
+from database.rollups import daily_rollups
+from database.timeseries import resolution_for, timeseries
 from utils.logger import logger
 from datetime import datetime, timedelta
+from typing import Optional
 from config import Config
 from config_topics import SEARCH_QUERIES
+from tweet_handler import tweet_handler
+
+
+# Actions broken out individually in engagement reports (report key -> action)
+REPORTED_ACTIONS = {"likes": "like", "retweets": "retweet", "follows": "follow", "posts": "post"}
+
+# Rough cost estimate per action
+COST_PER_ACTION = {
+    "like": 0.001,
+    "retweet": 0.001,
+    "follow": 0.005,
+    "post": 0.01,
+    "search": 0.001
+}
+DEFAULT_ACTION_COST = 0.001
+
+
+def _count_by_action_stages() -> list:
+    return [{"$group": {"_id": {"$ifNull": ["$action", "unknown"]}, "count": {"$sum": 1}}}]
+
+
+def _action_stats(rows: list) -> dict:
+    """Build {total_actions, likes, retweets, follows, posts} from $group rows."""
+    counts = {row["_id"]: row["count"] for row in rows}
+    stats = {"total_actions": sum(counts.values())}
+    for key, action in REPORTED_ACTIONS.items():
+        stats[key] = counts.get(action, 0)
+    return stats
+
+
+def _engagement_metrics_from_rows(rows: list, days: int) -> dict:
+    metrics = {"period_days": days, **_action_stats(rows)}
+    # Calculate daily average
+    metrics["daily_average"] = metrics["total_actions"] / days if days > 0 else 0
+    return metrics
+
+
+def refresh_post_metrics(days: int = 7) -> int:
+    """Copy current public metrics onto recent db.posts (one lookup call per 100 posts)."""
+    since = datetime.utcnow() - timedelta(days=days)
+    posts = db.posts.find({"posted_at": {"$gte": since}}, {"_id": 0, "post_id": 1})
+    tweets = tweet_handler.get_tweets_bulk(post.get("post_id") for post in posts)
+
+    refreshed_at = datetime.utcnow()
+    for post_id, tweet in tweets.items():
+        metrics = tweet.get("public_metrics") or {}
+        bulk_writer.update("posts", {"post_id": post_id}, {"$set": {
+            "likes": metrics.get("like_count", 0),
+            "retweets": metrics.get("retweet_count", 0),
+            "replies": metrics.get("reply_count", 0),
+            "impressions": metrics.get("impression_count", 0),
+            "metrics_refreshed_at": refreshed_at,
+        }})
+    bulk_writer.flush("posts")
+    return len(tweets)
 
 
 def analyze_best_performing_content() -> dict:
@@ -12,7 +72,7 @@ def analyze_best_performing_content() -> dict:
     
     recent_posts = list(db.posts.find({
         "posted_at": {"$gte": week_ago}
-    }).sort("posted_at", -1))
+    }, {"_id": 0, "topic": 1, "likes": 1, "retweets": 1}).sort("posted_at", -1))
     
     if not recent_posts:
         return {"message": "No recent posts"}
@@ -53,10 +113,31 @@ def track_follower_growth() -> dict:
 
 
 def get_engagement_metrics(days: int = 7) -> dict:
-    """Get engagement metrics for the last N days."""
+    """Get engagement metrics for the last N days (from daily rollups, else counted server-side)."""
     try:
         start_date = datetime.utcnow() - timedelta(days=days)
         
+        rows = daily_rollups.action_rows_since(start_date)
+        if rows is None:
+            rows = list(db.activity_logs.aggregate([
+                {"$match": {"timestamp": {"$gte": start_date}}},
+                *_count_by_action_stages(),
+            ]))
+        metrics = _engagement_metrics_from_rows(rows, days)
+        
+        logger.info(f"✓ Got engagement metrics for last {days} days")
+        return metrics
+        
+    except Exception as e:
+        logger.error(f"Failed to get engagement metrics: {e}")
+        return {}
+
+
+def _engagement_metrics_python(days: int = 7, now: Optional[datetime] = None) -> dict:
+    """Reference implementation of get_engagement_metrics (loads every document)."""
+    try:
+        start_date = (now or datetime.utcnow()) - timedelta(days=days)
+        
         # Get actions from last N days
         actions = list(db.activity_logs.find({
             "timestamp": {"$gte": start_date}
@@ -73,8 +154,6 @@ def get_engagement_metrics(days: int = 7) -> dict:
         
         # Calculate daily average
         metrics["daily_average"] = metrics["total_actions"] / days if days > 0 else 0
-        
-        logger.info(f"✓ Got engagement metrics for last {days} days")
         return metrics
         
     except Exception as e:
@@ -83,14 +162,17 @@ def get_engagement_metrics(days: int = 7) -> dict:
 
 
 def get_follower_growth(days: int = 7) -> dict:
-    """Get follower growth over time."""
+    """Get follower growth over time (downsampled follower series, else raw snapshots)."""
     try:
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get metrics history
-        metrics = list(db.metrics_history.find({
-            "timestamp": {"$gte": start_date}
-        }).sort("timestamp", 1))
+        points = timeseries.window("followers", start_date, resolution=resolution_for(days))
+        if points:
+            metrics = [{"followers": p["last"], "timestamp": p["ts"]} for p in points]
+            metrics[0]["followers"] = points[0]["first"]
+        else:
+            # Get metrics history (archived days included for long windows)
+            metrics = list(find_range("metrics_history", start=start_date))
         
         if len(metrics) < 2:
             return {"data_points": len(metrics), "growth": 0}
@@ -121,7 +203,10 @@ def get_most_engaged_topics() -> list:
     """Find which topics/queries generated most engagement."""
     try:
         # Get tweets with highest engagement
-        top_tweets = list(db.tweets.find().sort("engagement_score", -1).limit(10))
+        top_tweets = list(
+            db.tweets.find({}, {"_id": 0, "search_query": 1, "engagement_score": 1})
+            .sort("engagement_score", -1).limit(10)
+        )
         
         topics = {}
         for tweet in top_tweets:
@@ -156,25 +241,50 @@ def get_most_engaged_topics() -> list:
 
 
 def get_cost_analysis() -> dict:
-    """Analyze bot cost based on API usage."""
+    """Analyze bot cost based on API usage (from daily rollups, else counted server-side)."""
     try:
-        all_actions = list(db.activity_logs.find())
+        docs = daily_rollups.days()
+        if docs is not None:
+            rows = daily_rollups.action_rows(docs)
+        else:
+            rows = db.activity_logs.aggregate(_count_by_action_stages())
+        
+        total_cost = 0
+        total_actions = 0
+        breakdown = {}
+        
+        for row in rows:
+            action_type, count = row["_id"], row["count"]
+            cost = COST_PER_ACTION.get(action_type, DEFAULT_ACTION_COST) * count
+            total_cost += cost
+            total_actions += count
+            breakdown[action_type] = {"count": count, "cost": cost}
         
-        # Rough cost estimate per action
-        cost_per_action = {
-            "like": 0.001,
-            "retweet": 0.001,
-            "follow": 0.005,
-            "post": 0.01,
-            "search": 0.001
+        logger.info(f"✓ Total estimated cost: ${total_cost:.2f}")
+        
+        return {
+            "total_cost": round(total_cost, 2),
+            "total_actions": total_actions,
+            "breakdown": breakdown,
+            "cost_per_action": round(total_cost / total_actions, 4) if total_actions else 0
         }
         
+    except Exception as e:
+        logger.error(f"Failed to analyze costs: {e}")
+        return {}
+
+
+def _cost_analysis_python() -> dict:
+    """Reference implementation of get_cost_analysis (loads the whole history)."""
+    try:
+        all_actions = list(db.activity_logs.find())
+        
         total_cost = 0
         breakdown = {}
         
         for action in all_actions:
             action_type = action.get("action", "unknown")
-            cost = cost_per_action.get(action_type, 0.001)
+            cost = COST_PER_ACTION.get(action_type, DEFAULT_ACTION_COST)
             total_cost += cost
             
             if action_type not in breakdown:
@@ -183,8 +293,6 @@ def get_cost_analysis() -> dict:
             breakdown[action_type]["count"] += 1
             breakdown[action_type]["cost"] += cost
         
-        logger.info(f"✓ Total estimated cost: ${total_cost:.2f}")
-        
         return {
             "total_cost": round(total_cost, 2),
             "total_actions": len(all_actions),
@@ -197,25 +305,68 @@ def get_cost_analysis() -> dict:
         return {}
 
 
+def _daily_action_facets(now: datetime, week_days: int = 7) -> dict:
+    """Today's and the last week's action counts in one $facet pipeline."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = now - timedelta(days=week_days)
+    result = list(db.activity_logs.aggregate([
+        {"$match": {"timestamp": {"$gte": min(today, week_start)}}},
+        {"$facet": {
+            "today": [{"$match": {"timestamp": {"$gte": today}}}, *_count_by_action_stages()],
+            "week": [{"$match": {"timestamp": {"$gte": week_start}}}, *_count_by_action_stages()],
+        }},
+    ]))
+    facets = result[0] if result else {}
+    return {
+        "today_stats": _action_stats(facets.get("today", [])),
+        "week_metrics": _engagement_metrics_from_rows(facets.get("week", []), week_days),
+    }
+
+
+def _daily_action_rollups(now: datetime, week_days: int = 7) -> Optional[dict]:
+    """Same shape as _daily_action_facets, read from daily rollups (None if unavailable)."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_docs = daily_rollups.days(since=today)
+    week_rows = daily_rollups.action_rows_since(now - timedelta(days=week_days))
+    if today_docs is None or week_rows is None:
+        return None
+    return {
+        "today_stats": _action_stats(daily_rollups.action_rows(today_docs)),
+        "week_metrics": _engagement_metrics_from_rows(week_rows, week_days),
+    }
+
+
+def _daily_action_stats_python(now: datetime) -> dict:
+    """Reference implementation of the report's action counts."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    today_actions = list(db.activity_logs.find({
+        "timestamp": {"$gte": today}
+    }))
+    
+    return {
+        "today_stats": {
+            "total_actions": len(today_actions),
+            "likes": len([a for a in today_actions if a["action"] == "like"]),
+            "retweets": len([a for a in today_actions if a["action"] == "retweet"]),
+            "follows": len([a for a in today_actions if a["action"] == "follow"]),
+            "posts": len([a for a in today_actions if a["action"] == "post"]),
+        },
+        "week_metrics": _engagement_metrics_python(7, now=now),
+    }
+
+
 def generate_daily_report() -> dict:
     """Generate comprehensive daily report."""
     try:
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        today_actions = list(db.activity_logs.find({
-            "timestamp": {"$gte": today}
-        }))
+        now = datetime.utcnow()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        action_counts = _daily_action_rollups(now) or _daily_action_facets(now)
         
         report = {
             "date": today.strftime("%Y-%m-%d"),
-            "today_stats": {
-                "total_actions": len(today_actions),
-                "likes": len([a for a in today_actions if a["action"] == "like"]),
-                "retweets": len([a for a in today_actions if a["action"] == "retweet"]),
-                "follows": len([a for a in today_actions if a["action"] == "follow"]),
-                "posts": len([a for a in today_actions if a["action"] == "post"]),
-            },
-            "week_metrics": get_engagement_metrics(7),
+            "today_stats": action_counts["today_stats"],
+            "week_metrics": action_counts["week_metrics"],
             "growth": get_follower_growth(7),
             "top_topics": get_most_engaged_topics(),
             "costs": get_cost_analysis()
@@ -236,7 +387,10 @@ def get_weekly_theme_insights(days: int = 7) -> dict:
     """
     try:
         start_date = datetime.utcnow() - timedelta(days=days)
-        posts = list(db.posts.find({"posted_at": {"$gte": start_date}}))
+        posts = list(db.posts.find(
+            {"posted_at": {"$gte": start_date}},
+            {"_id": 0, "topic": 1, "niche": 1, "likes": 1, "retweets": 1, "replies": 1},
+        ))
         if not posts:
             return {"best_theme": None, "themes": {}}
 
@@ -278,7 +432,7 @@ def get_weekly_theme_insights(days: int = 7) -> dict:
             "action": "reply",
             "success": True,
             "timestamp": {"$gte": start_date}
-        }))
+        }, {"_id": 0, "metadata.safe_query": 1, "metadata.trend": 1}))
         for r in replies:
             md = r.get("metadata", {})
             ref = md.get("safe_query") or md.get("trend")
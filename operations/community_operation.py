@@ -1,17 +1,17 @@
 """Community building and relationship operations."""
-from tweet_handler import tweet_handler
+from tweet_handler import iter_pages, tweet_handler
 from operations.ai_operation import generate_ai_reply
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from utils.rate_limiter import RateLimiter
+from utils.pacing import pacer
 from utils.sanitizer import sanitize_search_query, validate_tweet_text
 from config import Config
 from operations.engagement_filters import select_diverse_real_tweets
 from operations.interaction_policy import can_reply_to_user, can_engage_user
 from operations.value_content import build_value_fallback_reply
 from datetime import datetime, timedelta
-import time
-import random
 
 
 def reply_to_engagers(max_replies: int = 10) -> int:
@@ -35,7 +35,7 @@ def reply_to_engagers(max_replies: int = 10) -> int:
             {"retweets": {"$gt": 0}},
             {"replies": {"$gt": 0}}
         ]
-    }).sort("posted_at", -1).limit(5)
+    }, {"_id": 0, "post_id": 1}).sort("posted_at", -1).limit(5)
     
     replies_sent = 0
     
@@ -73,11 +73,12 @@ def thank_new_followers(hours: int = 24) -> int:
     cutoff = datetime.utcnow() - timedelta(hours=hours)
     
     # Get users who followed back recently
+    bulk_writer.flush("users")
     new_followers = db.users.find({
         "followed_back": True,
         "followed_at": {"$gte": cutoff},
         "thanked": {"$ne": True}
-    }).limit(10)
+    }, {"_id": 0, "user_id": 1, "username": 1}).limit(10)
     
     thanked = 0
     
@@ -98,7 +99,6 @@ def thank_new_followers(hours: int = 24) -> int:
         )
         
         thanked += 1
-        time.sleep(random.randint(5, 10))
     
     logger.info(f"✓ Thanked {thanked} new followers")
     return thanked
@@ -124,17 +124,18 @@ def join_trending_conversations(trending_topics: list, count: int = 5) -> int:
         if not safe_query:
             continue
 
-        # Search broader, then filter hard for real and diverse accounts
-        search_count = min(100, max(20, count * 8))
-        tweets = tweet_handler.search_tweets(safe_query, max_results=search_count)
-        if not tweets:
-            continue
-
-        selected, bucket_counts, candidate_count = select_diverse_real_tweets(
-            tweets=tweets,
-            target_count=count,
-            account_username=Config.ACCOUNT_USERNAME
-        )
+        # Filter hard for real and diverse accounts, pulling further pages only while short
+        tweets = []
+        selected, bucket_counts, candidate_count = [], {}, 0
+        for page in iter_pages(tweet_handler.iter_search(safe_query), Config.SEARCH_PAGE_SIZE):
+            tweets.extend(page)
+            selected, bucket_counts, candidate_count = select_diverse_real_tweets(
+                tweets=tweets,
+                target_count=count,
+                account_username=Config.ACCOUNT_USERNAME
+            )
+            if len(selected) >= count:
+                break
         if not selected:
             logger.info(f"No high-confidence real accounts for topic: {safe_query}")
             continue
@@ -161,13 +162,15 @@ def join_trending_conversations(trending_topics: list, count: int = 5) -> int:
                 if not is_valid:
                     continue
             
-            if reply_text and tweet_handler.reply_to_tweet(tweet_id, reply_text):
+            if not reply_text or not pacer.wait_turn("reply"):
+                continue
+            if tweet_handler.reply_to_tweet(tweet_id, reply_text):
                 RateLimiter.increment("replies", Config.MAX_REPLIES_PER_DAY)
                 replies_posted += 1
                 topic_replies += 1
                 
                 # Log the conversation join
-                db.activity_logs.insert_one({
+                activity = {
                     "action": "reply",
                     "target_id": tweet_id,
                     "target_user": str(author),
@@ -178,9 +181,8 @@ def join_trending_conversations(trending_topics: list, count: int = 5) -> int:
                         "subtype": "join_conversation",
                         "trending_topic": safe_query
                     }
-                })
-                
-                time.sleep(random.randint(Config.MIN_DELAY_SECONDS, Config.MAX_DELAY_SECONDS))
+                }
+                bulk_writer.insert("activity_logs", activity)
 
         logger.info(
             f"Topic '{safe_query}': replied {topic_replies}, "
@@ -201,10 +203,11 @@ def engage_with_followers(count: int = 20) -> int:
         Number of engagements
     """
     # Get followers who followed back
+    bulk_writer.flush("users")
     followers = db.users.find({
         "followed_back": True,
         "unfollowed_at": None
-    }).limit(count)
+    }, {"_id": 0, "username": 1}).limit(count)
     
     engagements = 0
     
@@ -228,11 +231,11 @@ def engage_with_followers(count: int = 20) -> int:
             if not can_engage_user("like", user_id=author_id, username=username, cooldown_hours=72):
                 continue
             
+            if not pacer.wait_turn("like"):
+                break
             if tweet_handler.like_tweet(tweet_id):
                 RateLimiter.increment("likes", Config.MAX_LIKES_PER_DAY)
                 engagements += 1
-                
-                time.sleep(random.randint(3, 7))
     
     logger.info(f"✓ Engaged with {engagements} existing followers")
     return engagements
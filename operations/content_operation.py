@@ -108,11 +108,10 @@ def create_engagement_content(trending_topic: str) -> bool:
 
 def _already_posted_today(post_type: str) -> bool:
     start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    existing = db.posts.find_one({
+    return db.exists("posts", {
         "post_type": post_type,
         "posted_at": {"$gte": start}
     })
-    return existing is not None
 
 
 def _pick_daily_topic() -> str:
@@ -163,7 +162,7 @@ def post_followup_from_replies() -> int:
         "action": "reply",
         "success": True,
         "timestamp": {"$gte": since}
-    }).sort("timestamp", -1).limit(20))
+    }, {"_id": 0, "metadata.safe_query": 1, "metadata.trend": 1}).sort("timestamp", -1).limit(20))
     if len(replies) < 3:
         logger.info("Not enough reply signal for follow-up post")
         return 0
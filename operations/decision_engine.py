@@ -1,15 +1,24 @@
 """Decision layer for selecting targets and generating best content drafts."""
 import random
-from typing import List, Dict, Any, Tuple, Set, Optional
-
-from operations.ai_operation import generate_ai_reply, generate_ai_tweet
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Callable, List, Dict, Any, Tuple, Set, Optional
+
+from operations.ai_operation import (
+    generate_ai_reply,
+    generate_ai_tweet,
+    generate_ai_reply_drafts,
+    generate_ai_tweet_drafts,
+)
 from operations.engagement_filters import followers_bucket
 from operations.interaction_policy import can_reply_to_user, has_recent_any_engagement
 from operations.quality_scorer import score_reply_quality, score_post_quality
 from operations.value_content import build_value_fallback_reply
 from utils.sanitizer import validate_tweet_text
+from utils.logger import logger
 from config import Config
 
+DRAFT_ACCEPT_SCORE = 50
+
 
 def _is_low_value_reply_target(username: str, text: str) -> bool:
     """Skip aggregator/update-style accounts and machine-like text targets."""
@@ -77,7 +86,6 @@ def select_reply_targets(
         if len(text.split()) < 8:
             continue
 
-        t = dict(t)
         t["followers_bucket"] = followers_bucket(author.get("followers_count", 0))
         filtered.append(t)
 
@@ -112,31 +120,86 @@ def select_reply_targets(
     return picked, buckets
 
 
+def _collect_drafts(
+    jobs: List[Callable[[], Optional[str]]],
+    scorer: Callable[[str], float],
+) -> List[Tuple[float, str]]:
+    """
+    Run draft generators concurrently and return (score, draft) for valid drafts.
+
+    Stops waiting after AI_DRAFT_TIMEOUT_SECONDS; with AI_DRAFT_EARLY_EXIT it
+    returns as soon as one draft reaches DRAFT_ACCEPT_SCORE.
+    """
+    drafts = []
+    pool = ThreadPoolExecutor(max_workers=max(1, len(jobs)))
+    try:
+        futures = [pool.submit(job) for job in jobs]
+        for future in as_completed(futures, timeout=max(1, Config.AI_DRAFT_TIMEOUT_SECONDS)):
+            try:
+                draft = future.result()
+            except Exception as e:
+                logger.warning(f"Draft generation failed: {e}")
+                continue
+            if not draft:
+                continue
+            is_valid, _ = validate_tweet_text(draft)
+            if not is_valid:
+                continue
+            score = scorer(draft)
+            drafts.append((score, draft))
+            if Config.AI_DRAFT_EARLY_EXIT and score >= DRAFT_ACCEPT_SCORE:
+                break
+    except FuturesTimeout:
+        logger.warning(
+            f"Draft generation timed out after {Config.AI_DRAFT_TIMEOUT_SECONDS}s "
+            f"({len(drafts)}/{len(jobs)} drafts ready)"
+        )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return drafts
+
+
+def _score_batched_drafts(drafts: List[Tuple[str, str]], scorer: Callable[[str], float]) -> List[Tuple[float, str]]:
+    """Score (angle, text) drafts from a single batched request."""
+    scored = []
+    for _angle, draft in drafts:
+        is_valid, _ = validate_tweet_text(draft)
+        if is_valid:
+            scored.append((scorer(draft), draft))
+    return scored
+
+
 def generate_best_reply(tweet_text: str, author_username: str) -> Optional[str]:
     """Generate multiple reply drafts and return the highest-quality one."""
     angles = ["practical", "contrasting", "supportive", "conversational", "curious", "questioning"]
     random.shuffle(angles)
-    drafts = []
     draft_budget = max(1, min(4, Config.MAX_REPLY_DRAFTS))
 
+    variants = []
     for angle in angles[:draft_budget]:
         # Prefer statement-like replies for more human variance.
         response_mode = "statement" if random.random() < 0.7 else "mixed"
         if angle == "questioning":
             response_mode = "question"
+        variants.append((angle, response_mode))
 
-        draft = generate_ai_reply(tweet_text, author_username, angle=angle, response_mode=response_mode)
-        if not draft:
-            continue
-        is_valid, _ = validate_tweet_text(draft)
-        if not is_valid:
-            continue
-        score = score_reply_quality(draft)
-        drafts.append((score, draft))
-
+    drafts = []
+    if Config.AI_BATCH_DRAFTS and len(variants) > 1:
+        drafts = _score_batched_drafts(
+            generate_ai_reply_drafts(tweet_text, author_username, variants),
+            score_reply_quality,
+        )
+    if not drafts:
+        jobs = [
+            lambda angle=angle, mode=mode: generate_ai_reply(
+                tweet_text, author_username, angle=angle, response_mode=mode
+            )
+            for angle, mode in variants
+        ]
+        drafts = _collect_drafts(jobs, score_reply_quality)
     if drafts:
         drafts.sort(key=lambda x: x[0], reverse=True)
-        if drafts[0][0] >= 50:
+        if drafts[0][0] >= DRAFT_ACCEPT_SCORE:
             return drafts[0][1]
 
     fallback = build_value_fallback_reply(tweet_text, author_username)
@@ -149,20 +212,21 @@ def generate_best_post(topic: str, niche: Optional[str] = None) -> Optional[str]
     niche = niche or ((Config.NICHE[0].strip() if Config.NICHE else "technology") or "technology")
     angles = ["practical", "insights", "critical", "educational", "conversational"]
     draft_budget = max(1, min(len(angles), Config.MAX_POST_DRAFTS))
-    drafts = []
-
-    for angle in angles[:draft_budget]:
-        draft = generate_ai_tweet(topic, niche=niche, angle=angle)
-        if not draft:
-            continue
-        is_valid, _ = validate_tweet_text(draft)
-        if not is_valid:
-            continue
-        score = score_post_quality(draft)
-        drafts.append((score, draft))
 
+    drafts = []
+    if Config.AI_BATCH_DRAFTS and draft_budget > 1:
+        drafts = _score_batched_drafts(
+            generate_ai_tweet_drafts(topic, niche=niche, angles=angles[:draft_budget]),
+            score_post_quality,
+        )
+    if not drafts:
+        jobs = [
+            lambda angle=angle: generate_ai_tweet(topic, niche=niche, angle=angle)
+            for angle in angles[:draft_budget]
+        ]
+        drafts = _collect_drafts(jobs, score_post_quality)
     if not drafts:
         return None
 
     drafts.sort(key=lambda x: x[0], reverse=True)
-    return drafts[0][1] if drafts[0][0] >= 50 else None
+    return drafts[0][1] if drafts[0][0] >= DRAFT_ACCEPT_SCORE else None
@@ -1,34 +1,15 @@
 """Handle direct messages with AI responses."""
-from openai import OpenAI
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
 from utils.sanitizer import sanitize_for_ai_prompt, validate_tweet_text
 from utils.rate_limiter import RateLimiter
+from utils.llm_cache import cached_chat_completion
+from utils.openai_client import get_openai_client
 from datetime import datetime
 from config import Config
 
 MODEL = Config.OPENAI_MODEL
-_client = None
-_client_init_failed = False
-
-
-def get_openai_client():
-    """Lazily initialize OpenAI client to avoid import-time crashes."""
-    global _client, _client_init_failed
-    if _client is not None:
-        return _client
-    if _client_init_failed:
-        return None
-
-    try:
-        _client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        return _client
-    except Exception as e:
-        _client_init_failed = True
-        logger.error(f"OpenAI client initialization failed: {e}")
-        logger.error("Check package compatibility (openai/httpx) and OPENAI_API_KEY")
-        return None
 
 
 def get_unresponded_dms(max_results: int = 10) -> list:
@@ -57,7 +38,8 @@ def generate_dm_response(dm_text: str, sender_username: str) -> str:
             logger.warning("Empty or invalid input for DM response generation")
             return None
         
-        response = client.chat.completions.create(
+        dm_response = cached_chat_completion(
+            client,
             model=MODEL,
             messages=[
                 {
@@ -102,8 +84,6 @@ Always maintain professionalism and respect."""
             temperature=0.7
         )
         
-        dm_response = response.choices[0].message.content.strip()
-        
         # Validate generated response
         is_valid, message = validate_tweet_text(dm_response)
         if not is_valid:
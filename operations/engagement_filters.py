@@ -1,6 +1,8 @@
 """Shared filters for selecting diverse, real-looking accounts for engagement."""
 from typing import Dict, List, Optional, Set, Tuple
 
+from operations.scoring_engine import score_page
+
 
 def followers_bucket(followers: int) -> str:
     """Group accounts by follower size for diversity balancing."""
@@ -99,8 +101,9 @@ def select_diverse_real_tweets(
     excluded_lower = {u.lower() for u in (excluded_usernames or set()) if u}
     seen_authors = set()
     candidates = []
+    page_scores = score_page(tweets)
 
-    for tweet in tweets:
+    for i, tweet in enumerate(tweets):
         author_info = tweet.get("author_info", {})
         author_username = (author_info.get("username", "") or "").strip()
         author_id = tweet.get("author_id")
@@ -117,18 +120,14 @@ def select_diverse_real_tweets(
             continue
         seen_authors.add(author_key)
 
-        is_real, score = evaluate_account_authenticity(
-            author_info,
-            tweet.get("public_metrics", {})
-        )
+        is_real, score = page_scores["is_real"][i], page_scores["authenticity"][i]
         if not is_real:
             continue
 
-        enriched = dict(tweet)
         followers = author_info.get("followers_count", 0)
-        enriched["authenticity_score"] = score
-        enriched["followers_bucket"] = followers_bucket(followers)
-        candidates.append(enriched)
+        tweet["authenticity_score"] = score
+        tweet["followers_bucket"] = followers_bucket(followers)
+        candidates.append(tweet)
 
     candidates.sort(
         key=lambda t: (
@@ -1,13 +1,14 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from utils.rate_limiter import RateLimiter
+from utils.pacing import pacer
 from utils.sanitizer import sanitize_search_query
+from operations.scoring_engine import score_page
 from operations.interaction_policy import can_engage_user
 from config import Config
 from datetime import datetime
-import time
-import random
 
 
 def is_likely_bot(author_info: dict) -> bool:
@@ -134,9 +135,13 @@ def follow_relevant_users(query: str, count: int = 50) -> int:
         logger.warning(f"No tweets found for query: {query}")
         return 0
     
+    # Already-following checks read db.users; include follows queued earlier this run.
+    bulk_writer.flush("users")
+
     # Build list of unique users with scores
     user_scores = {}
-    for tweet in tweets:
+    follow_scores = score_page(tweets)["follow_worthiness"]
+    for i, tweet in enumerate(tweets):
         author_id = tweet.get('author_id')
         if not author_id or author_id in user_scores:
             continue
@@ -148,11 +153,7 @@ def follow_relevant_users(query: str, count: int = 50) -> int:
             logger.debug(f"Skipping likely bot account: {author_info.get('username', 'unknown')}")
             continue
         
-        # Calculate follow-worthiness score
-        score = calculate_follow_worthiness_score(
-            author_info,
-            tweet.get('public_metrics', {})
-        )
+        score = follow_scores[i]
         
         # Only consider accounts above threshold
         if score < 30:  # Minimum follow threshold
@@ -179,14 +180,15 @@ def follow_relevant_users(query: str, count: int = 50) -> int:
             break
         
         # Check if already following
-        existing = db.users.find_one({"user_id": author_id, "unfollowed_at": None})
-        if existing:
+        if db.exists("users", {"user_id": author_id, "unfollowed_at": None}):
             continue
 
         username = user_data['username']
         if not can_engage_user("follow", user_id=str(author_id), username=username, cooldown_hours=168):
             continue
         
+        if not pacer.wait_turn("follow"):
+            break
         if tweet_handler.follow_user(author_id):
             # Increment rate limiter
             RateLimiter.increment("follows", Config.MAX_FOLLOWS_PER_DAY)
@@ -196,7 +198,7 @@ def follow_relevant_users(query: str, count: int = 50) -> int:
             author_info = user_data['author_info']
             
             # Save to database
-            db.users.insert_one({
+            bulk_writer.insert("users", {
                 "user_id": author_id,
                 "username": user_data['username'],
                 "followers_count": author_info.get('followers_count', 0),
@@ -209,7 +211,7 @@ def follow_relevant_users(query: str, count: int = 50) -> int:
             })
             
             # Log activity
-            db.activity_logs.insert_one({
+            activity = {
                 "action": "follow",
                 "target_id": author_id,
                 "target_type": "user",
@@ -222,13 +224,10 @@ def follow_relevant_users(query: str, count: int = 50) -> int:
                     "follow_score": user_data['score'],
                     "followers": author_info.get('followers_count', 0)
                 }
-            })
+            }
+            bulk_writer.insert("activity_logs", activity)
             
             logger.info(f"✓ Followed @{user_data['username']} (score: {user_data['score']:.1f}, followers: {author_info.get('followers_count', 0)})")
-            
-            # Random delay
-            delay = random.randint(Config.MIN_DELAY_SECONDS, Config.MAX_DELAY_SECONDS)
-            time.sleep(delay)
     
     logger.info(f"✓ Followed {success_count}/{len(sorted_users)} high-quality users")
     return success_count
@@ -1,20 +1,190 @@
 """Shared interaction guardrails to prevent repetitive, one-sided behavior."""
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 from database import db
+from database.bulk_writer import bulk_writer
+from database.reply_history import reply_history
+from config import Config
 from utils.logger import logger
 
 
+ENGAGEMENT_ACTIONS = ("reply", "like", "retweet", "follow")
+# Cooldown checks only look at when the last action happened
+TIMESTAMP_ONLY = {"_id": 0, "timestamp": 1}
+
+
+class InteractionHistoryIndex:
+    """
+    In-memory view of recent successful interactions and talk-backs.
+
+    Loaded once per run with a few aggregations instead of one activity_logs
+    lookup per candidate. Cooldowns only look at the load window, so keep
+    INTERACTION_HISTORY_DAYS above the longest cooldown. The reply rule has
+    no time limit, so older replies come from reply_history (one document
+    per user, outlives archiving) and each author's latest mention is loaded
+    without a window.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.since: Optional[datetime] = None
+        self._by_user_id: Dict[Tuple[str, str], datetime] = {}
+        self._by_username: Dict[Tuple[str, str], datetime] = {}
+        self._talk_back: Dict[str, datetime] = {}
+        self._talk_back_by_username: Dict[str, datetime] = {}
+
+    def load(self, days: Optional[int] = None) -> None:
+        """Load the last N days of interactions and mentions into memory."""
+        days = max(1, days or Config.INTERACTION_HISTORY_DAYS)
+        since = datetime.utcnow() - timedelta(days=days)
+        self._by_user_id.clear()
+        self._by_username.clear()
+        self._talk_back.clear()
+        self._talk_back_by_username.clear()
+        _flush_pending_interactions()
+
+        actions = db.activity_logs.aggregate([
+            {
+                "$match": {
+                    "action": {"$in": list(ENGAGEMENT_ACTIONS)},
+                    "success": True,
+                    "timestamp": {"$gte": since},
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        "action": "$action",
+                        "user_id": "$target_user_id",
+                        "username": "$target_user",
+                    },
+                    "last": {"$max": "$timestamp"},
+                }
+            },
+        ])
+        for row in actions:
+            key = row.get("_id", {}) or {}
+            self.record(key.get("action", ""), key.get("user_id", ""), key.get("username", ""), row.get("last"))
+
+        for doc in reply_history.all():
+            self.record("reply", doc.get("user_id", ""), doc.get("username", ""), doc.get("last_reply_at"))
+
+        mentions = db.mentions.aggregate([
+            {
+                "$group": {
+                    "_id": "$author_id",
+                    "last_created": {"$max": "$created_at"},
+                    "last_received": {"$max": "$received_at"},
+                    "username": {"$max": "$author_username"},
+                }
+            },
+        ])
+        for row in mentions:
+            for field in ("last_created", "last_received"):
+                self.record_mention(row.get("_id"), row.get(field), row.get("username") or "")
+
+        self.since = since
+        self.loaded = True
+        logger.info(
+            f"✓ Interaction history loaded: {len(self._by_user_id)} user/action pairs, "
+            f"{len(self._talk_back)} talk-back authors (last {days} days)"
+        )
+
+    def reset(self) -> None:
+        """Drop the in-memory view; policy checks go back to per-query lookups."""
+        self.loaded = False
+        self.since = None
+        self._by_user_id.clear()
+        self._by_username.clear()
+        self._talk_back.clear()
+        self._talk_back_by_username.clear()
+
+    def record(self, action: str, user_id: str = "", username: str = "", timestamp: Optional[datetime] = None) -> None:
+        """Register a successful action so later checks in this run see it."""
+        if not action or not isinstance(timestamp, datetime):
+            return
+        if user_id:
+            key = (action, str(user_id))
+            if timestamp > self._by_user_id.get(key, datetime.min):
+                self._by_user_id[key] = timestamp
+        if username:
+            key = (action, username)
+            if timestamp > self._by_username.get(key, datetime.min):
+                self._by_username[key] = timestamp
+
+    def record_activity(self, activity: dict) -> None:
+        """Register a freshly written activity_logs document."""
+        if activity.get("success"):
+            self.record(
+                activity.get("action", ""),
+                activity.get("target_user_id", ""),
+                activity.get("target_user", ""),
+                activity.get("timestamp"),
+            )
+
+    def record_mention(self, author_id, timestamp: Optional[datetime], username: str = "") -> None:
+        """Register an inbound mention/reply from a user."""
+        if author_id is None or author_id == "" or not isinstance(timestamp, datetime):
+            return
+        timestamp = timestamp.replace(tzinfo=None)
+        for index, key in ((self._talk_back, str(author_id)), (self._talk_back_by_username, username)):
+            if key and timestamp > index.get(key, datetime.min):
+                index[key] = timestamp
+
+    def latest(self, actions: Iterable[str], user_id: str = "", username: str = "") -> Optional[datetime]:
+        """Latest timestamp of any of `actions` against a user, mirroring the DB lookup keys."""
+        if user_id:
+            index, ident = self._by_user_id, str(user_id)
+        elif username:
+            index, ident = self._by_username, username
+        else:
+            return None
+        found = [index[(a, ident)] for a in actions if (a, ident) in index]
+        return max(found) if found else None
+
+    def talked_back_since(self, user_id: str, since: datetime, username: str = "") -> bool:
+        if user_id:
+            last = self._talk_back.get(str(user_id))
+        else:
+            last = self._talk_back_by_username.get(username)
+        return last is not None and last > since
+
+
+# Global per-run index (call interaction_history.load() at run start)
+interaction_history = InteractionHistoryIndex()
+# Buffered activity_logs inserts reach the index before they reach MongoDB.
+bulk_writer.add_listener("activity_logs", interaction_history.record_activity)
+
+
+def _flush_pending_interactions() -> None:
+    """Make buffered activity writes visible before a per-query lookup."""
+    bulk_writer.flush("activity_logs")
+    bulk_writer.flush("reply_history")
+
+
 def _latest_action_with_user(action: str, user_id: str = "", username: str = "") -> Optional[dict]:
+    if not user_id and not username:
+        return None
+    if interaction_history.loaded:
+        last_ts = interaction_history.latest([action], user_id=user_id, username=username)
+        return {"timestamp": last_ts} if last_ts else None
+
+    _flush_pending_interactions()
     query = {"action": action, "success": True}
     if user_id:
         query["target_user_id"] = str(user_id)
-    elif username:
-        query["target_user"] = username
     else:
-        return None
-    return db.activity_logs.find_one(query, sort=[("timestamp", -1)])
+        query["target_user"] = username
+    latest = db.activity_logs.find_one(query, TIMESTAMP_ONLY, sort=[("timestamp", -1)])
+    if action != "reply":
+        return latest
+
+    # Replies may already be archived out of activity_logs
+    logged = latest.get("timestamp") if latest else None
+    kept = reply_history.last_reply(user_id=user_id, username=username)
+    found = [ts for ts in (logged, kept) if isinstance(ts, datetime)]
+    return {"timestamp": max(found)} if found else latest
 
 
 def can_engage_user(action: str, user_id: str = "", username: str = "", cooldown_hours: int = 72) -> bool:
@@ -36,28 +206,36 @@ def can_engage_user(action: str, user_id: str = "", username: str = "", cooldown
     return True
 
 
-def has_user_talked_back(user_id: str, since: datetime) -> bool:
+def has_user_talked_back(user_id: str, since: datetime, username: str = "") -> bool:
     """Check if user has mentioned/replied to us after our last outbound reply."""
-    if not user_id:
+    if not user_id and not username:
         return False
 
-    author_variants = [user_id]
-    if str(user_id).isdigit():
-        try:
-            author_variants.append(int(user_id))
-        except Exception:
-            pass
+    if interaction_history.loaded:
+        return interaction_history.talked_back_since(user_id, since, username)
 
-    mention = db.mentions.find_one(
+    if user_id:
+        author_variants = [user_id]
+        if str(user_id).isdigit():
+            try:
+                author_variants.append(int(user_id))
+            except Exception:
+                pass
+        author = {"author_id": {"$in": author_variants}}
+    else:
+        # Mentions are saved with the author's username looked up in bulk
+        author = {"author_username": username}
+
+    return db.exists(
+        "mentions",
         {
-            "author_id": {"$in": author_variants},
+            **author,
             "$or": [
                 {"created_at": {"$gt": since}},
                 {"received_at": {"$gt": since}},
             ],
         }
     )
-    return mention is not None
 
 
 def can_reply_to_user(user_id: str = "", username: str = "") -> bool:
@@ -73,7 +251,7 @@ def can_reply_to_user(user_id: str = "", username: str = "") -> bool:
     if not isinstance(last_ts, datetime):
         return False
 
-    if not has_user_talked_back(user_id, last_ts):
+    if not has_user_talked_back(user_id, last_ts, username):
         logger.debug(f"Skipping @{username or user_id}: no talk-back since last reply")
         return False
 
@@ -86,8 +264,13 @@ def has_recent_any_engagement(user_id: str = "", username: str = "", cooldown_ho
     if not user_id and not username:
         return False
 
+    if interaction_history.loaded:
+        last_ts = interaction_history.latest(ENGAGEMENT_ACTIONS, user_id=user_id, username=username)
+        return last_ts is not None and datetime.utcnow() < (last_ts + timedelta(hours=cooldown_hours))
+
+    _flush_pending_interactions()
     query = {
-        "action": {"$in": ["reply", "like", "retweet", "follow"]},
+        "action": {"$in": list(ENGAGEMENT_ACTIONS)},
         "success": True,
     }
     if user_id:
@@ -95,7 +278,7 @@ def has_recent_any_engagement(user_id: str = "", username: str = "", cooldown_ho
     elif username:
         query["target_user"] = username
 
-    latest = db.activity_logs.find_one(query, sort=[("timestamp", -1)])
+    latest = db.activity_logs.find_one(query, TIMESTAMP_ONLY, sort=[("timestamp", -1)])
     if not latest:
         return False
 
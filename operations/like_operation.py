@@ -1,13 +1,14 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from utils.rate_limiter import RateLimiter
+from utils.pacing import pacer
 from utils.sanitizer import sanitize_search_query
+from operations.scoring_engine import score_page
 from operations.interaction_policy import can_engage_user, has_recent_any_engagement
 from config import Config
 from datetime import datetime, timedelta
-import time
-import random
 
 
 def is_likely_bot(author_info: dict) -> bool:
@@ -100,7 +101,7 @@ def calculate_account_quality_score(author_info: dict, tweet_metrics: dict) -> f
         score += 5
     
     # Profile completeness (max 15 points)
-    description = author_info.get('description', '')
+    description = author_info.get('description', '') or ''
     if len(description) > 50:
         score += 15
     elif len(description) > 20:
@@ -137,11 +138,15 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
         logger.warning(f"No tweets found for query: {query}")
         return 0
     
+    # Liked-tweet checks below read db.tweets; make earlier likes this run visible.
+    bulk_writer.flush("tweets")
+
     # Filter and score tweets
     filtered_tweets = []
     liked_authors = set()  # Track authors we've already liked in this session
+    quality_scores = score_page(tweets)["account_quality"]
     
-    for tweet in tweets:
+    for i, tweet in enumerate(tweets):
         author_id = tweet.get('author_id')
         author_info = tweet.get('author_info', {})
         author_username = author_info.get('username', 'unknown')
@@ -156,11 +161,7 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
             logger.debug(f"Skipping likely bot account: {author_info.get('username', 'unknown')}")
             continue
         
-        # Calculate quality score
-        quality_score = calculate_account_quality_score(
-            author_info,
-            tweet.get('public_metrics', {})
-        )
+        quality_score = quality_scores[i]
         
         # Only proceed with accounts scoring above threshold
         if quality_score < 20:  # Minimum quality threshold
@@ -189,14 +190,13 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
         author_info = tweet.get('author_info', {})
         
         # Check if already liked this tweet
-        existing = db.tweets.find_one({"tweet_id": tweet_id, "liked_at": {"$ne": None}})
-        if existing:
+        if db.exists("tweets", {"tweet_id": tweet_id, "liked_at": {"$ne": None}}):
             logger.debug(f"Tweet {tweet_id} already liked, skipping")
             continue
         
         # Check if we've recently liked tweets from this author (within last 7 days)
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        recent_like = db.tweets.find_one({
+        recent_like = db.exists("tweets", {
             "author_id": author_id,
             "liked_at": {"$ne": None, "$gte": seven_days_ago}
         })
@@ -211,6 +211,8 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
         if not can_engage_user("like", user_id=str(author_id), username=author_username, cooldown_hours=72):
             continue
         
+        if not pacer.wait_turn("like"):
+            break
         if tweet_handler.like_tweet(tweet_id):
             # Increment rate limiter
             RateLimiter.increment("likes", Config.MAX_LIKES_PER_DAY)
@@ -220,7 +222,8 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
             
             # Save to database
             metrics = tweet.get('public_metrics', {})
-            db.tweets.update_one(
+            bulk_writer.upsert(
+                "tweets",
                 {"tweet_id": tweet_id},
                 {
                     "$set": {
@@ -237,12 +240,11 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
                         "liked_at": datetime.utcnow(),
                         "search_query": query
                     }
-                },
-                upsert=True
+                }
             )
             
             # Log activity
-            db.activity_logs.insert_one({
+            activity = {
                 "action": "like",
                 "target_id": tweet_id,
                 "target_type": "tweet",
@@ -255,13 +257,10 @@ def like_relevant_tweets(query: str, count: int = 50) -> int:
                     "author_id": author_id,
                     "quality_score": tweet.get('quality_score', 0)
                 }
-            })
+            }
+            bulk_writer.insert("activity_logs", activity)
             
             logger.info(f"✓ Liked tweet from @{author_info.get('username', 'unknown')} (quality: {tweet.get('quality_score', 0):.1f})")
-            
-            # Random delay
-            delay = random.randint(Config.MIN_DELAY_SECONDS, Config.MAX_DELAY_SECONDS)
-            time.sleep(delay)
     
     logger.info(f"✓ Liked {success_count}/{len(filtered_tweets)} high-quality tweets")
     return success_count
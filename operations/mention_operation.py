@@ -1,6 +1,7 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from operations.interaction_policy import interaction_history
 from utils.sanitizer import sanitize_input
 from datetime import datetime
 
@@ -14,28 +15,33 @@ def check_mentions(max_results: int = 10) -> int:
     
     logger.info(f"✓ Found {len(mentions)} mentions to review")
     
+    new_mentions = [m for m in mentions if not db.exists("mentions", {"mention_id": m.get('id')})]
+    # One lookup for all new authors, so talk-back checks can also match by username
+    authors = tweet_handler.get_users_bulk(
+        [m.get('author_id') for m in new_mentions], user_fields=['username']
+    ) if new_mentions else {}
+    
     # Save mentions to database
-    for mention in mentions:
+    for mention in new_mentions:
         mention_id = mention.get('id')
-        
-        # Check if already saved
-        existing = db.mentions.find_one({"mention_id": mention_id})
-        if existing:
-            continue
+        author_username = (authors.get(str(mention.get('author_id'))) or {}).get('username', '')
         
         # Sanitize mention text before saving
         mention_text = sanitize_input(mention.get('text', ''))
         
         # Save mention
+        received_at = datetime.utcnow()
         db.mentions.insert_one({
             "mention_id": mention_id,
             "author_id": mention.get('author_id'),
+            "author_username": author_username,
             "text": mention_text,
             "created_at": mention.get('created_at'),
-            "received_at": datetime.utcnow(),
+            "received_at": received_at,
             "responded": False
         })
+        interaction_history.record_mention(mention.get('author_id'), received_at, author_username)
         
-        logger.info(f"  - From: {mention.get('author_id')} | Text: {mention_text[:50]}...")
+        logger.info(f"  - From: @{author_username or mention.get('author_id')} | Text: {mention_text[:50]}...")
     
     return len(mentions)
@@ -1,6 +1,8 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from database.rollups import daily_rollups
+from database.timeseries import timeseries
 from datetime import datetime
 
 
@@ -13,14 +15,20 @@ def get_account_metrics() -> dict:
         logger.info(f"  Total Tweets: {stats['tweets']}")
         
         # Save metrics snapshot to database
-        db.metrics_history.insert_one({
+        snapshot = {
             "username": stats['username'],
             "followers": stats['followers'],
             "following": stats['following'],
             "tweets": stats['tweets'],
             "verified": stats.get('verified', False),
             "timestamp": datetime.utcnow()
-        })
+        }
+        db.metrics_history.insert_one(snapshot)
+        daily_rollups.record_metrics(snapshot)
+        timeseries.record_many(
+            {metric: snapshot[metric] for metric in ("followers", "following", "tweets")},
+            ts=snapshot["timestamp"]
+        )
         
         return stats
     return {}
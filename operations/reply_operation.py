@@ -1,14 +1,13 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from utils.rate_limiter import RateLimiter
+from utils.pacing import pacer
 from utils.sanitizer import sanitize_search_query, validate_tweet_text
 from config import Config
 from operations.engagement_filters import select_diverse_real_tweets
 from operations.interaction_policy import can_reply_to_user
-from database import db
+from database.bulk_writer import bulk_writer
 from datetime import datetime
-import random
-import time
 
 
 def reply_to_relevant_tweets(query: str, reply_template: str, count: int = 10) -> int:
@@ -40,8 +39,7 @@ def reply_to_relevant_tweets(query: str, reply_template: str, count: int = 10) -
         logger.warning("No high-confidence real accounts found for replies")
         return 0
 
-    our_user = tweet_handler.api.verify_credentials()
-    our_user_id = str(our_user.id)
+    our_user_id = tweet_handler.identity.get().id_str
 
     success_count = 0
     for tweet in selected:
@@ -65,13 +63,15 @@ def reply_to_relevant_tweets(query: str, reply_template: str, count: int = 10) -
         if not is_valid:
             continue
 
+        if not pacer.wait_turn("reply"):
+            break
         if tweet_handler.reply_to_tweet(tweet_id, reply_text):
             # Increment rate limiter
             RateLimiter.increment("replies", Config.MAX_REPLIES_PER_DAY)
             success_count += 1
 
             try:
-                db.activity_logs.insert_one({
+                activity = {
                     "action": "reply",
                     "target_id": tweet_id,
                     "target_type": "tweet",
@@ -84,13 +84,11 @@ def reply_to_relevant_tweets(query: str, reply_template: str, count: int = 10) -
                         "authenticity_score": tweet.get("authenticity_score", 0),
                         "bucket": tweet.get("followers_bucket", "mid")
                     }
-                })
+                }
+                bulk_writer.insert("activity_logs", activity)
             except Exception:
                 pass
 
-            delay = random.randint(Config.MIN_DELAY_SECONDS, Config.MAX_DELAY_SECONDS)
-            time.sleep(delay)
-
     logger.info(
         f"✓ Replied to {success_count}/{count} tweets "
         f"(real_candidates={candidate_count}, buckets={bucket_counts})"
@@ -1,10 +1,11 @@
 """Research layer for gathering and normalizing conversation candidates."""
-from typing import List, Dict, Any
+from typing import List
 
-from tweet_handler import tweet_handler
+from database.models import Candidate
+from tweet_handler import iter_pages, tweet_handler
 from utils.logger import logger
 from utils.sanitizer import sanitize_search_query
-from operations.quality_scorer import score_candidate_value
+from operations.scoring_engine import score_page
 from config import Config
 
 
@@ -25,41 +26,46 @@ def _query_variants(topic: str) -> List[str]:
     return deduped[:max(1, Config.MAX_RESEARCH_QUERIES)]
 
 
-def collect_research_candidates(topic: str, max_candidates: int = 80) -> List[Dict[str, Any]]:
-    """Collect, dedupe, and score candidate tweets for engagement."""
+def collect_research_candidates(topic: str, max_candidates: int = 80) -> List[Candidate]:
+    """
+    Collect, dedupe, and score candidate tweets for engagement.
+
+    Query variants are searched in order and their result pages scored as they
+    arrive; no further page or variant is fetched once `max_candidates` tweets
+    have passed the score threshold.
+    """
     variants = _query_variants(topic)
     if not variants:
         return []
 
     per_query = max(10, min(Config.MAX_RESULTS_PER_RESEARCH_QUERY, max_candidates // max(1, len(variants))))
-    raw: List[Dict[str, Any]] = []
+    raw = 0
+    selected: List[Candidate] = []
+    seen_tweet_ids = set()
 
     for q in variants:
-        tweets = tweet_handler.search_tweets(q, max_results=per_query)
-        if tweets:
-            for t in tweets:
-                t = dict(t)
-                t["research_query"] = q
-                raw.append(t)
-
-    if not raw:
-        return []
-
-    deduped = []
-    seen_tweet_ids = set()
-    for t in raw:
-        tid = str(t.get("id", ""))
-        if not tid or tid in seen_tweet_ids:
-            continue
-        seen_tweet_ids.add(tid)
-        deduped.append(t)
+        for page in iter_pages(tweet_handler.iter_search(q, page_size=per_query), per_query):
+            raw += len(page)
+            fresh = []
+            for t in page:
+                tid = str(t.id or "")
+                if not tid or tid in seen_tweet_ids:
+                    continue
+                seen_tweet_ids.add(tid)
+                t.research_query = q
+                fresh.append(t)
 
-    for t in deduped:
-        t["candidate_score"] = score_candidate_value(t)
+            for t, score in zip(fresh, score_page(fresh)["candidate_value"]):
+                t.candidate_score = score
+            selected.extend(t for t in fresh if t.candidate_score >= 40)
+            if len(selected) >= max_candidates:
+                break
+        if len(selected) >= max_candidates:
+            break
 
-    deduped.sort(key=lambda x: x.get("candidate_score", 0), reverse=True)
-    selected = [t for t in deduped if t.get("candidate_score", 0) >= 40][:max_candidates]
+    selected.sort(key=lambda x: x.candidate_score, reverse=True)
+    selected = selected[:max_candidates]
     logger.info(
-        f"Research: topic='{topic}' variants={len(variants)} raw={len(raw)} deduped={len(deduped)} selected={len(selected)}"
+        f"Research: topic='{topic}' variants={len(variants)} raw={raw} deduped={len(seen_tweet_ids)} selected={len(selected)}"
     )
     return selected
@@ -1,13 +1,13 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from utils.rate_limiter import RateLimiter
+from utils.pacing import pacer
 from utils.sanitizer import sanitize_search_query
 from operations.interaction_policy import can_engage_user, has_recent_any_engagement
 from config import Config
 from datetime import datetime
-import time
-import random
 
 
 def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 50) -> int:
@@ -30,6 +30,7 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
         logger.warning(f"No tweets found for query: {query}")
         return 0
     
+    bulk_writer.flush("tweets")
     eligible = []
     for tweet in tweets:
         tweet_id = tweet['id']
@@ -39,8 +40,7 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
         engagement = metrics.get('like_count', 0) + metrics.get('retweet_count', 0)
         
         # Check if already retweeted
-        existing = db.tweets.find_one({"tweet_id": tweet_id, "retweeted_at": {"$ne": None}})
-        if existing:
+        if db.exists("tweets", {"tweet_id": tweet_id, "retweeted_at": {"$ne": None}}):
             continue
 
         if not can_engage_user("retweet", user_id=str(author_id), username=author_username, cooldown_hours=120):
@@ -48,20 +48,20 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
         if has_recent_any_engagement(user_id=str(author_id), username=author_username, cooldown_hours=120):
             continue
 
-        tweet["_engagement"] = engagement
+        tweet["engagement"] = engagement
         eligible.append(tweet)
 
     if not eligible:
         logger.info("No eligible retweet candidates after dedupe/cooldown checks")
         return 0
 
-    eligible.sort(key=lambda t: t.get("_engagement", 0), reverse=True)
-    selected = [t for t in eligible if t.get("_engagement", 0) >= min_engagement]
+    eligible.sort(key=lambda t: t.get("engagement", 0), reverse=True)
+    selected = [t for t in eligible if t.get("engagement", 0) >= min_engagement]
 
     # Keep "big tweet" intent, but avoid always returning 0 in niche searches.
     if len(selected) < count:
         adaptive_floor = max(25, min_engagement // 2)
-        adaptive = [t for t in eligible if t.get("_engagement", 0) >= adaptive_floor and t not in selected]
+        adaptive = [t for t in eligible if t.get("engagement", 0) >= adaptive_floor and t not in selected]
         selected.extend(adaptive)
 
     selected = selected[:max(1, count)]
@@ -76,8 +76,10 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
         author_id = tweet.get('author_id')
         author_username = tweet.get('author_info', {}).get('username', 'unknown')
         metrics = tweet.get('public_metrics', {})
-        engagement = tweet.get("_engagement", 0)
+        engagement = tweet.get("engagement", 0)
 
+        if not pacer.wait_turn("retweet"):
+            break
         if tweet_handler.retweet(tweet_id):
             # Increment rate limiter
             RateLimiter.increment("retweets", Config.MAX_RETWEETS_PER_DAY)
@@ -85,7 +87,8 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
             success_count += 1
             
             # Save to database
-            db.tweets.update_one(
+            bulk_writer.upsert(
+                "tweets",
                 {"tweet_id": tweet_id},
                 {
                     "$set": {
@@ -101,12 +104,11 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
                         "retweeted_at": datetime.utcnow(),
                         "search_query": query
                     }
-                },
-                upsert=True
+                }
             )
             
             # Log activity
-            db.activity_logs.insert_one({
+            activity = {
                 "action": "retweet",
                 "target_id": tweet_id,
                 "target_type": "tweet",
@@ -115,14 +117,11 @@ def retweet_high_engagement(query: str, count: int = 30, min_engagement: int = 5
                 "timestamp": datetime.utcnow(),
                 "success": True,
                 "metadata": {"query": query, "engagement": engagement}
-            })
+            }
+            bulk_writer.insert("activity_logs", activity)
             
             if success_count >= count:
                 break
-
-            # Random delay
-            delay = random.randint(Config.MIN_DELAY_SECONDS, Config.MAX_DELAY_SECONDS)
-            time.sleep(delay)
     
     logger.info(f"✓ Retweeted {success_count} high-engagement tweets")
     return success_count
@@ -0,0 +1,194 @@
+"""Columnar candidate scoring: every per-tweet score for a search page in one pass."""
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+SCORE_COLUMNS = (
+    "authenticity",       # engagement_filters.evaluate_account_authenticity (score)
+    "is_real",            # engagement_filters.evaluate_account_authenticity (flag)
+    "candidate_value",    # quality_scorer.score_candidate_value
+    "account_quality",    # like_operation.calculate_account_quality_score
+    "follow_worthiness",  # follow_operation.calculate_follow_worthiness_score
+    "research_score",     # manual_research._candidate_score
+)
+
+
+def _num(value: Any) -> float:
+    return float(value or 0)
+
+
+def _extract_columns(tweets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flatten a search page into NumPy columns (text features are computed here)."""
+    rows = []
+    for tweet in tweets:
+        author = tweet.get("author_info", {}) or {}
+        metrics = tweet.get("public_metrics", {}) or {}
+        text = (tweet.get("text", "") or "").strip()
+        lowered = text.lower()
+        raw_description = author.get("description", "") or ""
+        username = author.get("username", "") or ""
+        digits_ratio = sum(ch.isdigit() for ch in username) / max(len(username), 1)
+        rows.append((
+            bool(author),
+            _num(author.get("followers_count", 0)),
+            _num(author.get("following_count", 0)),
+            _num(author.get("tweet_count", 0)),
+            _num(author.get("account_age_days", 0)),
+            float(len(raw_description.strip())),
+            float(len(raw_description)),
+            bool(author.get("verified", False)),
+            digits_ratio < 0.2,
+            _num(metrics.get("like_count", 0)),
+            _num(metrics.get("retweet_count", 0)),
+            _num(metrics.get("reply_count", 0)),
+            bool(text),
+            "http://" in lowered or "https://" in lowered,
+            float(len(text.split())),
+        ))
+
+    names = (
+        "has_author", "followers", "following", "tweet_count", "age_days",
+        "description_len", "raw_description_len", "verified", "plain_username",
+        "likes", "retweets", "replies", "has_text", "has_link", "word_count",
+    )
+    columns = list(zip(*rows))
+    flags = {"has_author", "verified", "plain_username", "has_text", "has_link"}
+    return {
+        name: np.array(col, dtype=bool if name in flags else np.float64)
+        for name, col in zip(names, columns)
+    }
+
+
+def _ladder(conditions: list, values: list, default: float) -> "np.ndarray":
+    return np.select(conditions, [np.float64(v) for v in values], np.float64(default))
+
+
+def _score_page_vectorized(tweets: List[Dict[str, Any]]) -> Dict[str, list]:
+    c = _extract_columns(tweets)
+    followers, following, age = c["followers"], c["following"], c["age_days"]
+    description_len, raw_description_len = c["description_len"], c["raw_description_len"]
+    engagement = c["likes"] + c["retweets"] * 2 + c["replies"] * 2
+    like_rt_engagement = c["likes"] + c["retweets"] * 2
+
+    has_following = following > 0
+    ratio = followers / np.where(has_following, following, 1.0)
+
+    # --- evaluate_account_authenticity ---
+    passes_hard_filters = (
+        c["has_author"]
+        & (age >= 30)
+        & (followers >= 10)
+        & (following <= 15000)
+        & (c["tweet_count"] >= 20)
+        & (description_len >= 8)
+    )
+    tweets_per_day = c["tweet_count"] / np.maximum(age, 1)
+    auth = _ladder([age > 365, age > 180], [20, 14], 8)
+    auth = auth + np.where(
+        has_following,
+        _ladder([(ratio >= 0.2) & (ratio <= 5), (ratio >= 0.1) & (ratio <= 10)], [20, 12], 3),
+        0.0,
+    )
+    auth = auth + _ladder([tweets_per_day <= 12, tweets_per_day <= 30], [15, 8], 1)
+    auth = auth + _ladder([description_len >= 40, description_len >= 20], [10, 6], 3)
+    auth = auth + np.where(c["verified"], 8.0, 0.0)
+    auth = auth + np.where(c["plain_username"], 5.0, 0.0)
+    auth = auth + _ladder([engagement >= 20, engagement >= 5, engagement >= 1], [12, 8, 4], 0)
+    auth = np.where(passes_hard_filters, auth, 0.0)
+    is_real = passes_hard_filters & (auth >= 40)
+
+    # --- score_candidate_value ---
+    value = auth * 0.6
+    value = value + _ladder(
+        [engagement >= 80, engagement >= 25, engagement >= 8, engagement >= 1], [20, 14, 9, 4], 0
+    )
+    value = value + np.where(
+        c["has_link"],
+        -20.0,
+        _ladder([c["word_count"] >= 12, c["word_count"] >= 8], [8, 4], -10),
+    )
+    value = np.maximum(0.0, np.minimum(100.0, value))
+    value = np.where(c["has_text"] & is_real, value, 0.0)
+
+    # --- calculate_account_quality_score ---
+    quality = np.where(c["verified"], 30.0, 0.0)
+    quality = quality + _ladder(
+        [followers > 10000, followers > 1000, followers > 100, followers > 10], [20, 15, 10, 5], 0
+    )
+    quality = quality + _ladder([age > 365, age > 180, age > 30], [15, 10, 5], 0)
+    quality = quality + _ladder(
+        [like_rt_engagement > 100, like_rt_engagement > 50, like_rt_engagement > 10, like_rt_engagement > 0],
+        [20, 15, 10, 5],
+        0,
+    )
+    quality = quality + _ladder(
+        [raw_description_len > 50, raw_description_len > 20, raw_description_len > 0], [15, 10, 5], 0
+    )
+    quality = np.where(c["has_author"], np.minimum(quality, 100.0), 0.0)
+
+    # --- calculate_follow_worthiness_score ---
+    worth = np.where(c["verified"], 25.0, 0.0)
+    worth = worth + _ladder(
+        [
+            (followers >= 1000) & (followers <= 100000),
+            (followers >= 100) & (followers < 1000),
+            followers > 100000,
+            followers > 50,
+        ],
+        [25, 20, 15, 10],
+        0,
+    )
+    worth = worth + np.where(
+        has_following,
+        _ladder(
+            [
+                (ratio >= 0.5) & (ratio <= 2.0),
+                ((ratio >= 0.2) & (ratio < 0.5)) | ((ratio > 2.0) & (ratio <= 5.0)),
+                ratio > 0.1,
+            ],
+            [20, 15, 10],
+            0,
+        ),
+        0.0,
+    )
+    worth = worth + _ladder([age > 365, age > 180, age > 90, age > 30], [15, 12, 8, 5], 0)
+    worth = worth + _ladder(
+        [like_rt_engagement > 100, like_rt_engagement > 50, like_rt_engagement > 10, like_rt_engagement > 0],
+        [15, 12, 8, 4],
+        0,
+    )
+    worth = np.where(c["has_author"], np.minimum(worth, 100.0), 0.0)
+
+    # --- manual_research._candidate_score ---
+    research = auth * 0.55
+    research = research + _ladder(
+        [followers >= 100000, followers >= 25000, followers >= 5000, followers >= 1000], [18, 12, 8, 4], 0
+    )
+    research = research + _ladder(
+        [engagement >= 300, engagement >= 120, engagement >= 50, engagement >= 10], [22, 16, 10, 5], 0
+    )
+    research = research + np.where(c["verified"], 6.0, 0.0)
+    research = np.minimum(100.0, research)
+
+    return {
+        "authenticity": auth.tolist(),
+        "is_real": is_real.tolist(),
+        "candidate_value": value.tolist(),
+        "account_quality": quality.tolist(),
+        "follow_worthiness": worth.tolist(),
+        # Python's round() (not np.round) keeps results identical to the scalar functions.
+        "research_score": [round(s, 1) if real else 0.0 for s, real in zip(research.tolist(), is_real.tolist())],
+    }
+
+
+def score_page(tweets: List[Dict[str, Any]]) -> Dict[str, list]:
+    """
+    Score a page of search results.
+
+    Returns:
+        SCORE_COLUMNS -> list of per-tweet values, aligned with `tweets`
+    """
+    if not tweets:
+        return {name: [] for name in SCORE_COLUMNS}
+    return _score_page_vectorized(tweets)
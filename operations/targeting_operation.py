@@ -2,13 +2,14 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from database import db
+from database.bulk_writer import bulk_writer
 from utils.rate_limiter import RateLimiter
+from utils.pacing import pacer
+from utils.quota import UNFOLLOW, quota
 from utils.sanitizer import sanitize_search_query
 from operations.interaction_policy import can_engage_user
 from config import Config
 from datetime import datetime
-import time
-import random
 
 
 def follow_quality_accounts(query: str, min_followers: int = 100, max_followers: int = 5000, count: int = 30) -> int:
@@ -35,6 +36,7 @@ def follow_quality_accounts(query: str, min_followers: int = 100, max_followers:
     
     followed = 0
     seen_authors = set()
+    bulk_writer.flush("users")
     
     for tweet in tweets:
         if not RateLimiter.check_limit("follows", Config.MAX_FOLLOWS_PER_DAY):
@@ -47,8 +49,7 @@ def follow_quality_accounts(query: str, min_followers: int = 100, max_followers:
         seen_authors.add(author_id)
         
         # Check if already following
-        existing = db.users.find_one({"user_id": author_id, "unfollowed_at": None})
-        if existing:
+        if db.exists("users", {"user_id": author_id, "unfollowed_at": None}):
             continue
 
         author_username = tweet.get('author_info', {}).get('username') or tweet.get('author_username', 'unknown')
@@ -60,6 +61,8 @@ def follow_quality_accounts(query: str, min_followers: int = 100, max_followers:
         # Skip if: followers < min_followers or followers > max_followers
         # Skip if: following/followers ratio > 2 (likely won't follow back)
         
+        if not pacer.wait_turn("follow"):
+            break
         if tweet_handler.follow_user(author_id):
             RateLimiter.increment("follows", Config.MAX_FOLLOWS_PER_DAY)
             followed += 1
@@ -74,8 +77,6 @@ def follow_quality_accounts(query: str, min_followers: int = 100, max_followers:
                 "min_followers": min_followers,
                 "max_followers": max_followers
             })
-            
-            time.sleep(random.randint(Config.MIN_DELAY_SECONDS, Config.MAX_DELAY_SECONDS))
     
     logger.info(f"✓ Followed {followed} quality accounts (followers: {min_followers}-{max_followers})")
     return followed
@@ -128,6 +129,8 @@ def engage_with_influencer_followers(influencer_username: str, count: int = 20)
 
         if not can_engage_user("like", user_id=author_id, username=author_username, cooldown_hours=72):
             continue
+        if not pacer.wait_turn("like"):
+            break
         if tweet_handler.like_tweet(tweet_id):
             RateLimiter.increment("likes", Config.MAX_LIKES_PER_DAY)
             engagements += 1
@@ -147,8 +150,6 @@ def engage_with_influencer_followers(influencer_username: str, count: int = 20)
                 },
                 upsert=True
             )
-            
-            time.sleep(random.randint(2, 5))
 
             if engagements >= count:
                 break
@@ -157,6 +158,33 @@ def engage_with_influencer_followers(influencer_username: str, count: int = 20)
     return engagements
 
 
+def refresh_followback_status(user_ids: list) -> set:
+    """
+    Check which followed accounts now follow us (one lookup call per 100 users).
+
+    Returns:
+        IDs (str) that follow back; they are marked followed_back in db.users
+    """
+    users = tweet_handler.get_users_bulk(user_ids)
+    followers = {
+        user_id for user_id, user in users.items()
+        if "followed_by" in (user.get("connection_status") or [])
+    }
+    # Stored ids keep whatever type they were saved with (search results give ints)
+    stored_ids = {str(user_id): user_id for user_id in user_ids}
+    now = datetime.utcnow()
+    for user_id in followers:
+        bulk_writer.update(
+            "users",
+            {"user_id": stored_ids.get(user_id, user_id)},
+            {"$set": {"followed_back": True, "followed_back_at": now}},
+        )
+    bulk_writer.flush("users")
+    if followers:
+        logger.info(f"✓ {len(followers)} followed account(s) now follow back")
+    return followers
+
+
 def unfollow_inactive_accounts(days_inactive: int = 30) -> int:
     """Unfollow accounts that haven't followed back after X days.
     
@@ -171,19 +199,28 @@ def unfollow_inactive_accounts(days_inactive: int = 30) -> int:
     cutoff_date = datetime.utcnow() - timedelta(days=days_inactive)
     
     # Find users followed >30 days ago who didn't follow back
+    bulk_writer.flush("users")
     inactive = db.users.find({
         "followed_at": {"$lt": cutoff_date},
         "followed_back": False,
         "unfollowed_at": None
-    }).limit(Config.MAX_UNFOLLOWS_PER_DAY)
+    }, {"_id": 0, "user_id": 1}).limit(Config.MAX_UNFOLLOWS_PER_DAY)
+    inactive_ids = [user.get('user_id') for user in inactive]
+    # Accounts that followed back since the last run are kept
+    followed_back = refresh_followback_status(inactive_ids)
     
     unfollowed = 0
     
-    for user in inactive:
+    for user_id in inactive_ids:
         if not RateLimiter.check_limit("unfollows", Config.MAX_UNFOLLOWS_PER_DAY):
             break
+        if str(user_id) in followed_back:
+            continue
         
-        user_id = user.get('user_id')
+        if not Config.DRY_RUN_MODE and not quota.allow(UNFOLLOW):
+            break
+        if not pacer.wait_turn("unfollow"):
+            break
         try:
             if Config.DRY_RUN_MODE:
                 logger.info(f"[DRY_RUN] Would unfollow inactive user {user_id}")
@@ -198,7 +235,6 @@ def unfollow_inactive_accounts(days_inactive: int = 30) -> int:
             )
             
             unfollowed += 1
-            time.sleep(random.randint(2, 4))
             
         except Exception as e:
             logger.error(f"Failed to unfollow {user_id}: {e}")
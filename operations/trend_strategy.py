@@ -4,8 +4,10 @@ from operations.trends_operation import get_trending_topics as get_engagement_to
 from operations.research_engine import collect_research_candidates
 from operations.decision_engine import select_reply_targets, generate_best_reply, generate_best_post
 from utils.logger import logger
+from utils.pacing import pacer
 from utils.sanitizer import sanitize_search_query
 from database import db
+from database.bulk_writer import bulk_writer
 from datetime import datetime
 from config import Config
 
@@ -90,7 +92,9 @@ def engage_with_trending_tweets(trend_name: str, count: int = 5) -> int:
             logger.warning(f"Invalid trend query after sanitization: {trend_name}")
             return 0
 
-        candidates = collect_research_candidates(safe_query, max_candidates=min(100, max(30, count * 12)))
+        candidates = collect_research_candidates(
+            safe_query, max_candidates=max(10, count * Config.SEARCH_CANDIDATE_POOL_FACTOR)
+        )
         if not candidates:
             logger.warning(f"No quality candidates found for trend query: {safe_query}")
             return 0
@@ -113,7 +117,10 @@ def engage_with_trending_tweets(trend_name: str, count: int = 5) -> int:
             bucket = tweet.get("followers_bucket", "mid")
             reply = generate_best_reply(tweet_text, author_username)
 
-            if reply and tweet_handler.reply_to_tweet(tweet_id, reply):
+            # Drafting time above already counts toward the pacing gap.
+            if not reply or not pacer.wait_turn("reply"):
+                continue
+            if tweet_handler.reply_to_tweet(tweet_id, reply):
                 engaged_count += 1
                 _replied_users.add(author_username)  # Track this user
                 logger.info(
@@ -122,7 +129,7 @@ def engage_with_trending_tweets(trend_name: str, count: int = 5) -> int:
                 
                 # Log activity
                 try:
-                    db.activity_logs.insert_one({
+                    activity = {
                         "action": "reply",
                         "target_id": tweet_id,
                         "target_type": "tweet",
@@ -137,7 +144,8 @@ def engage_with_trending_tweets(trend_name: str, count: int = 5) -> int:
                             "candidate_score": tweet.get("candidate_score", 0),
                             "reply_text": reply[:100]
                         }
-                    })
+                    }
+                    bulk_writer.insert("activity_logs", activity)
                 except:
                     pass  # Continue even if DB logging fails
         
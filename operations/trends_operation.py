@@ -3,7 +3,7 @@ import random
 from datetime import datetime, timedelta
 from database import db
 from config_topics import SEARCH_QUERIES, TOPICS_LIST, INFLUENCERS
-from tweet_handler import tweet_handler
+from async_tweet_handler import async_tweet_handler
 from utils.sanitizer import sanitize_search_query
 from config import Config
 
@@ -198,8 +198,10 @@ def discover_active_topics(limit: int = 5, pool_size: int = 10, sample_size: int
     ranked = []
     bounded_sample = min(100, max(10, sample_size))
 
-    for topic in candidates:
-        tweets = tweet_handler.search_tweets(topic, max_results=bounded_sample) or []
+    # Rank all candidate topics from one concurrent search fan-out.
+    results = async_tweet_handler.search_many([(topic, bounded_sample) for topic in candidates])
+    for topic, tweets in zip(candidates, results):
+        tweets = tweets or []
         if not tweets:
             continue
 
@@ -1,13 +1,17 @@
 from tweet_handler import tweet_handler
 from utils.logger import logger
 from utils.rate_limiter import RateLimiter
+from utils.quota import FOLLOWER_IDS, FRIEND_IDS, UNFOLLOW, quota
 from config import Config
 
 
 def unfollow_non_followers(max_unfollow: int = 50) -> int:
     """Unfollow users who don't follow back (follow/unfollow strategy)."""
     try:
-        user = tweet_handler.api.verify_credentials()
+        if not quota.ready([FRIEND_IDS, FOLLOWER_IDS]):
+            logger.info("Follower lists are rate limited; skipping unfollow pass")
+            return 0
+        user = tweet_handler.identity.get()
         
         # Get users we're following
         following = tweet_handler.api.get_friend_ids(user_id=user.id)
@@ -29,6 +33,8 @@ def unfollow_non_followers(max_unfollow: int = 50) -> int:
                 logger.warning(f"Daily unfollow limit reached ({Config.MAX_UNFOLLOWS_PER_DAY})")
                 break
             
+            if not Config.DRY_RUN_MODE and not quota.allow(UNFOLLOW):
+                break
             try:
                 if Config.DRY_RUN_MODE:
                     logger.info(f"[DRY_RUN] Would unfollow user {user_id}")
@@ -3,14 +3,25 @@ from operations.trends_operation import discover_active_topics
 from operations.like_operation import like_relevant_tweets
 from operations.content_operation import post_daily_original_lane, post_followup_from_replies
 from operations.targeting_operation import engage_with_influencer_followers, unfollow_inactive_accounts
-from operations.analytics_operation import analyze_best_performing_content, track_follower_growth, get_weekly_theme_insights
+from operations.analytics_operation import (
+    analyze_best_performing_content, get_weekly_theme_insights, refresh_post_metrics, track_follower_growth,
+)
 from operations.community_operation import reply_to_engagers, engage_with_followers
 from operations.trend_strategy import engage_with_trending_tweets
+from operations.interaction_policy import interaction_history
 from config_topics import INFLUENCERS
 from config import Config
 from utils.logger import logger
 from utils.rate_limiter import RateLimiter
-import time
+from utils.search_cache import search_cache
+from utils.llm_cache import llm_cache
+from utils.pacing import pacer
+from database.bulk_writer import bulk_writer
+from database.retention import retention
+from utils import quota as endpoints
+from utils.quota import Phase, quota, run_phases
+from utils.resilience import resilience
+from tweet_handler import tweet_handler
 
 
 def _to_topic_strings(items: list, limit: int) -> list:
@@ -28,96 +39,154 @@ def run_growth_strategy():
     logger.info("=" * 60)
     logger.info("🚀 GROWTH STRATEGY - Trend-Aware Organic Growth")
     logger.info("=" * 60)
-    
+
+    # Answer per-candidate cooldown/talk-back checks from one batched read.
+    try:
+        interaction_history.load()
+    except Exception as e:
+        logger.warning(f"Interaction history preload failed, using per-candidate lookups: {e}")
+
+    state = {"trending_topics": [], "analytics": {}, "growth": {}, "weekly": {}, "archived": {}}
+
     # PHASE 0: DAILY ORIGINAL POST (Highest value)
-    logger.info("\n[0/9] 🧠 Daily Original Post")
-    daily_parts = post_daily_original_lane()
-    if daily_parts > 0:
-        logger.info(f"✓ Published daily original post in {daily_parts} part(s)")
-    time.sleep(2)
+    def daily_original_post():
+        logger.info("\n[0/9] 🧠 Daily Original Post")
+        daily_parts = post_daily_original_lane()
+        if daily_parts > 0:
+            logger.info(f"✓ Published daily original post in {daily_parts} part(s)")
 
     # PHASE 1: Targeted influencer-follower engagement
-    logger.info("\n[1/9] ⭐ Engaging with Influencer Followers")
-    if RateLimiter.check_limit("likes", Config.MAX_LIKES_PER_DAY):
-        for influencer in INFLUENCERS[:2]:
-            engage_with_influencer_followers(
-                influencer,
-                count=max(1, Config.INFLUENCER_ENGAGEMENT_TARGET),
-            )
-            time.sleep(3)
-    else:
-        logger.info("Skipping influencer engagement - like limit reached")
-    
+    def influencer_followers():
+        logger.info("\n[1/9] ⭐ Engaging with Influencer Followers")
+        if RateLimiter.check_limit("likes", Config.MAX_LIKES_PER_DAY):
+            for influencer in INFLUENCERS[:2]:
+                engage_with_influencer_followers(
+                    influencer,
+                    count=max(1, Config.INFLUENCER_ENGAGEMENT_TARGET),
+                )
+        else:
+            logger.info("Skipping influencer engagement - like limit reached")
+
     # PHASE 2: join high-signal conversations from active topic research.
-    logger.info("\n[2/9] 💬 Joining Trending Conversations (Varied Angles)")
-    topic_limit = max(1, Config.MAX_TREND_TOPICS_PER_RUN)
-    can_reply = RateLimiter.check_limit("replies", Config.MAX_REPLIES_PER_DAY)
-    can_like = RateLimiter.check_limit("likes", Config.MAX_LIKES_PER_DAY)
-    trending_topics = []
-    if can_reply or can_like:
+    def trending_conversations():
+        logger.info("\n[2/9] 💬 Joining Trending Conversations (Varied Angles)")
+        topic_limit = max(1, Config.MAX_TREND_TOPICS_PER_RUN)
+        can_reply = RateLimiter.check_limit("replies", Config.MAX_REPLIES_PER_DAY)
+        can_like = RateLimiter.check_limit("likes", Config.MAX_LIKES_PER_DAY)
+        if not (can_reply or can_like):
+            logger.info("Skipping trend engagement - like/reply limits reached")
+            return
+
         trending = discover_active_topics(
             limit=topic_limit,
             pool_size=Config.TOPIC_RESEARCH_POOL_SIZE,
             sample_size=Config.TOPIC_RESEARCH_SAMPLE_SIZE,
         )
-        trending_topics = _to_topic_strings(trending or [], topic_limit)
+        state["trending_topics"] = _to_topic_strings(trending or [], topic_limit)
 
-        if not trending_topics:
+        if not state["trending_topics"]:
             logger.info("No active topics discovered; skipping trend engagement phase")
 
-        for topic in trending_topics:
+        for topic in state["trending_topics"]:
             # Reply for conversation depth.
             if can_reply:
                 engage_with_trending_tweets(topic, count=max(1, Config.REPLY_TARGETS_PER_TOPIC))
             # Like nearby quality tweets in same topic cluster.
             if can_like:
                 like_relevant_tweets(topic, count=max(1, Config.LIKE_TARGETS_PER_TOPIC))
-            time.sleep(2)
-    else:
-        logger.info("Skipping trend engagement - like/reply limits reached")
-    time.sleep(2)
 
     # PHASE 3: selective retweets of big tweets.
-    logger.info("\n[3/9] 🔁 Retweeting Big Tweets (High Engagement Only)")
-    if RateLimiter.check_limit("retweets", Config.MAX_RETWEETS_PER_DAY):
-        rt_query_limit = max(0, Config.MAX_RETWEET_QUERIES_PER_RUN)
-        big_tweet_queries = (trending_topics[:rt_query_limit] if trending_topics else [])
-        for query in big_tweet_queries:
-            # Keep this conservative: high engagement threshold + low count.
-            retweet_high_engagement(query, count=1, min_engagement=200)
-            time.sleep(2)
-    else:
-        logger.info("Skipping retweet phase - retweet limit reached")
-    
+    def big_tweet_retweets():
+        logger.info("\n[3/9] 🔁 Retweeting Big Tweets (High Engagement Only)")
+        if RateLimiter.check_limit("retweets", Config.MAX_RETWEETS_PER_DAY):
+            rt_query_limit = max(0, Config.MAX_RETWEET_QUERIES_PER_RUN)
+            big_tweet_queries = state["trending_topics"][:rt_query_limit]
+            for query in big_tweet_queries:
+                # Keep this conservative: high engagement threshold + low count.
+                retweet_high_engagement(query, count=1, min_engagement=200)
+        else:
+            logger.info("Skipping retweet phase - retweet limit reached")
+
     # PHASE 5: COMMUNITY BUILDING
-    logger.info("\n[4/9] 🤝 Building Community")
-    reply_to_engagers(max_replies=3)
-    engage_with_followers(count=5)
-    time.sleep(2)
-    
+    def community():
+        logger.info("\n[4/9] 🤝 Building Community")
+        reply_to_engagers(max_replies=3)
+        engage_with_followers(count=5)
+
     # PHASE 6: STRATEGIC CLEANUP
-    logger.info("\n[5/9] 🧹 Cleaning Up Inactive Follows")
-    unfollow_inactive_accounts(days_inactive=30)
-    time.sleep(2)
+    def cleanup():
+        logger.info("\n[5/9] 🧹 Cleaning Up Inactive Follows")
+        unfollow_inactive_accounts(days_inactive=30)
 
     # PHASE 7: Follow-up post from today's best reply threads.
-    logger.info("\n[6/9] 🧵 Follow-up Post from Reply Threads")
-    followup_parts = post_followup_from_replies()
-    if followup_parts > 0:
-        logger.info(f"✓ Published follow-up post in {followup_parts} part(s)")
-    time.sleep(2)
-    
-    # PHASE 7: ANALYTICS & OPTIMIZATION
-    logger.info("\n[7/9] 📊 Analyzing Performance")
-    analytics = analyze_best_performing_content()
-    growth = track_follower_growth()
-    weekly = get_weekly_theme_insights(days=7)
+    def followup_post():
+        logger.info("\n[6/9] 🧵 Follow-up Post from Reply Threads")
+        followup_parts = post_followup_from_replies()
+        if followup_parts > 0:
+            logger.info(f"✓ Published follow-up post in {followup_parts} part(s)")
+
+    # PHASE 7: ANALYTICS & OPTIMIZATION (database only, so it can fill rate-limit gaps;
+    # the batched post-metrics refresh is its own phase because it needs GET_TWEETS)
+    def post_metrics_phase():
+        refresh_post_metrics(days=7)
+
+    def analytics_phase():
+        logger.info("\n[7/9] 📊 Analyzing Performance")
+        state["analytics"] = analyze_best_performing_content()
+        state["growth"] = track_follower_growth()
+        state["weekly"] = get_weekly_theme_insights(days=7)
+        state["archived"] = retention.run()
+
+    trend_needs = (endpoints.SEARCH_RECENT, endpoints.CREATE_TWEET, endpoints.LIKE)
+    run_phases(
+        [
+            Phase("daily original post", daily_original_post, (endpoints.CREATE_TWEET,)),
+            Phase("influencer engagement", influencer_followers, (endpoints.SEARCH_RECENT, endpoints.LIKE)),
+            Phase("trending conversations", trending_conversations, trend_needs),
+            # Retweets use the topics found above, so they never run ahead of that phase.
+            Phase("big-tweet retweets", big_tweet_retweets, trend_needs + (endpoints.RETWEET,)),
+            Phase("community", community, (endpoints.SEARCH_RECENT, endpoints.LIKE)),
+            Phase("cleanup", cleanup, () if Config.DRY_RUN_MODE else (endpoints.UNFOLLOW,)),
+            Phase("follow-up post", followup_post, (endpoints.CREATE_TWEET,)),
+            Phase("post metrics", post_metrics_phase, (endpoints.GET_TWEETS,)),
+            Phase("analytics", analytics_phase),
+        ],
+        after_each=bulk_writer.flush,
+    )
+    analytics, growth, weekly, archived = (
+        state["analytics"], state["growth"], state["weekly"], state["archived"]
+    )
     
     # PHASE 8: FINAL INSIGHTS
     logger.info("\n[8/9] 🔍 Final Insights")
     logger.info(f"   Best Topic: {analytics.get('best_topic', 'N/A')}")
     logger.info(f"   Weekly Theme Winner: {weekly.get('best_theme', 'N/A')}")
     logger.info(f"   Followback Rate: {growth.get('followback_rate', 0)}%")
+    cache_stats = search_cache.stats()
+    logger.info(
+        f"   Search Cache: {cache_stats['hits'] + cache_stats['mongo_hits']} hits / "
+        f"{cache_stats['misses']} misses ({cache_stats['hit_rate']}%)"
+    )
+    llm_stats = llm_cache.stats()
+    logger.info(f"   LLM Cache: {llm_stats['hits']} hits / {llm_stats['misses']} misses ({llm_stats['hit_rate']}%)")
+    logger.info(f"   Pacing Wait: {pacer.slept_seconds:.0f}s")
+    logger.info(f"   Archived Documents: {sum(archived.values())}")
+    quota_stats = quota.stats()
+    logger.info(
+        f"   Rate Limits: {quota_stats['cooling_down']} endpoint(s) cooling down, "
+        f"{quota_stats['deferred_calls']} call(s) deferred"
+    )
+    identity_stats = tweet_handler.identity.stats()
+    logger.info(
+        f"   Identity Lookups: {identity_stats['calls']} API calls / {identity_stats['saved']} saved by cache"
+    )
+    resilience_stats = resilience.stats()
+    logger.info(
+        f"   API Retries: {resilience_stats['retries']} "
+        f"({resilience_stats['retry_budget_left']} left in budget), "
+        f"{resilience_stats['short_circuited']} call(s) short-circuited, "
+        f"open circuits: {', '.join(resilience_stats['open_circuits']) or 'none'}"
+    )
     
     logger.info("\n" + "=" * 60)
     logger.info("✅ GROWTH STRATEGY COMPLETE - Trend Aware & Diverse")
@@ -0,0 +1,94 @@
+"""Check the aggregation-based analytics reports against the original Python versions.
+
+Runs on the in-memory storage backend, so no MongoDB is needed.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.bulk_writer import bulk_writer
+from database.rollups import daily_rollups
+from operations import analytics_operation as analytics
+
+ACTIONS = ["like", "retweet", "follow", "post", "reply", "unfollow", "search", "dm_response"]
+
+
+def _seed(database, count: int = 3000, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    docs = []
+    for _ in range(count):
+        # Keep timestamps clear of the window edges so both versions see the same set.
+        age = timedelta(days=rng.randint(0, 20), hours=rng.randint(0, 23), minutes=rng.randint(5, 55))
+        docs.append({
+            "action": rng.choice(ACTIONS),
+            "success": rng.random() < 0.9,
+            "timestamp": now - age,
+        })
+    database.activity_logs.insert_many(docs)
+
+
+def test_engagement_metrics_match_python(memory_db):
+    _seed(memory_db)
+    for days in (1, 7, 30):
+        assert analytics.get_engagement_metrics(days) == analytics._engagement_metrics_python(days)
+
+
+def test_rollup_reports_match_python_once_built(memory_db):
+    _seed(memory_db)
+    assert daily_rollups.ensure_built() > 0
+    assert daily_rollups.coverage() == ""
+    now = datetime.utcnow()
+    # Whole days from rollups plus the partial first day from activity_logs
+    for days in (1, 7, 30):
+        assert analytics.get_engagement_metrics(days) == analytics._engagement_metrics_python(days)
+    assert analytics._daily_action_rollups(now) == analytics._daily_action_stats_python(now)
+    assert analytics.get_cost_analysis()["total_actions"] == analytics._cost_analysis_python()["total_actions"]
+
+
+def test_rollups_outside_coverage_are_not_trusted(memory_db):
+    old = datetime.utcnow() - timedelta(days=3)
+    memory_db.activity_logs.insert_many([{"action": "like", "success": True, "timestamp": old} for _ in range(5)])
+    # A new activity creates today's rollup before any backfill has run
+    bulk_writer.insert("activity_logs", {"action": "like", "success": True, "timestamp": datetime.utcnow()})
+    bulk_writer.flush()
+
+    assert daily_rollups.days() is None
+    assert analytics.get_cost_analysis()["total_actions"] == 6
+    assert analytics.get_engagement_metrics(7)["likes"] == 6
+
+    # A partial rebuild only covers its own window
+    daily_rollups.backfill(days=1)
+    assert daily_rollups.action_rows_since(datetime.utcnow() - timedelta(days=7)) is None
+    assert analytics.get_engagement_metrics(7)["likes"] == 6
+    daily_rollups.ensure_built()
+    assert daily_rollups.coverage() == ""
+    assert analytics.get_engagement_metrics(7)["likes"] == 6
+
+
+def test_daily_report_counts_match_python(memory_db):
+    _seed(memory_db)
+    now = datetime.utcnow()
+    assert analytics._daily_action_facets(now) == analytics._daily_action_stats_python(now)
+
+
+def test_cost_analysis_matches_python(memory_db):
+    _seed(memory_db)
+    memory_db.activity_logs.insert_one({"timestamp": datetime.utcnow()})  # no action field
+
+    aggregated = analytics.get_cost_analysis()
+    expected = analytics._cost_analysis_python()
+
+    assert aggregated["total_actions"] == expected["total_actions"]
+    assert aggregated["total_cost"] == pytest.approx(expected["total_cost"], abs=0.01)
+    assert aggregated["cost_per_action"] == pytest.approx(expected["cost_per_action"], abs=1e-4)
+    assert aggregated["breakdown"].keys() == expected["breakdown"].keys()
+    for action, row in expected["breakdown"].items():
+        assert aggregated["breakdown"][action]["count"] == row["count"]
+        assert aggregated["breakdown"][action]["cost"] == pytest.approx(row["cost"])
+
+
+def test_empty_collection(memory_db):
+    assert analytics.get_engagement_metrics(7) == analytics._engagement_metrics_python(7)
+    assert analytics.get_cost_analysis() == analytics._cost_analysis_python()
@@ -0,0 +1,79 @@
+"""Batched tweet/user lookups: ids are chunked 100 per call and results keyed by id."""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from tweet_handler import TweetHandler
+
+tweepy = pytest.importorskip("tweepy")
+
+
+class FakeLookupClient:
+    """get_tweets/get_users answering every numeric id; user 7 follows us back."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_tweets(self, ids, **kwargs):
+        self.calls.append(("tweets", len(ids)))
+        data = [SimpleNamespace(id=int(i), data={"id": i, "author_id": str(int(i) % 3),
+                                                 "public_metrics": {"like_count": int(i)}}) for i in ids]
+        users = [SimpleNamespace(id=a, data={"id": str(a), "username": f"user{a}"}) for a in range(3)]
+        return tweepy.Response(data=data, includes={"users": users}, errors=[], meta={})
+
+    def get_users(self, ids, **kwargs):
+        self.calls.append(("users", len(ids)))
+        data = [SimpleNamespace(id=int(i), data={"id": i, "username": f"user{i}",
+                                                 "connection_status": ["followed_by"] if i == "7" else []})
+                for i in ids]
+        return tweepy.Response(data=data, includes={}, errors=[], meta={})
+
+
+@pytest.fixture
+def handler():
+    th = TweetHandler.__new__(TweetHandler)
+    th.client = FakeLookupClient()
+    return th
+
+
+def test_ids_are_chunked_and_includes_merged(handler):
+    ids = [str(i) for i in range(1, 251)] + ["5", "dry_1700000000"]
+    tweets = handler.get_tweets_bulk(ids)
+    assert handler.client.calls == [("tweets", 100), ("tweets", 100), ("tweets", 50)]
+    assert len(tweets) == 250
+    assert tweets["42"]["public_metrics"]["like_count"] == 42
+    assert tweets["42"]["author"]["username"] == "user0"
+    assert handler.get_users_bulk([]) == {}
+
+
+def test_followback_refresh_spares_accounts_that_follow_back(handler, memory_db, monkeypatch):
+    from operations import targeting_operation
+
+    monkeypatch.setattr(targeting_operation, "tweet_handler", handler)
+    memory_db.users.insert_many([
+        {"user_id": i, "followed_at": datetime.utcnow() - timedelta(days=40), "followed_back": False}
+        for i in (5, 6, 7)
+    ])
+    assert targeting_operation.refresh_followback_status([5, 6, 7]) == {"7"}
+    assert handler.client.calls == [("users", 3)]
+    assert memory_db.users.find_one({"user_id": 7})["followed_back"] is True
+    assert memory_db.users.find_one({"user_id": 6})["followed_back"] is False
+
+
+def test_talk_back_matches_enriched_mention_username(memory_db):
+    from operations.interaction_policy import has_user_talked_back, interaction_history
+
+    interaction_history.reset()
+    since = datetime.utcnow() - timedelta(hours=1)
+    memory_db.mentions.insert_one({"mention_id": "1", "author_id": "9", "author_username": "user9",
+                                   "received_at": datetime.utcnow()})
+    assert has_user_talked_back("", since, "user9")
+    assert not has_user_talked_back("", since, "someone_else")
+
+    interaction_history.load()
+    try:
+        assert interaction_history.talked_back_since("", since, "user9")
+        assert interaction_history.talked_back_since("9", since)
+    finally:
+        interaction_history.reset()
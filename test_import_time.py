@@ -0,0 +1,49 @@
+"""Import-time budget: importing the bot's packages must stay cheap and network-free."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent
+
+# Cold `import operations` in a fresh interpreter (seconds)
+IMPORT_BUDGET_SECONDS = 0.25
+
+HEAVY_MODULES = ["openai", "tweepy", "pymongo", "tweet_handler"]
+
+
+def _run(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_import_operations_within_budget():
+    stats = _run(
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import operations\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    assert stats["loaded"] == []
+    assert stats["elapsed"] < IMPORT_BUDGET_SECONDS, f"import operations took {stats['elapsed']:.3f}s"
+
+
+def test_handler_and_operations_resolve_lazily():
+    pytest.importorskip("tweepy")
+    stats = _run(
+        "import json, sys\n"
+        "import operations\n"
+        "from operations import get_engagement_metrics\n"
+        "from tweet_handler import tweet_handler\n"
+        "print(json.dumps({'handler_loaded': tweet_handler.loaded,\n"
+        "                  'openai': 'openai' in sys.modules,\n"
+        "                  'resolved': operations.get_engagement_metrics is get_engagement_metrics}))\n"
+    )
+    assert stats == {"handler_loaded": False, "openai": False, "resolved": True}
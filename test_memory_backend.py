@@ -0,0 +1,160 @@
+"""Check the in-memory storage backend against the pymongo behaviour the bot relies on."""
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from config import Config
+from database import db
+
+def test_queries_and_sorting(memory_db):
+    now = datetime(2024, 5, 1, 12)
+    memory_db.users.insert_many([
+        {"user_id": str(i), "followed_at": now - timedelta(days=i), "unfollowed_at": None if i % 2 else now,
+         "tags": ["a", "b"] if i == 3 else []}
+        for i in range(10)
+    ])
+
+    active = list(memory_db.users.find({"unfollowed_at": None}, {"_id": 0, "user_id": 1}).sort("followed_at", -1))
+    assert [u["user_id"] for u in active] == ["1", "3", "5", "7", "9"]
+    assert memory_db.users.count_documents({"followed_at": {"$lt": now - timedelta(days=5)}}) == 4
+    assert memory_db.users.count_documents({"user_id": {"$in": ["1", "2", "42"]}}) == 2
+    assert memory_db.users.count_documents({"$or": [{"user_id": "0"}, {"tags": "a"}]}) == 2
+    assert memory_db.users.count_documents({"missing": {"$exists": False}}) == 10
+    assert memory_db.users.find_one({"user_id": "4"}, {"user_id": 1})["user_id"] == "4"
+    assert memory_db.users.find_one(sort=[("followed_at", 1)])["user_id"] == "9"
+    assert db.exists("users", {"user_id": "3", "unfollowed_at": None})
+    assert not db.exists("users", {"user_id": "4", "unfollowed_at": None})
+
+
+def test_upserts_and_operators(memory_db):
+    rate_limits = memory_db.rate_limits
+    for _ in range(3):
+        doc = rate_limits.find_one_and_update(
+            {"action": "likes", "date": "2024-05-01"},
+            {"$inc": {"count": 1}, "$setOnInsert": {"created_at": datetime(2024, 5, 1)}},
+            projection={"count": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    assert doc["count"] == 3
+
+    memory_db.metric_buckets.update_one(
+        {"meta.account": "me", "meta.metric": "followers", "day": "2024-05-01"},
+        {"$push": {"samples": 5}, "$min": {"min": 5}, "$max": {"max": 5}, "$set": {"last": 5}},
+        upsert=True,
+    )
+    bucket = memory_db.metric_buckets.find_one({"meta.metric": "followers"}, {"_id": 0})
+    assert bucket == {"meta": {"account": "me", "metric": "followers"}, "day": "2024-05-01",
+                      "samples": [5], "min": 5, "max": 5, "last": 5}
+
+
+def test_unique_indexes_and_bulk_write(memory_db):
+    memory_db.tweets.insert_one({"tweet_id": "1"})
+    with pytest.raises(DuplicateKeyError):
+        memory_db.tweets.insert_one({"tweet_id": "1"})
+
+    with pytest.raises(BulkWriteError) as excinfo:
+        memory_db.tweets.bulk_write([
+            InsertOne({"tweet_id": "1"}),
+            InsertOne({"tweet_id": "2"}),
+            UpdateOne({"tweet_id": "3"}, {"$set": {"liked_at": datetime(2024, 5, 1)}}, upsert=True),
+        ], ordered=False)
+    assert len(excinfo.value.details["writeErrors"]) == 1
+    assert memory_db.tweets.count_documents({}) == 3
+
+
+def test_query_plans_use_indexes(memory_db):
+    assert db.check_query_plans() == []
+    plan = memory_db.users.find({"nickname": "x"}).explain()["queryPlanner"]["winningPlan"]
+    assert plan["stage"] == "COLLSCAN"
+
+
+def test_interaction_index_matches_db_lookups(memory_db):
+    from database.reply_history import reply_history
+    from operations import interaction_policy as policy
+
+    now = datetime.utcnow()
+    window = timedelta(days=Config.INTERACTION_HISTORY_DAYS)
+    memory_db.activity_logs.insert_many([
+        # Replied recently, talked back since (by id)
+        {"action": "reply", "success": True, "target_user_id": "1", "target_user": "one",
+         "timestamp": now - timedelta(days=3)},
+        # Replied long before the load window, never talked back
+        {"action": "reply", "success": True, "target_user_id": "2", "target_user": "two",
+         "timestamp": now - window - timedelta(days=30)},
+        # Replied by username only; talk-back found only through the enriched mention username
+        {"action": "reply", "success": True, "target_user_id": "", "target_user": "three",
+         "timestamp": now - timedelta(days=2)},
+        {"action": "like", "success": True, "target_user_id": "4", "target_user": "four",
+         "timestamp": now - timedelta(hours=5)},
+        {"action": "like", "success": False, "target_user_id": "5", "target_user": "five",
+         "timestamp": now - timedelta(hours=5)},
+        # Replied, then archived out of activity_logs (kept in reply_history)
+        {"action": "reply", "success": True, "target_user_id": "6", "target_user": "six",
+         "timestamp": now - timedelta(days=200)},
+        # Replied before the load window and talked back later, still before it
+        {"action": "reply", "success": True, "target_user_id": "8", "target_user": "eight",
+         "timestamp": now - window - timedelta(days=16)},
+    ])
+    memory_db.mentions.insert_many([
+        {"mention_id": "m1", "author_id": "1", "author_username": "one", "received_at": now - timedelta(days=1)},
+        {"mention_id": "m2", "author_id": "9", "author_username": "three", "received_at": now - timedelta(days=1)},
+        {"mention_id": "m3", "author_id": "2", "author_username": "two",
+         "received_at": now - window - timedelta(days=40)},
+        {"mention_id": "m4", "author_id": "8", "author_username": "eight",
+         "received_at": now - window - timedelta(days=6)},
+    ])
+    reply_history.backfill()
+    memory_db.activity_logs.delete_many({"timestamp": {"$lt": now - timedelta(days=90)}})
+
+    probes = [("1", "one"), ("2", "two"), ("", "three"), ("4", "four"), ("5", "five"), ("6", "six"),
+              ("7", "seven"), ("8", "eight"), ("", "two")]
+    since = now - timedelta(days=4)
+
+    def answers():
+        return [
+            (
+                policy.can_reply_to_user(user_id, username),
+                policy.can_engage_user("like", user_id, username, cooldown_hours=24),
+                policy.has_user_talked_back(user_id, since, username),
+                policy.has_recent_any_engagement(user_id, username, cooldown_hours=72),
+            )
+            for user_id, username in probes
+        ]
+
+    policy.interaction_history.reset()
+    from_db = answers()
+    policy.interaction_history.load()
+    try:
+        assert answers() == from_db
+    finally:
+        policy.interaction_history.reset()
+
+    can_reply = dict(zip(probes, (row[0] for row in from_db)))
+    assert can_reply[("2", "two")] is False  # no time limit on the talk-back rule
+    assert can_reply[("6", "six")] is False  # survives archiving
+    assert can_reply[("", "three")] is True
+    assert can_reply[("7", "seven")] is True
+    assert can_reply[("8", "eight")] is True  # old talk-back still counts
+
+
+def test_unloaded_policy_sees_buffered_activity(memory_db, monkeypatch):
+    from database.bulk_writer import bulk_writer
+    from operations import interaction_policy as policy
+
+    monkeypatch.setattr(Config, "BULK_WRITES_ENABLED", True)
+    monkeypatch.setattr(Config, "BULK_WRITE_BATCH_SIZE", 50)
+    monkeypatch.setattr(Config, "BULK_WRITE_MAX_AGE_SECONDS", 3600)
+    policy.interaction_history.reset()
+    now = datetime.utcnow()
+    bulk_writer.insert("activity_logs", {"action": "reply", "success": True, "target_user_id": "1",
+                                         "target_user": "one", "timestamp": now})
+    bulk_writer.insert("activity_logs", {"action": "like", "success": True, "target_user_id": "2",
+                                         "target_user": "two", "timestamp": now})
+    assert bulk_writer.pending("activity_logs") == 2
+
+    assert policy.can_reply_to_user("1", "one") is False
+    assert policy.can_engage_user("like", "2", "two", cooldown_hours=24) is False
+    assert policy.has_recent_any_engagement("2", "two") is True
@@ -0,0 +1,128 @@
+"""Rate-limit headers from a local fake X API drive the quota table and phase order."""
+import requests
+from requests.adapters import BaseAdapter
+
+from config import Config
+from utils.quota import LIKE, SEARCH_RECENT, Phase, QuotaTable, endpoint_key, run_phases
+
+API = "https://api.twitter.com"
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeXAPI(BaseAdapter):
+    """Every endpoint allows `limit` calls per 15-minute window, then answers 429."""
+
+    def __init__(self, clock: FakeClock, limit: int = 2):
+        super().__init__()
+        self.clock = clock
+        self.limit = limit
+        self.windows = {}
+
+    def send(self, request, **kwargs):
+        key = endpoint_key(request.method, request.url)
+        reset, used = self.windows.get(key, (self.clock.now + 900, 0))
+        if self.clock.now >= reset:
+            reset, used = self.clock.now + 900, 0
+        used += 1
+        self.windows[key] = (reset, used)
+
+        response = requests.Response()
+        response.status_code = 200 if used <= self.limit else 429
+        response.headers["x-rate-limit-limit"] = str(self.limit)
+        response.headers["x-rate-limit-remaining"] = str(max(0, self.limit - used))
+        response.headers["x-rate-limit-reset"] = str(int(reset))
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def _session(table: QuotaTable, clock: FakeClock) -> requests.Session:
+    session = requests.Session()
+    session.mount(API, FakeXAPI(clock))
+    session.hooks["response"].append(table.observe)
+    return session
+
+
+def test_headers_fill_quota_table():
+    clock = FakeClock()
+    table = QuotaTable(clock=clock)
+    session = _session(table, clock)
+
+    assert endpoint_key("post", f"{API}/2/users/12345/likes") == LIKE
+    session.get(f"{API}/2/tweets/search/recent", params={"query": "swift"})
+    assert table.allow(SEARCH_RECENT)
+    session.get(f"{API}/2/tweets/search/recent", params={"query": "swift"})
+    assert table.available_at(SEARCH_RECENT) == clock.now + 900
+    assert not table.allow(SEARCH_RECENT)
+    assert table.allow(LIKE)
+    assert table.stats() == {"endpoints": 1, "cooling_down": 1, "deferred_calls": 1}
+
+    clock.now += 900
+    assert table.allow(SEARCH_RECENT)
+
+
+def test_phases_run_around_cooling_endpoint_without_idling(monkeypatch):
+    monkeypatch.setattr(Config, "QUOTA_MAX_WAIT_SECONDS", 900)
+    clock = FakeClock()
+    table = QuotaTable(clock=clock)
+    session = _session(table, clock)
+    searches = []
+
+    def search_phase():
+        while table.allow(SEARCH_RECENT):
+            session.get(f"{API}/2/tweets/search/recent")
+            searches.append(clock.now)
+
+    def like_phase():
+        session.post(f"{API}/2/users/1/likes")
+
+    ran = run_phases(
+        [
+            Phase("research", search_phase, (SEARCH_RECENT,)),
+            Phase("more research", search_phase, (SEARCH_RECENT,)),
+            Phase("likes", like_phase, (LIKE,)),
+            Phase("analytics", lambda: None),
+        ],
+        table=table,
+        sleep=clock.sleep,
+    )
+
+    # Work that does not need search runs while it cools down; the only wait is
+    # the one left when nothing else can run, and it ends exactly at the reset.
+    assert ran == ["research", "likes", "analytics", "more research"]
+    assert clock.slept == [900]
+    assert len(searches) == 4
+
+
+def test_waits_beyond_budget_are_skipped(monkeypatch):
+    monkeypatch.setattr(Config, "QUOTA_MAX_WAIT_SECONDS", 60)
+    clock = FakeClock()
+    table = QuotaTable(clock=clock)
+    table.update(SEARCH_RECENT, 429, {"x-rate-limit-reset": str(clock.now + 600)})
+
+    ran = run_phases([Phase("research", lambda: None, (SEARCH_RECENT,)), Phase("analytics", lambda: None)],
+                     table=table, sleep=clock.sleep)
+    assert ran == ["analytics"]
+    assert clock.slept == []
+
+
+def test_reset_window_is_ready_on_a_moving_clock():
+    table = QuotaTable()  # wall clock, read again on every call
+    table.update(SEARCH_RECENT, 429, {"x-rate-limit-reset": str(table.now() - 1)})
+    assert table.ready([SEARCH_RECENT])
+    assert table.allow(SEARCH_RECENT)
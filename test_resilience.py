@@ -0,0 +1,124 @@
+"""Classified retries, the per-run retry budget and circuit breakers, without network or real sleeps."""
+import pytest
+import requests
+
+from config import Config
+from utils.resilience import (
+    RATE_LIMITED, RETRYABLE, TERMINAL, CircuitBreaker, CircuitOpenError, Resilience, RetryBudget, classify,
+)
+
+tweepy = pytest.importorskip("tweepy")
+
+
+def _http_error(cls, status):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "test"
+    response._content = b"{}"
+    return cls(response)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Flaky:
+    """Fails with `error` `failures` times, then returns "ok"."""
+
+    def __init__(self, error, failures):
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setattr(Config, "RETRY_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(Config, "CIRCUIT_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(Config, "CIRCUIT_RESET_SECONDS", 300)
+    slept = []
+    return Resilience(sleep=slept.append), slept
+
+
+def test_errors_are_classified():
+    assert classify(_http_error(tweepy.TooManyRequests, 429)) == RATE_LIMITED
+    assert classify(_http_error(tweepy.TwitterServerError, 503)) == RETRYABLE
+    assert classify(_http_error(tweepy.Forbidden, 403)) == TERMINAL
+    assert classify(requests.ConnectionError()) == RETRYABLE
+    assert classify(TimeoutError()) == RETRYABLE
+    assert classify(ValueError()) == TERMINAL
+
+
+def test_retryable_errors_retry_with_backoff(policy):
+    resilience, slept = policy
+    call = Flaky(_http_error(tweepy.TwitterServerError, 503), failures=2)
+    assert resilience.call("GET /2/tweets/:id", call) == "ok"
+    assert call.calls == 3
+    assert len(slept) == 2
+    assert resilience.retries == 2
+
+
+def test_terminal_errors_are_not_retried(policy):
+    resilience, slept = policy
+    call = Flaky(_http_error(tweepy.Forbidden, 403), failures=5)
+    with pytest.raises(tweepy.Forbidden):
+        resilience.call("POST /2/tweets", call)
+    assert call.calls == 1
+    assert slept == []
+
+
+def test_retry_budget_is_shared_across_calls(policy):
+    resilience, slept = policy
+    resilience.budget = RetryBudget(limit=1)
+    first = Flaky(requests.Timeout(), failures=1)
+    assert resilience.call("GET /2/tweets/:id", first) == "ok"
+    second = Flaky(requests.Timeout(), failures=1)
+    with pytest.raises(requests.Timeout):
+        resilience.call("POST /2/users/:id/likes", second)
+    assert second.calls == 1
+    assert len(slept) == 1
+
+
+def test_breaker_trips_short_circuits_and_closes_after_trial(monkeypatch):
+    monkeypatch.setattr(Config, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(Config, "CIRCUIT_RESET_SECONDS", 60)
+    clock = FakeClock()
+    breaker = CircuitBreaker("POST /2/tweets", clock=clock)
+
+    breaker.record_failure()
+    assert not breaker.is_open()
+    breaker.record_failure()
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.short_circuited == 1
+
+    clock.now += 60
+    breaker.before_call()  # the half-open trial
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial at a time
+    breaker.record_success()
+    assert not breaker.is_open()
+    breaker.before_call()
+
+
+def test_open_circuit_skips_the_call(policy):
+    resilience, _ = policy
+    for _ in range(3):
+        resilience.breaker("POST /2/users/:id/likes").record_failure()
+    assert not resilience.allows("POST /2/users/:id/likes")
+    call = Flaky(None, failures=0)
+    with pytest.raises(CircuitOpenError):
+        resilience.call("POST /2/users/:id/likes", call)
+    assert call.calls == 0
+    assert resilience.stats()["open_circuits"] == ["POST /2/users/:id/likes"]
@@ -0,0 +1,87 @@
+"""Check that the vectorized scoring engine matches the scalar scoring functions."""
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from manual_research import _candidate_score
+from operations.engagement_filters import evaluate_account_authenticity
+from operations.follow_operation import calculate_follow_worthiness_score
+from operations.like_operation import calculate_account_quality_score
+from operations.quality_scorer import score_candidate_value
+from operations import scoring_engine
+
+# Values sit on and around every threshold used by the scalar ladders.
+FOLLOWER_VALUES = [0, 9, 10, 11, 50, 51, 99, 100, 101, 999, 1000, 1001, 4999, 5000, 10000, 10001,
+                   24999, 25000, 99999, 100000, 100001, 250000]
+FOLLOWING_VALUES = [0, 1, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 14999, 15000, 15001]
+COUNT_VALUES = [0, 19, 20, 21, 100, 500, 5000, 50000]
+AGE_VALUES = [0, 1, 29, 30, 31, 90, 91, 180, 181, 365, 366, 2000]
+METRIC_VALUES = [0, 1, 2, 4, 5, 8, 10, 11, 25, 40, 50, 51, 80, 100, 101, 120, 300]
+TEXTS = [
+    "",
+    "   ",
+    "short one",
+    "eight words of text in this one tweet",
+    "this is a longer tweet that has at least twelve words in it for sure",
+    "check this out https://example.com it is great and has many words ok",
+]
+DESCRIPTIONS = ["", None, "short", "exactly8", " padded description here ", "x" * 21, "y" * 41, "z" * 51]
+USERNAMES = ["", "dev_anna", "user12345", "a1b2c3d4", "builder", None]
+
+
+def _random_tweet(rng: random.Random) -> dict:
+    if rng.random() < 0.05:
+        author = {}
+    else:
+        author = {
+            "username": rng.choice(USERNAMES),
+            "followers_count": rng.choice(FOLLOWER_VALUES),
+            "following_count": rng.choice(FOLLOWING_VALUES),
+            "tweet_count": rng.choice(COUNT_VALUES),
+            "account_age_days": rng.choice(AGE_VALUES),
+            "description": rng.choice(DESCRIPTIONS),
+            "verified": rng.random() < 0.2,
+        }
+    return {
+        "id": str(rng.randint(1, 10 ** 12)),
+        "text": rng.choice(TEXTS),
+        "author_info": author,
+        "public_metrics": {
+            "like_count": rng.choice(METRIC_VALUES),
+            "retweet_count": rng.choice(METRIC_VALUES),
+            "reply_count": rng.choice(METRIC_VALUES),
+        },
+    }
+
+
+def _scalar_scores(tweets: list) -> dict:
+    scores = {name: [] for name in scoring_engine.SCORE_COLUMNS}
+    for tweet in tweets:
+        author = tweet["author_info"]
+        metrics = tweet["public_metrics"]
+        is_real, auth = evaluate_account_authenticity(author, metrics)
+        scores["authenticity"].append(auth)
+        scores["is_real"].append(is_real)
+        scores["candidate_value"].append(score_candidate_value(tweet))
+        scores["account_quality"].append(calculate_account_quality_score(author, metrics))
+        scores["follow_worthiness"].append(calculate_follow_worthiness_score(author, metrics))
+        scores["research_score"].append(_candidate_score(tweet))
+    return scores
+
+
+def test_vectorized_scores_match_scalar():
+    """Every column must be identical to the scalar reference on randomized pages."""
+    rng = random.Random(1337)
+    tweets = [_random_tweet(rng) for _ in range(5000)]
+
+    vectorized = scoring_engine.score_page(tweets)
+    expected = _scalar_scores(tweets)
+
+    for name in scoring_engine.SCORE_COLUMNS:
+        assert vectorized[name] == expected[name], name
+
+
+def test_empty_page():
+    assert scoring_engine.score_page([]) == {name: [] for name in scoring_engine.SCORE_COLUMNS}
@@ -0,0 +1,100 @@
+"""Lazy search pagination: pages are fetched only as far as the caller consumes them."""
+from itertools import islice
+from types import SimpleNamespace
+
+import pytest
+
+import tweet_handler as handler_module
+from config import Config
+from tweet_handler import SearchBudget, TweetHandler, iter_pages
+
+tweepy = pytest.importorskip("tweepy")
+
+
+class FakeSearchClient:
+    """search_recent_tweets over `total` numbered tweets, honoring max_results/next_token."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.calls = []
+
+    def search_recent_tweets(self, query, max_results, next_token=None, **kwargs):
+        self.calls.append(next_token)
+        start = int(next_token or 0)
+        end = min(self.total, start + max_results)
+        data = [
+            SimpleNamespace(id=i, text=f"tweet {i}", created_at=None, author_id=i, public_metrics={})
+            for i in range(start, end)
+        ]
+        meta = {"result_count": len(data)}
+        if end < self.total:
+            meta["next_token"] = str(end)
+        return tweepy.Response(data=data, includes={}, errors=[], meta=meta)
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    monkeypatch.setattr(Config, "SEARCH_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "SEARCH_MAX_PAGES", 5)
+    monkeypatch.setattr(handler_module, "search_budget", SearchBudget(limit=10))
+    th = TweetHandler.__new__(TweetHandler)
+    th.client = FakeSearchClient(total=45)
+    return th
+
+
+def test_pages_follow_next_token_until_exhausted(handler):
+    ids = [t.id for t in handler.iter_search("swift", page_size=10)]
+    assert ids == list(range(45))
+    assert handler.client.calls == [None, "10", "20", "30", "40"]
+
+
+def test_stopping_early_fetches_no_further_pages(handler):
+    first = list(islice(handler.iter_search("swift", page_size=10), 10))
+    assert len(first) == 10
+    assert handler.client.calls == [None]
+    assert handler_module.search_budget.used == 1
+
+    for page in iter_pages(handler.iter_search("swift", page_size=10), 10):
+        if len(page) == 10:
+            break
+    assert handler.client.calls == [None, None]
+
+
+def test_max_pages_and_budget_cap_the_stream(handler):
+    assert len(list(handler.iter_search("swift", page_size=10, max_pages=2))) == 20
+    handler_module.search_budget.limit = 3
+    assert len(list(handler.iter_search("swift", page_size=10))) == 10
+    assert handler_module.search_budget.used == 3
+
+
+@pytest.fixture
+def cached_handler(handler, monkeypatch):
+    from utils.search_cache import search_cache
+    monkeypatch.setattr(Config, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "SEARCH_CACHE_MONGO", False)
+    search_cache.clear()
+    yield handler
+    search_cache.clear()
+
+
+def test_larger_cached_page_is_served_as_pages_then_continues(cached_handler):
+    from utils.search_cache import search_cache
+    warm = cached_handler.client.search_recent_tweets("swift", max_results=30)
+    search_cache.put("swift", 30, handler_module.normalize_search_response(warm), next_token=warm.meta["next_token"])
+    cached_handler.client.calls.clear()
+
+    pages = list(iter_pages(cached_handler.iter_search("swift", page_size=10), 10))
+    assert [t.id for page in pages for t in page] == list(range(45))
+    assert cached_handler.client.calls == ["30", "40"]
+
+
+def test_cached_page_without_known_token_is_refetched(cached_handler):
+    from utils.search_cache import search_cache
+    warm = cached_handler.client.search_recent_tweets("swift", max_results=10)
+    search_cache.put("swift", 10, handler_module.normalize_search_response(warm))
+    key = next(iter(search_cache._entries))
+    search_cache._entries[key]["token_known"] = False
+    cached_handler.client.calls.clear()
+
+    assert [t.id for t in cached_handler.iter_search("swift", page_size=10)] == list(range(45))
+    assert cached_handler.client.calls == [None, "10", "20", "30", "40"]
@@ -1,28 +1,80 @@
-import tweepy
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator
 from auth import auth
 from config import Config
 from utils.logger import logger
+from utils.search_cache import search_cache
+from utils.lazy import LazyProxy
+from utils import quota as endpoints
+from utils.quota import quota
+from utils.resilience import resilience
+from database.models import AuthorProfile, Candidate
 from datetime import datetime
 
-try:
-    from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-except ImportError:
-    logger.warning("tenacity is not installed; retry decorators are disabled")
 
-    def retry(*args, **kwargs):
-        def decorator(func):
-            return func
-        return decorator
+# X API v2 caps tweet and user lookups at 100 ids per request
+LOOKUP_BATCH_SIZE = 100
 
-    def stop_after_attempt(*args, **kwargs):
-        return None
+SEARCH_FIELDS = {
+    'tweet_fields': ['created_at', 'author_id', 'public_metrics'],
+    'expansions': ['author_id'],
+    'user_fields': ['created_at', 'public_metrics', 'verified', 'description'],
+}
 
-    def wait_exponential(*args, **kwargs):
-        return None
 
-    def retry_if_exception_type(*args, **kwargs):
-        return None
+class SearchBudget:
+    """Per-run search call budget shared by the sync and async handlers."""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.used = 0
+
+    def try_acquire(self, query: str = "") -> bool:
+        """Reserve one search call. Returns False once the run budget is spent."""
+        limit = self.limit if self.limit is not None else Config.MAX_SEARCH_CALLS_PER_RUN
+        if self.used >= limit:
+            logger.warning(
+                f"Skipping search for '{query}' - per-run search budget reached "
+                f"({self.used}/{limit})"
+            )
+            return False
+        self.used += 1
+        return True
+
+
+def normalize_search_response(response) -> List[Candidate]:
+    """Build one Candidate per tweet in a v2 search response, with `author_info` attached."""
+    if not response or not response.data:
+        return []
+
+    # One profile per author, shared by all of their tweets on the page
+    now = datetime.utcnow()
+    authors = {}
+    if response.includes and 'users' in response.includes:
+        authors = {user.id: AuthorProfile.from_user(user, now) for user in response.includes['users']}
+
+    return [
+        Candidate(
+            id=tweet.id,
+            text=tweet.text,
+            created_at=tweet.created_at,
+            author_id=tweet.author_id,
+            public_metrics=tweet.public_metrics,
+            author_info=authors.get(tweet.author_id),
+        )
+        for tweet in response.data
+    ]
+
+
+def iter_pages(candidates: Iterable[Candidate], size: int) -> Iterator[List[Candidate]]:
+    """Group a candidate stream into lists of `size` (the last may be shorter)."""
+    page: List[Candidate] = []
+    for candidate in candidates:
+        page.append(candidate)
+        if len(page) >= size:
+            yield page
+            page = []
+    if page:
+        yield page
 
 
 class TweetHandler:
@@ -30,15 +82,9 @@ class TweetHandler:
     
     def __init__(self):
         self.api, self.client = auth.authenticate()
-        self._search_calls_this_run = 0
+        self.identity = auth.identity
     
     # ========== POST OPERATIONS ==========
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def post_tweet(self, text: str) -> Optional[str]:
         """Post a new tweet. Returns tweet ID on success."""
         try:
@@ -46,7 +92,9 @@ class TweetHandler:
                 dry_id = f"dry_{int(datetime.utcnow().timestamp())}"
                 logger.info(f"[DRY_RUN] Would post tweet: {text[:120]}...")
                 return dry_id
-            response = self.client.create_tweet(text=text)
+            if not quota.allow(endpoints.CREATE_TWEET):
+                return None
+            response = resilience.call(endpoints.CREATE_TWEET, self.client.create_tweet, text=text)
             tweet_id = response.data['id']
             logger.info(f"✓ Tweet posted. ID: {tweet_id}")
             return tweet_id
@@ -54,19 +102,15 @@ class TweetHandler:
             logger.error(f"Failed to post tweet: {e}")
             return None
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def reply_to_tweet(self, tweet_id: str, text: str) -> bool:
         """Reply to a specific tweet."""
         try:
             if Config.DRY_RUN_MODE:
                 logger.info(f"[DRY_RUN] Would reply to {tweet_id}: {text[:120]}...")
                 return True
-            self.client.create_tweet(text=text, in_reply_to_tweet_id=tweet_id)
+            if not quota.allow(endpoints.CREATE_TWEET):
+                return False
+            resilience.call(endpoints.CREATE_TWEET, self.client.create_tweet, text=text, in_reply_to_tweet_id=tweet_id)
             logger.info(f"✓ Replied to tweet {tweet_id}")
             return True
         except Exception as e:
@@ -74,57 +118,45 @@ class TweetHandler:
             return False
     
     # ========== INTERACTION OPERATIONS ==========
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def like_tweet(self, tweet_id: str) -> bool:
         """Like a tweet."""
         try:
             if Config.DRY_RUN_MODE:
                 logger.info(f"[DRY_RUN] Would like tweet {tweet_id}")
                 return True
-            self.client.like(tweet_id)
+            if not quota.allow(endpoints.LIKE):
+                return False
+            resilience.call(endpoints.LIKE, self.client.like, tweet_id)
             logger.info(f"✓ Liked tweet {tweet_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to like tweet: {e}")
             return False
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def retweet(self, tweet_id: str) -> bool:
         """Retweet a tweet."""
         try:
             if Config.DRY_RUN_MODE:
                 logger.info(f"[DRY_RUN] Would retweet {tweet_id}")
                 return True
-            self.client.retweet(tweet_id)
+            if not quota.allow(endpoints.RETWEET):
+                return False
+            resilience.call(endpoints.RETWEET, self.client.retweet, tweet_id)
             logger.info(f"✓ Retweeted {tweet_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to retweet: {e}")
             return False
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def follow_user(self, user_id: str) -> bool:
         """Follow a user."""
         try:
             if Config.DRY_RUN_MODE:
                 logger.info(f"[DRY_RUN] Would follow user {user_id}")
                 return True
-            self.client.follow_user(user_id)
+            if not quota.allow(endpoints.FOLLOW):
+                return False
+            resilience.call(endpoints.FOLLOW, self.client.follow_user, user_id)
             logger.info(f"✓ Followed user {user_id}")
             return True
         except Exception as e:
@@ -132,18 +164,14 @@ class TweetHandler:
             return False
     
     # ========== SEARCH & RETRIEVE OPERATIONS ==========
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def get_mentions(self, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
         """Get recent mentions of the bot."""
         try:
-            user = self.api.verify_credentials()
-            response = self.client.get_users_mentions(
-                id=user.id_str,
+            if not quota.allow(endpoints.MENTIONS):
+                return None
+            response = resilience.call(
+                endpoints.MENTIONS, self.client.get_users_mentions,
+                id=self.identity.get().id_str,
                 max_results=max_results,
                 tweet_fields=['created_at', 'author_id', 'public_metrics']
             )
@@ -155,77 +183,84 @@ class TweetHandler:
             logger.error(f"Failed to get mentions: {e}")
             return None
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def search_tweets(self, query: str, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
-        """Search for tweets by query."""
-        try:
-            if self._search_calls_this_run >= Config.MAX_SEARCH_CALLS_PER_RUN:
-                logger.warning(
-                    f"Skipping search for '{query}' - per-run search budget reached "
-                    f"({self._search_calls_this_run}/{Config.MAX_SEARCH_CALLS_PER_RUN})"
+        """Search for tweets by query (a single page)."""
+        tweets = list(self.iter_search(query, page_size=max_results, max_pages=1))
+        if tweets:
+            logger.info(f"✓ Found {len(tweets)} tweets for: {query}")
+            return tweets
+        return None
+
+    def iter_search(self, query: str, page_size: Optional[int] = None,
+                    max_pages: Optional[int] = None) -> Iterator[Candidate]:
+        """
+        Yield search results one Candidate at a time, following next_token lazily.
+
+        The next page is only requested once the caller has consumed the current
+        one, so stopping early saves both tweet reads and search budget. The
+        first page is served from the search cache when possible; a cached
+        entry fetched with a larger max_results is served as several pages
+        before its stored token is followed.
+
+        Args:
+            query: Search query
+            page_size: Results per API call (clamped to 10-100, default SEARCH_PAGE_SIZE)
+            max_pages: Most pages to fetch (default SEARCH_MAX_PAGES)
+        """
+        # Enforce X API bounds defensively.
+        page_size = min(100, max(10, int(page_size or Config.SEARCH_PAGE_SIZE)))
+        max_pages = max(1, int(max_pages or Config.SEARCH_MAX_PAGES))
+        token = None
+        page = 0
+
+        cached = search_cache.first_page(query, page_size)
+        # Without a stored token a full cached page cannot say whether more exist; fetch live instead.
+        if cached is not None and (cached.token_known or len(cached.tweets) < page_size):
+            logger.debug(f"Search cache hit for: {query}")
+            for start in range(0, len(cached.tweets), page_size):
+                if page >= max_pages:
+                    return
+                yield from cached.tweets[start:start + page_size]
+                page += 1
+            token = cached.next_token
+            if not token:
+                return
+
+        while page < max_pages:
+            if not quota.allow(endpoints.SEARCH_RECENT):
+                return
+            if not search_budget.try_acquire(query):
+                return
+            try:
+                response = resilience.call(
+                    endpoints.SEARCH_RECENT, self.client.search_recent_tweets,
+                    query=query,
+                    max_results=page_size,
+                    next_token=token,
+                    **SEARCH_FIELDS
                 )
-                return None
+            except Exception as e:
+                logger.error(f"Failed to search tweets: {e}")
+                return
+
+            tweets = normalize_search_response(response)
+            first_page = token is None
+            token = (getattr(response, 'meta', None) or {}).get('next_token')
+            if first_page:
+                search_cache.put(query, page_size, tweets, next_token=token)
+            page += 1
+            logger.debug(f"Search page {page} for '{query}': {len(tweets)} tweets")
+            yield from tweets
+            if not token:
+                return
 
-            # Enforce X API bounds defensively.
-            bounded_results = min(100, max(10, int(max_results)))
-            self._search_calls_this_run += 1
-            response = self.client.search_recent_tweets(
-                query=query,
-                max_results=bounded_results,
-                tweet_fields=['created_at', 'author_id', 'public_metrics'],
-                expansions=['author_id'],
-                user_fields=['created_at', 'public_metrics', 'verified', 'description']
-            )
-            if response.data:
-                # Add user info to each tweet
-                tweets = []
-                users_dict = {}
-                if response.includes and 'users' in response.includes:
-                    users_dict = {user.id: user for user in response.includes['users']}
-                
-                for tweet in response.data:
-                    tweet_dict = {
-                        'id': tweet.id,
-                        'text': tweet.text,
-                        'created_at': tweet.created_at,
-                        'author_id': tweet.author_id,
-                        'public_metrics': tweet.public_metrics
-                    }
-                    if tweet.author_id in users_dict:
-                        user = users_dict[tweet.author_id]
-                        tweet_dict['author_info'] = {
-                            'username': user.username,
-                            'followers_count': user.public_metrics['followers_count'],
-                            'following_count': user.public_metrics['following_count'],
-                            'tweet_count': user.public_metrics['tweet_count'],
-                            'verified': user.verified if hasattr(user, 'verified') else False,
-                            'description': user.description if hasattr(user, 'description') else '',
-                            'account_age_days': (datetime.utcnow() - user.created_at.replace(tzinfo=None)).days if hasattr(user, 'created_at') and user.created_at else 0
-                        }
-                    tweets.append(tweet_dict)
-                
-                logger.info(f"✓ Found {len(tweets)} tweets for: {query}")
-                return tweets
-            return None
-        except Exception as e:
-            logger.error(f"Failed to search tweets: {e}")
-            return None
-    
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def get_tweet(self, tweet_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific tweet by ID."""
         try:
-            response = self.client.get_tweet(
+            if not quota.allow(endpoints.GET_TWEET):
+                return None
+            response = resilience.call(
+                endpoints.GET_TWEET, self.client.get_tweet,
                 id=tweet_id,
                 tweet_fields=['created_at', 'author_id', 'public_metrics']
             )
@@ -235,16 +270,79 @@ class TweetHandler:
             logger.error(f"Failed to get tweet: {e}")
             return None
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
+    def _lookup_bulk(self, endpoint: str, method: str, ids: Iterable[Any],
+                     label: str, **params: Any) -> Dict[str, Any]:
+        """
+        Run the v2 client lookup `method` over `ids` in LOOKUP_BATCH_SIZE chunks.
+
+        Returns:
+            {"data": id -> object data dict, "users": id -> included user dict}
+            for whatever was fetched; stops early if the endpoint cools down or fails
+        """
+        # Only real numeric ids can be looked up (dry-run posts use "dry_..." ids)
+        unique = list(dict.fromkeys(str(i) for i in ids if str(i).isdigit()))
+        found: Dict[str, Any] = {"data": {}, "users": {}}
+        calls = 0
+        for start in range(0, len(unique), LOOKUP_BATCH_SIZE):
+            if not quota.allow(endpoint):
+                break
+            try:
+                response = resilience.call(
+                    endpoint, getattr(self.client, method),
+                    ids=unique[start:start + LOOKUP_BATCH_SIZE], **params
+                )
+            except Exception as e:
+                logger.error(f"Failed to look up {label}: {e}")
+                break
+            calls += 1
+            for item in response.data or []:
+                found["data"][str(item.id)] = item.data
+            for user in (response.includes or {}).get("users", []):
+                found["users"][str(user.id)] = user.data
+        if unique:
+            logger.info(f"✓ Looked up {len(found['data'])}/{len(unique)} {label} in {calls} call(s)")
+        return found
+
+    def get_tweets_bulk(self, tweet_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up many tweets, 100 per request.
+
+        Returns:
+            tweet id (str) -> tweet data dict, with the expanded author under "author"
+        """
+        found = self._lookup_bulk(
+            endpoints.GET_TWEETS, 'get_tweets', tweet_ids, "tweets",
+            tweet_fields=['created_at', 'author_id', 'public_metrics'],
+            expansions=['author_id'],
+            user_fields=['username', 'public_metrics'],
+        )
+        tweets = found["data"]
+        for tweet in tweets.values():
+            author = found["users"].get(str(tweet.get("author_id")))
+            if author:
+                tweet["author"] = author
+        return tweets
+
+    def get_users_bulk(self, user_ids: Iterable[Any],
+                       user_fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up many users, 100 per request.
+
+        Returns:
+            user id (str) -> user data dict (`connection_status` shows follow-backs)
+        """
+        found = self._lookup_bulk(
+            endpoints.GET_USERS, 'get_users', user_ids, "users",
+            user_fields=user_fields or ['username', 'public_metrics', 'connection_status'],
+        )
+        return found["data"]
+
     def get_trending_topics(self) -> Optional[List[Dict[str, Any]]]:
         """Get worldwide trending topics."""
         try:
-            trends = self.api.get_place_trends(id=1)  # 1 = worldwide
+            if not quota.allow(endpoints.TRENDS):
+                return None
+            trends = resilience.call(endpoints.TRENDS, self.api.get_place_trends, id=1)  # 1 = worldwide
             if trends:
                 logger.info(f"✓ Retrieved {len(trends[0]['trends'])} trending topics")
                 return trends[0]['trends']
@@ -278,16 +376,10 @@ class TweetHandler:
             logger.error(f"Failed to analyze tweet: {e}")
             return {}
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((tweepy.TweepyException, Exception)),
-        reraise=True
-    )
     def get_account_stats(self) -> Optional[Dict[str, Any]]:
         """Get current account statistics."""
         try:
-            user = self.api.verify_credentials()
+            user = self.identity.get()
             return {
                 'username': user.screen_name,
                 'followers': user.followers_count,
@@ -300,5 +392,6 @@ class TweetHandler:
             return None
 
 
-# Global instance
-tweet_handler = TweetHandler()
+# Global instances (the handler authenticates on first use, not at import)
+search_budget = SearchBudget()
+tweet_handler = LazyProxy(TweetHandler)
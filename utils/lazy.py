@@ -0,0 +1,49 @@
+"""Deferred construction of module-level singletons."""
+import threading
+from typing import Any, Callable
+
+
+class LazyProxy:
+    """
+    Stands in for an object that is expensive (or needs the network) to build.
+
+    The factory runs on first attribute access, once per process; after that
+    every attribute read and write goes to the real object, so
+    `from tweet_handler import tweet_handler` keeps working unchanged.
+    """
+
+    __slots__ = ("_factory", "_target", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        """Build the real object if needed and return it."""
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._factory()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        if self._target is None:
+            return f"<LazyProxy for {getattr(self._factory, '__qualname__', self._factory)} (not loaded)>"
+        return repr(self._target)
@@ -0,0 +1,204 @@
+"""Content-addressed cache for OpenAI chat completions (disk or MongoDB backend)."""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from database import db
+from utils.logger import logger
+
+
+def prompt_fingerprint(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    angle: str = "",
+    **params: Any,
+) -> str:
+    """
+    Cache key for a chat completion request.
+
+    The system prompt is hashed separately so the long shared prompts only
+    contribute a fixed-size digest; user prompts are keyed verbatim.
+    """
+    system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    user = [m.get("content", "") for m in messages if m.get("role") != "system"]
+    material = {
+        "model": model,
+        "system": hashlib.sha256(system.encode("utf-8")).hexdigest(),
+        "user": user,
+        "temperature": temperature,
+        "angle": angle or "",
+        "params": params,
+    }
+    encoded = json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMCache:
+    """
+    Completion cache with TTL and an LRU size cap.
+
+    Backends:
+        disk  - one JSON file per key under LLM_CACHE_DIR (mtime tracks last use)
+        mongo - llm_cache collection (TTL index expires entries server-side)
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> str:
+        return (Config.LLM_CACHE_BACKEND or "disk").strip().lower()
+
+    # --- disk backend ---
+
+    @staticmethod
+    def _path(key: str) -> str:
+        return os.path.join(Config.LLM_CACHE_DIR, f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            os.remove(path)
+            return None
+        os.utime(path, None)  # mark as recently used
+        return entry.get("content")
+
+    def _disk_put(self, key: str, content: str, model: str) -> None:
+        os.makedirs(Config.LLM_CACHE_DIR, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "content": content,
+                "model": model,
+                "created_at": time.time(),
+                "expires_at": time.time() + Config.LLM_CACHE_TTL_SECONDS,
+            }, f)
+        os.replace(tmp_path, path)
+        self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        entries = []
+        for name in os.listdir(Config.LLM_CACHE_DIR):
+            if name.endswith(".json"):
+                path = os.path.join(Config.LLM_CACHE_DIR, name)
+                entries.append((os.path.getmtime(path), path))
+        overflow = len(entries) - max(1, Config.LLM_CACHE_MAX_ENTRIES)
+        if overflow > 0:
+            entries.sort()
+            for _, path in entries[:overflow]:
+                os.remove(path)
+
+    # --- mongo backend ---
+
+    def _mongo_get(self, key: str) -> Optional[str]:
+        now = datetime.utcnow()
+        doc = db.llm_cache.find_one_and_update(
+            {"key": key, "expires_at": {"$gt": now}},
+            {"$set": {"last_used_at": now}},
+            projection={"content": 1}
+        )
+        return doc.get("content") if doc else None
+
+    def _mongo_put(self, key: str, content: str, model: str) -> None:
+        now = datetime.utcnow()
+        db.llm_cache.update_one(
+            {"key": key},
+            {"$set": {
+                "key": key,
+                "content": content,
+                "model": model,
+                "last_used_at": now,
+                "expires_at": now + timedelta(seconds=Config.LLM_CACHE_TTL_SECONDS),
+            }},
+            upsert=True
+        )
+        overflow = db.llm_cache.estimated_document_count() - max(1, Config.LLM_CACHE_MAX_ENTRIES)
+        if overflow > 0:
+            stale = db.llm_cache.find({}, {"_id": 1}).sort("last_used_at", 1).limit(overflow)
+            db.llm_cache.delete_many({"_id": {"$in": [d["_id"] for d in stale]}})
+
+    # --- public API ---
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached completion text, or None on miss/bypass."""
+        if not Config.LLM_CACHE_ENABLED or Config.LLM_CACHE_BYPASS:
+            return None
+        try:
+            content = self._mongo_get(key) if self.backend == "mongo" else self._disk_get(key)
+        except Exception as e:
+            logger.debug(f"LLM cache lookup skipped: {e}")
+            content = None
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    def put(self, key: str, content: str, model: str = "") -> None:
+        """Store a completion (also when bypassing reads, so the cache stays warm)."""
+        if not Config.LLM_CACHE_ENABLED or not content:
+            return
+        try:
+            if self.backend == "mongo":
+                self._mongo_put(key, content, model)
+            else:
+                self._disk_put(key, content, model)
+        except Exception as e:
+            logger.debug(f"LLM cache write skipped: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+        }
+
+
+# Global cache instance
+llm_cache = LLMCache()
+
+
+def cached_chat_completion(
+    client,
+    model: str,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float,
+    angle: str = "",
+    **params: Any,
+) -> Optional[str]:
+    """
+    Return the completion text for a chat request, served from cache when possible.
+
+    Extra keyword arguments (e.g. response_format) are passed to the API and
+    become part of the cache key.
+    """
+    key = prompt_fingerprint(model, messages, temperature, angle=angle, max_tokens=max_tokens, **params)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        logger.debug(f"LLM cache hit ({key[:12]})")
+        return cached
+
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        **params
+    )
+    content = (response.choices[0].message.content or "").strip()
+    llm_cache.put(key, content, model=model)
+    return content
@@ -0,0 +1,25 @@
+"""Shared OpenAI client, created (and the openai package imported) on first use."""
+from config import Config
+from utils.logger import logger
+
+_client = None
+_client_init_failed = False
+
+
+def get_openai_client():
+    """Lazily initialize OpenAI client to avoid import-time crashes."""
+    global _client, _client_init_failed
+    if _client is not None:
+        return _client
+    if _client_init_failed:
+        return None
+
+    try:
+        from openai import OpenAI
+        _client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        return _client
+    except Exception as e:
+        _client_init_failed = True
+        logger.error(f"OpenAI client initialization failed: {e}")
+        logger.error("Check package compatibility (openai/httpx) and OPENAI_API_KEY")
+        return None
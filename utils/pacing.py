@@ -0,0 +1,144 @@
+"""Central pacing for write actions: per-action token buckets plus human-like gaps."""
+import math
+import random
+import time
+from typing import Dict
+
+from config import Config
+from utils.logger import logger
+from utils.quota import CREATE_TWEET, FOLLOW, LIKE, RETWEET, UNFOLLOW, quota
+from utils.resilience import resilience
+
+
+# Pacing action -> Config attribute holding its daily cap
+ACTION_DAILY_LIMITS = {
+    "like": "MAX_LIKES_PER_DAY",
+    "retweet": "MAX_RETWEETS_PER_DAY",
+    "follow": "MAX_FOLLOWS_PER_DAY",
+    "unfollow": "MAX_UNFOLLOWS_PER_DAY",
+    "post": "MAX_POSTS_PER_DAY",
+    "reply": "MAX_REPLIES_PER_DAY",
+    "dm_response": "MAX_DM_RESPONSES_PER_DAY",
+}
+
+# Pacing action -> X API endpoint it writes to
+ACTION_ENDPOINTS = {
+    "like": LIKE,
+    "retweet": RETWEET,
+    "follow": FOLLOW,
+    "unfollow": UNFOLLOW,
+    "post": CREATE_TWEET,
+    "reply": CREATE_TWEET,
+    "dm_response": CREATE_TWEET,
+}
+
+
+class TokenBucket:
+    """Classic token bucket on the monotonic clock."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = max(1.0, capacity)
+        self.refill_per_second = max(0.0, refill_per_second)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def seconds_until_available(self, now: float) -> float:
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.refill_per_second
+
+    def consume(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+class PacingScheduler:
+    """
+    Schedules write actions on a timeline instead of sleeping after each one.
+
+    Each action type gets a token bucket sized from its MAX_*_PER_DAY cap
+    (burst = PACING_BURST_FRACTION of the cap, refilled evenly over
+    PACING_ACTIVE_HOURS) and a jittered gap before its next turn. Work done
+    between two actions (searching, drafting, DB checks) counts toward the gap,
+    so wait_turn() only sleeps for whatever remains.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._next_turn: Dict[str, float] = {}
+        self._next_any = 0.0
+        self.slept_seconds = 0.0
+
+    def _bucket(self, action: str) -> TokenBucket:
+        bucket = self._buckets.get(action)
+        if bucket is None:
+            daily_limit = getattr(Config, ACTION_DAILY_LIMITS.get(action, ""), 0) or 0
+            if daily_limit > 0:
+                capacity = math.ceil(daily_limit * Config.PACING_BURST_FRACTION)
+                refill = daily_limit / (max(1, Config.PACING_ACTIVE_HOURS) * 3600)
+            else:
+                capacity, refill = math.inf, 0.0
+            bucket = TokenBucket(capacity, refill)
+            self._buckets[action] = bucket
+        return bucket
+
+    @staticmethod
+    def human_gap() -> float:
+        """Right-skewed gap (log-normal around the MIN/MAX_DELAY_SECONDS midpoint)."""
+        low = max(0.0, float(Config.MIN_DELAY_SECONDS))
+        high = max(low, float(Config.MAX_DELAY_SECONDS))
+        median = (low + high) / 2
+        if median <= 0:
+            return 0.0
+        gap = random.lognormvariate(math.log(median), 0.35)
+        return min(max(gap, low), high * 1.5)
+
+    def wait_turn(self, action: str) -> bool:
+        """
+        Block until `action` may run, then claim the turn.
+
+        Returns:
+            False (without sleeping) if the turn is further away than
+            PACING_MAX_WAIT_SECONDS, or the action's endpoint is rate limited
+            or its circuit is open; the caller should skip the action
+        """
+        endpoint = ACTION_ENDPOINTS.get(action)
+        if endpoint and not (resilience.allows(endpoint) and quota.ready([endpoint])):
+            logger.info(f"Pacing: '{action}' endpoint unavailable (rate limit or open circuit), skipping")
+            return False
+
+        now = time.monotonic()
+        bucket = self._bucket(action)
+        wait = max(
+            self._next_turn.get(action, 0.0) - now,
+            self._next_any - now,
+            bucket.seconds_until_available(now),
+            0.0,
+        )
+        if wait > Config.PACING_MAX_WAIT_SECONDS:
+            logger.info(f"Pacing: next '{action}' slot in {wait:.0f}s, skipping for this run")
+            return False
+
+        if wait > 0:
+            logger.debug(f"Pacing: waiting {wait:.1f}s before '{action}'")
+            time.sleep(wait)
+            self.slept_seconds += wait
+            now = time.monotonic()
+
+        bucket.consume(now)
+        self._next_turn[action] = now + self.human_gap()
+        # Any two write actions stay at least MIN_DELAY_SECONDS apart.
+        self._next_any = now + max(0, Config.MIN_DELAY_SECONDS)
+        return True
+
+
+# Global scheduler instance
+pacer = PacingScheduler()
@@ -0,0 +1,177 @@
+"""Live per-endpoint X API quota table, fed by the rate-limit headers on every response.
+
+The tweepy clients run with wait_on_rate_limit=False. Instead of sleeping
+inside a request until the window resets, callers ask `quota.available_at()`
+and do something else (another phase, DB or LLM work) in the meantime.
+
+Endpoint keys are "<METHOD> <path>" with numeric path segments folded to
+":id", e.g. "GET /2/tweets/search/recent" or "POST /2/users/:id/likes".
+"""
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config import Config
+from utils.logger import logger
+
+
+# Endpoints used by the handlers
+SEARCH_RECENT = "GET /2/tweets/search/recent"
+CREATE_TWEET = "POST /2/tweets"
+LIKE = "POST /2/users/:id/likes"
+RETWEET = "POST /2/users/:id/retweets"
+FOLLOW = "POST /2/users/:id/following"
+MENTIONS = "GET /2/users/:id/mentions"
+GET_TWEET = "GET /2/tweets/:id"
+GET_TWEETS = "GET /2/tweets"
+GET_USERS = "GET /2/users"
+TRENDS = "GET /1.1/trends/place.json"
+FRIEND_IDS = "GET /1.1/friends/ids.json"
+FOLLOWER_IDS = "GET /1.1/followers/ids.json"
+UNFOLLOW = "POST /1.1/friendships/destroy.json"
+
+_ID_SEGMENT = re.compile(r"^\d+$")
+
+
+def endpoint_key(method: str, url: str) -> str:
+    version, _, rest = (urlsplit(url).path or "/").lstrip("/").partition("/")
+    # Fold numeric ids (never the leading API version, e.g. "/2/")
+    parts = [":id" if _ID_SEGMENT.match(part) else part for part in rest.split("/")] if rest else []
+    return f"{method.upper()} /{'/'.join([version] + parts)}"
+
+
+class Quota(NamedTuple):
+    limit: Optional[int]
+    remaining: int
+    reset_at: float  # epoch seconds
+
+
+class QuotaTable:
+    """Remaining calls and reset time per endpoint, as last reported by the API."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._quotas: Dict[str, Quota] = {}
+        self._lock = threading.Lock()
+        self.deferred = 0  # calls skipped because their endpoint was cooling down
+
+    def now(self) -> float:
+        return self._clock()
+
+    def update(self, key: str, status: int, headers: Any) -> None:
+        """Record the rate-limit headers (and 429s) of one response."""
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        limit = headers.get("x-rate-limit-limit")
+        if remaining is None and status != 429:
+            return
+        try:
+            remaining = 0 if status == 429 else int(remaining)
+            reset_at = float(reset) if reset is not None else self._clock() + Config.QUOTA_DEFAULT_COOLDOWN_SECONDS
+            limit = int(limit) if limit is not None else None
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._quotas[key] = Quota(limit, remaining, reset_at)
+        if remaining <= 0:
+            logger.info(f"Rate limit: {key} exhausted, resets in {max(0, reset_at - self._clock()):.0f}s")
+
+    def observe(self, response: Any, *args: Any, **kwargs: Any) -> Any:
+        """requests.Session response hook."""
+        try:
+            self.update(endpoint_key(response.request.method, response.url),
+                        response.status_code, response.headers)
+        except Exception as e:
+            logger.debug(f"Rate-limit header parse skipped: {e}")
+        return response
+
+    def available_at(self, key: str, now: Optional[float] = None) -> float:
+        """Epoch seconds when `key` can next be called (now if it has quota left)."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            quota = self._quotas.get(key)
+        if quota is None or quota.remaining > 0 or quota.reset_at <= now:
+            return now
+        return quota.reset_at
+
+    def ready(self, keys: Iterable[str]) -> bool:
+        now = self._clock()
+        return all(self.available_at(key, now) <= now for key in keys)
+
+    def allow(self, key: str) -> bool:
+        """Non-blocking check before a call; counts and logs the skip if cooling down."""
+        now = self._clock()
+        wait = self.available_at(key, now) - now
+        if wait <= 0:
+            return True
+        self.deferred += 1
+        logger.debug(f"Rate limit: {key} cooling down for {wait:.0f}s, call skipped")
+        return False
+
+    def cooling_down(self) -> Dict[str, float]:
+        """Endpoint -> seconds until reset, for exhausted endpoints."""
+        now = self._clock()
+        with self._lock:
+            keys = list(self._quotas)
+        waits = {k: self.available_at(k, now) - now for k in keys}
+        return {k: wait for k, wait in waits.items() if wait > 0}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"endpoints": len(self._quotas), "cooling_down": len(self.cooling_down()),
+                "deferred_calls": self.deferred}
+
+
+class Phase(NamedTuple):
+    """One orchestrator step and the endpoints it cannot run without."""
+    label: str
+    run: Callable[[], Any]
+    needs: Sequence[str] = ()
+
+
+def run_phases(phases: Sequence[Phase], table: Optional[QuotaTable] = None,
+               sleep: Callable[[float], None] = time.sleep,
+               after_each: Optional[Callable[[], None]] = None) -> List[str]:
+    """
+    Run every phase once, in order where possible.
+
+    A phase whose endpoints are cooling down is set aside while later phases
+    run. Only when every remaining phase is waiting does this sleep, until the
+    earliest reset, and not at all if that is further away than
+    QUOTA_MAX_WAIT_SECONDS (those phases are then skipped for this run).
+
+    Returns:
+        Labels of the phases that ran, in execution order
+    """
+    table = table or quota
+    pending = list(phases)
+    ran: List[str] = []
+    while pending:
+        phase = next((p for p in pending if table.ready(p.needs)), None)
+        if phase is None:
+            now = table.now()
+            wake = min(max(table.available_at(k, now) for k in p.needs) for p in pending)
+            wait = wake - now
+            if wait > Config.QUOTA_MAX_WAIT_SECONDS:
+                logger.warning(
+                    f"Rate limit: skipping {', '.join(p.label for p in pending)} "
+                    f"(next window in {wait:.0f}s)"
+                )
+                break
+            logger.info(f"Rate limit: nothing else to run, waiting {wait:.0f}s")
+            sleep(max(0.0, wait))
+            continue
+
+        if phase is not pending[0]:
+            logger.info(f"Rate limit: running {phase.label} while {pending[0].label} waits")
+        pending.remove(phase)
+        phase.run()
+        ran.append(phase.label)
+        if after_each:
+            after_each()
+    return ran
+
+
+# Global quota table instance
+quota = QuotaTable()
@@ -1,7 +1,10 @@
 """Rate limiting enforcement for X API operations."""
+import time
 from datetime import datetime, date
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from pymongo import ReturnDocument
 from database import db
+from database.timeseries import timeseries
 from utils.logger import logger
 from config import Config
 
@@ -9,11 +12,22 @@ from config import Config
 class RateLimiter:
     """Enforces daily rate limits for bot operations."""
     
+    # Write-through counter cache: (action, date) -> (count, monotonic time last synced with MongoDB)
+    _counters: Dict[Tuple[str, str], Tuple[int, float]] = {}
+    
+    @staticmethod
+    def _remember(action: str, day: str, count: int) -> int:
+        RateLimiter._counters[(action, day)] = (count, time.monotonic())
+        return count
+    
     @staticmethod
     def get_daily_count(action: str, today: Optional[date] = None) -> int:
         """
         Get count for action today.
         
+        Served from the in-process counter cache; entries older than
+        RATE_LIMIT_RECONCILE_SECONDS are re-read from the rate_limits collection.
+        
         Args:
             action: Action name (e.g., 'likes', 'retweets', 'follows')
             today: Date to check (defaults to today)
@@ -23,16 +37,26 @@ class RateLimiter:
         """
         if today is None:
             today = datetime.utcnow().date()
+        day = today.isoformat()
+        
+        cached = RateLimiter._counters.get((action, day))
+        if cached and time.monotonic() - cached[1] < Config.RATE_LIMIT_RECONCILE_SECONDS:
+            return cached[0]
         
         try:
-            result = db.rate_limits.find_one({
-                "action": action,
-                "date": today.isoformat()
-            })
-            return result["count"] if result else 0
+            result = db.rate_limits.find_one(
+                {"action": action, "date": day},
+                {"count": 1}
+            )
+            return RateLimiter._remember(action, day, result["count"] if result else 0)
         except Exception as e:
             logger.error(f"Failed to get rate limit count: {e}")
-            return 0
+            return cached[0] if cached else 0
+    
+    @staticmethod
+    def reconcile() -> None:
+        """Drop cached counters so the next reads come from the rate_limits collection."""
+        RateLimiter._counters.clear()
     
     @staticmethod
     def check_limit(action: str, limit: int) -> bool:
@@ -77,18 +101,19 @@ class RateLimiter:
         today = datetime.utcnow().date().isoformat()
         
         try:
-            # Increment counter
-            db.rate_limits.update_one(
+            # Increment and read back the new value in one atomic round-trip
+            result = db.rate_limits.find_one_and_update(
                 {"action": action, "date": today},
                 {
                     "$inc": {"count": 1},
                     "$setOnInsert": {"created_at": datetime.utcnow()}
                 },
-                upsert=True
+                projection={"count": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
             )
-            
-            # Check if over limit
-            count = RateLimiter.get_daily_count(action)
+            count = RateLimiter._remember(action, today, result["count"])
+            timeseries.record(f"rate.{action}", count)
             
             if count > limit:
                 logger.warning(f"⚠️ Rate limit EXCEEDED for {action}: {count}/{limit}")
@@ -113,6 +138,7 @@ class RateLimiter:
             db.rate_limits.delete_many({
                 "date": {"$lt": cutoff.isoformat()}
             })
+            RateLimiter.reconcile()
             
             logger.info("✓ Daily rate limits reset")
             
@@ -0,0 +1,236 @@
+"""Classified retries, per-run retry budget and per-endpoint circuit breakers for X API calls.
+
+Failures are sorted into three kinds:
+
+    retryable     5xx, timeouts, dropped connections; retried with backoff
+                  while the run's retry budget lasts, and counted by the
+                  endpoint's circuit breaker
+    rate_limited  429; never retried in-line, the endpoint is deferred via
+                  utils.quota until its window resets
+    terminal      400/401/403/404 (e.g. duplicate content) and anything
+                  unrecognised; raised at once
+
+After CIRCUIT_FAILURE_THRESHOLD consecutive retryable failures an endpoint's
+breaker opens and calls fail fast with CircuitOpenError for
+CIRCUIT_RESET_SECONDS; then a single trial call decides whether it closes.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import Config
+from utils.logger import logger
+from utils.quota import quota
+
+RETRYABLE = "retryable"
+RATE_LIMITED = "rate_limited"
+TERMINAL = "terminal"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint} circuit open, retry in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def classify(error: BaseException) -> str:
+    """Sort an exception from an API call into RETRYABLE, RATE_LIMITED or TERMINAL."""
+    # Imported here so the pacer can check breakers without loading the X client stack
+    import requests
+    import tweepy
+
+    if isinstance(error, tweepy.TooManyRequests):
+        return RATE_LIMITED
+    if isinstance(error, tweepy.TwitterServerError):
+        return RETRYABLE
+    if isinstance(error, tweepy.HTTPException):
+        return TERMINAL
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+        return RETRYABLE
+    # aiohttp errors reach here when the async client is in use
+    if type(error).__module__.startswith("aiohttp"):
+        return RETRYABLE
+    return TERMINAL
+
+
+class RetryBudget:
+    """Caps the retries one run may spend across every endpoint."""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        limit = self.limit if self.limit is not None else Config.RETRY_BUDGET_PER_RUN
+        with self._lock:
+            if self.spent >= limit:
+                return False
+            self.spent += 1
+            return True
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated retryable failures -> half-open trial -> closed."""
+
+    def __init__(self, endpoint: str, clock: Callable[[], float] = time.monotonic):
+        self.endpoint = endpoint
+        self._clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self.short_circuited = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + Config.CIRCUIT_RESET_SECONDS - self._clock())
+
+    def is_open(self) -> bool:
+        return self.opened_at is not None and (self.retry_in() > 0 or self._trial_running)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through (claims the half-open trial)."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self.retry_in() > 0 or self._trial_running:
+                self.short_circuited += 1
+                raise CircuitOpenError(self.endpoint, self.retry_in())
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit closed: {self.endpoint} is responding again")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            reopen = self._trial_running
+            self._trial_running = False
+            if reopen or (self.opened_at is None and self.failures >= Config.CIRCUIT_FAILURE_THRESHOLD):
+                self.opened_at = self._clock()
+                self.trips += 1
+                logger.warning(
+                    f"Circuit open: {self.endpoint} failed {self.failures} time(s) in a row, "
+                    f"pausing calls for {Config.CIRCUIT_RESET_SECONDS}s"
+                )
+
+    def record_neutral(self) -> None:
+        """A call that reached the API but failed for a non-health reason (4xx, 429)."""
+        with self._lock:
+            if self._trial_running:
+                self._trial_running = False
+                self.opened_at = None
+            self.failures = 0
+
+
+class Resilience:
+    """Runs API calls under the retry policy, the run's retry budget and per-endpoint breakers."""
+
+    def __init__(self, sleep: Callable[[float], None] = time.sleep):
+        self._sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.budget = RetryBudget()
+        self.retries = 0
+        self.slept_seconds = 0.0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+            return breaker
+
+    def allows(self, endpoint: str) -> bool:
+        """Non-blocking: False while the endpoint's circuit is open."""
+        return not self.breaker(endpoint).is_open()
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff capped at RETRY_MAX_WAIT_SECONDS."""
+        ceiling = min(Config.RETRY_MAX_WAIT_SECONDS, Config.RETRY_BASE_WAIT_SECONDS * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _after_failure(self, endpoint: str, breaker: CircuitBreaker, error: Exception, attempt: int) -> float:
+        """Record a failed attempt; return the backoff before the next one, or re-raise."""
+        kind = classify(error)
+        if kind == RATE_LIMITED:
+            breaker.record_neutral()
+            response = getattr(error, "response", None)
+            quota.update(endpoint, 429, getattr(response, "headers", None) or {})
+            raise error
+        if kind == TERMINAL:
+            breaker.record_neutral()
+            raise error
+        breaker.record_failure()
+        if (attempt + 1 >= Config.RETRY_MAX_ATTEMPTS or breaker.is_open()
+                or not self.budget.try_spend()):
+            raise error
+        wait = self.backoff(attempt)
+        logger.info(f"Retrying {endpoint} in {wait:.1f}s after {type(error).__name__}: {error}")
+        self.slept_seconds += wait
+        self.retries += 1
+        return wait
+
+    def call(self, endpoint: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call func(*args, **kwargs) for `endpoint`, retrying retryable failures.
+
+        Raises:
+            CircuitOpenError: the endpoint's breaker is open (nothing was sent)
+            The call's own exception once it is terminal, rate limited, or out of retries
+        """
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._sleep(self._after_failure(endpoint, breaker, e, attempt))
+                attempt += 1
+                continue
+            breaker.record_success()
+            return result
+
+    async def call_async(self, endpoint: str, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """call() for coroutine functions; backoff uses asyncio.sleep."""
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._after_failure(endpoint, breaker, e, attempt))
+                attempt += 1
+                continue
+            breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {
+            "retries": self.retries,
+            "retry_budget_left": max(0, (self.budget.limit if self.budget.limit is not None
+                                         else Config.RETRY_BUDGET_PER_RUN) - self.budget.spent),
+            "open_circuits": [b.endpoint for b in breakers if b.is_open()],
+            "short_circuited": sum(b.short_circuited for b in breakers),
+        }
+
+
+# Global resilience instance
+resilience = Resilience()
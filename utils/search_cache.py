@@ -0,0 +1,158 @@
+"""Search result cache: in-process LRU plus optional MongoDB tier with TTL."""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from config import Config
+from database import db
+from database.models import Candidate
+from utils.logger import logger
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a search query (whitespace/case-insensitive, keeps the OR operator)."""
+    tokens = (query or "").split()
+    return " ".join(t if t == "OR" else t.lower() for t in tokens)
+
+
+class CachedPage(NamedTuple):
+    """Every tweet of a cached first page plus what follows it."""
+    tweets: List[Candidate]
+    next_token: Optional[str]
+    token_known: bool  # False for entries stored before tokens were kept
+
+
+class SearchCache:
+    """
+    Caches search pages keyed on the normalized query.
+
+    An entry fetched with max_results=N also serves any smaller request,
+    and a page that came back short of N serves every size (nothing more exists).
+    Only first pages are cached; the entry keeps the token for the page after it.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_entries = max_entries or Config.SEARCH_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or Config.SEARCH_CACHE_TTL_SECONDS
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _serves(entry: Dict[str, Any], max_results: int) -> bool:
+        tweets = entry.get("tweets") or []
+        fetched = entry.get("max_results", 0)
+        return fetched >= max_results or len(tweets) < fetched
+
+    @staticmethod
+    def _mongo_enabled() -> bool:
+        return Config.SEARCH_CACHE_MONGO and db.db is not None
+
+    def _lookup(self, query: str, max_results: int) -> Optional[Dict[str, Any]]:
+        """Entry able to serve max_results, from memory or the MongoDB tier (counts hit/miss)."""
+        if not Config.SEARCH_CACHE_ENABLED:
+            return None
+
+        key = normalize_query(query)
+        now = datetime.utcnow()
+        entry = self._entries.get(key)
+        if entry and entry["expires_at"] > now and self._serves(entry, max_results):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        if self._mongo_enabled():
+            try:
+                doc = db.search_cache.find_one({"key": key, "expires_at": {"$gt": now}})
+                if doc and self._serves(doc, max_results):
+                    tweets = [Candidate.from_dict(t) for t in doc.get("tweets") or []]
+                    self._remember(key, doc["max_results"], tweets, doc["expires_at"], doc.get("next_token"),
+                                   token_known="next_token" in doc)
+                    self.mongo_hits += 1
+                    return self._entries[key]
+            except Exception as e:
+                logger.debug(f"Search cache lookup skipped: {e}")
+
+        self.misses += 1
+        return None
+
+    def get(self, query: str, max_results: int) -> Optional[List[Candidate]]:
+        """
+        Look up a cached page.
+
+        Returns:
+            Copies of up to max_results cached Candidates (possibly empty), or None on miss
+        """
+        entry = self._lookup(query, max_results)
+        if entry is None:
+            return None
+        return [t.copy() for t in entry["tweets"][:max_results]]
+
+    def first_page(self, query: str, max_results: int) -> Optional[CachedPage]:
+        """
+        Look up a cached first page for pagination.
+
+        Unlike get(), returns every cached tweet (an entry fetched with a larger
+        max_results covers several pages) and the token for the page after them.
+        """
+        entry = self._lookup(query, max_results)
+        if entry is None:
+            return None
+        return CachedPage([t.copy() for t in entry["tweets"]], entry.get("next_token"),
+                          entry.get("token_known", True))
+
+    def put(self, query: str, max_results: int, tweets: List[Candidate], next_token: Optional[str] = None) -> None:
+        """Store a freshly fetched first page unless a larger one is already cached."""
+        if not Config.SEARCH_CACHE_ENABLED:
+            return
+
+        key = normalize_query(query)
+        existing = self._entries.get(key)
+        if existing and existing["expires_at"] > datetime.utcnow() and existing["max_results"] > max_results:
+            return
+
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        self._remember(key, max_results, [t.copy() for t in tweets], expires_at, next_token)
+
+        if self._mongo_enabled():
+            try:
+                db.search_cache.update_one(
+                    {"key": key},
+                    {"$set": {
+                        "key": key,
+                        "max_results": max_results,
+                        "tweets": [t.to_dict() for t in tweets],
+                        "next_token": next_token,
+                        "expires_at": expires_at,
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.debug(f"Search cache write skipped: {e}")
+
+    def _remember(self, key: str, max_results: int, tweets: List[Candidate], expires_at: datetime,
+                  next_token: Optional[str] = None, token_known: bool = True) -> None:
+        self._entries[key] = {"max_results": max_results, "tweets": tweets, "expires_at": expires_at,
+                              "next_token": next_token, "token_known": token_known}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        lookups = self.hits + self.mongo_hits + self.misses
+        return {
+            "hits": self.hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_rate": round((self.hits + self.mongo_hits) / lookups * 100, 1) if lookups else 0.0,
+        }
+
+
+# Global cache instance
+search_cache = SearchCache()